@@ -1,19 +1,26 @@
 const { readFile } = require('node:fs/promises');
 const path = require('node:path');
+const { readRecord } = require('./_utils');
 
 let cache = null;
 
 module.exports = async (req, res) => {
   try {
+    const slug = (req.query && req.query.slug) || [];
+    const [collection, id] = slug;
+
+    // Fast path: one small file read instead of parsing the whole db
+    if (collection && id && !cache) {
+      const record = await readRecord(collection, id).catch(() => undefined);
+      if (record !== undefined) return res.status(200).send(record);
+    }
+
     if (!cache) {
       const filePath = path.join(__dirname, '../../../data/db.json');
       const file = await readFile(filePath, 'utf-8');
       cache = JSON.parse(file);
     }
 
-    const slug = (req.query && req.query.slug) || [];
-    const [collection, id] = slug;
-
     if (!collection) return res.status(400).send({ error: 'Missing collection segment' });
 
     const data = cache[collection];
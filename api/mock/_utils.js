@@ -33,4 +33,55 @@ async function readDB() {
   return JSON.parse(raw);
 }
 
-module.exports = { readDB, candidates };
+// Sidecars written by `python seed.py --profile compact` (db.json.br / db.json.gz)
+async function readPrecompressed(acceptEncoding) {
+  const file = await resolveDbPath();
+  const accepted = String(acceptEncoding || "");
+  for (const [ext, encoding] of [[".br", "br"], [".gz", "gzip"]]) {
+    if (accepted.includes(encoding) && fss.existsSync(file + ext)) {
+      return { encoding, body: await fs.readFile(file + ext) };
+    }
+  }
+  return null;
+}
+
+// Collections manifest.json marks perRecord; re-read only when the manifest changes.
+let perRecord = { file: null, mtimeMs: -1, names: new Set() };
+async function perRecordCollections(dir) {
+  const file = path.join(dir, "manifest.json");
+  if (!fss.existsSync(file)) return new Set();
+  const { mtimeMs } = await fs.stat(file);
+  if (file !== perRecord.file || mtimeMs !== perRecord.mtimeMs) {
+    const manifest = JSON.parse(await fs.readFile(file, "utf8"));
+    const names = (manifest.collections || []).filter((c) => c && c.perRecord).map((c) => c.name);
+    perRecord = { file, mtimeMs, names: new Set(names) };
+  }
+  return perRecord.names;
+}
+
+// Per-record files written by `python seed.py --shards` (data/<collection>/<id>.json).
+// Returns undefined when there is no shard, so callers can fall back to readDB();
+// other directories under data/ (views/, completions.cols/) are never read as records.
+const SAFE_ID = /^[A-Za-z0-9_-]+$/;
+async function readRecord(collection, id) {
+  if (!SAFE_ID.test(String(collection)) || !SAFE_ID.test(String(id))) return undefined;
+  const dir = path.dirname(await resolveDbPath());
+  if (!(await perRecordCollections(dir)).has(collection)) return undefined;
+  const file = path.join(dir, collection, `${id}.json`);
+  if (!fss.existsSync(file)) return undefined;
+  return JSON.parse(await fs.readFile(file, "utf8"));
+}
+
+// Pre-built list pages written by `python seed.py --views` (data/views/<view>/<sort>/<page>.json).
+// Resolves to the page's raw JSON text, or undefined for an unknown cursor.
+const CURSOR = /^([a-z]+)\.([a-z]+)\.(\d+)$/;
+async function readPage(cursor) {
+  const m = CURSOR.exec(String(cursor || ""));
+  if (!m) return undefined;
+  const dir = path.dirname(await resolveDbPath());
+  const file = path.join(dir, "views", m[1], m[2], `${m[3]}.json`);
+  if (!fss.existsSync(file)) return undefined;
+  return fs.readFile(file, "utf8");
+}
+
+module.exports = { readDB, readPrecompressed, readRecord, readPage, candidates };
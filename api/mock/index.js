@@ -1,8 +1,17 @@
 module.exports = async (req, res) => {
-  const { readDB } = require("./_utils");
+  const { readDB, readPrecompressed } = require("./_utils");
   try {
-    const db = await readDB();
     res.setHeader("Content-Type", "application/json; charset=utf-8");
+    res.setHeader("Vary", "Accept-Encoding");
+
+    // Fast path: send the precompressed bytes as-is, no parse or compress per request
+    const pre = await readPrecompressed(req.headers && req.headers["accept-encoding"]);
+    if (pre) {
+      res.setHeader("Content-Encoding", pre.encoding);
+      return res.status(200).end(pre.body);
+    }
+
+    const db = await readDB();
     res.status(200).end(JSON.stringify(db));
   } catch (e) {
     console.error("[/api/mock] ERROR:", e?.stack || e);
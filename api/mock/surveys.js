@@ -1,6 +1,16 @@
 module.exports = async (req, res) => {
-  const { readDB } = require("./_utils");
+  const { readDB, readPage } = require("./_utils");
   try {
+    // Paged views: ?view=active|free|premium[&sort=payout|newest], then ?cursor=<next>
+    const q = req.query || {};
+    if (q.cursor || q.view) {
+      const token = q.cursor || `${q.view}.${q.sort || "payout"}.1`;
+      const page = await readPage(token);
+      res.setHeader("Content-Type", "application/json; charset=utf-8");
+      if (page === undefined) return res.status(404).end(JSON.stringify({ error: `Unknown cursor '${token}'` }));
+      return res.status(200).end(page);
+    }
+
     const db = await readDB();
     const list = Array.isArray(db?.surveys) ? db.surveys : [];
     res.setHeader("Content-Type", "application/json; charset=utf-8");
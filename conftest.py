@@ -0,0 +1,2 @@
+# Lets plain `pytest` import seed.py and seedkit from the repo root, the same
+# way `python -m pytest` does.
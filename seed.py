@@ -1,10 +1,30 @@
 # scripts/seed.py
-import json
+import argparse
+import sys
 from pathlib import Path
-from time import time
+from time import perf_counter, time
+
+from seedkit.artifacts import (PROFILES, format_report, profile_report, remove_sidecars, write_profile,
+                               write_sidecars)
+from seedkit.columnar import export as export_columns
+from seedkit.emit import write_db
+from seedkit.incremental import (file_digest, load_options, load_stamps, options_path, options_stamp, output_digest,
+                                 restamp, save_options)
+from seedkit.metrics import Metrics
+from seedkit.offsets import IndexBuilder, index_path
+from seedkit.scales import interned_collections
+from seedkit.search import SearchIndexBuilder, index_path as search_index_path
+from seedkit.shards import remove_shards, write_shards
+from seedkit.sqlite_export import export_sqlite
+from seedkit.synth import generate, make_survey, make_user
+from seedkit.users import UserMerge, format_conflicts, merged_users
+from seedkit.validate import format_violations, validate, validate_synthetic
+from seedkit.views import PAGE_SIZE, remove_views, write_views
+from seedkit.watch import Catalog, watch
 
 NOW = int(time() * 1000)
 
+_build_t0 = perf_counter()  # reported as the "build" stage by --metrics
 surveys = [
     {
         "id": "401c13a3-8fa5-4b4b-a172-fdb7c25c374c",
@@ -671,24 +691,310 @@ surveys = [
         "updatedAt": NOW
     }
 ]
-here = Path(__file__).resolve().parent
-# Try current dir, then parent, then grandparent
-for base in (here, here.parent, here.parent.parent):
-    if (base / "public").is_dir():
-        root = base
-        break
-else:
-    root = here  # fallback: create public/ here if missing
-
-out_path = root / "data" / "db.json"
-out_path.parent.mkdir(parents=True, exist_ok=True)
-
-payload = {
-    "users": [],     # Option A: keep users empty; app uses localStorage
-    "surveys": surveys,
-}
-
-with out_path.open("w", encoding="utf-8") as f:
-    json.dump(payload, f, ensure_ascii=False, indent=2)
-
-print(f"✓ Wrote {out_path} with {len(surveys)} surveys")
\ No newline at end of file
+BUILD_SECONDS = perf_counter() - _build_t0
+
+
+def iter_surveys():
+    # Generator source for the writer; swap in anything that yields surveys
+    yield from surveys
+
+
+def find_root():
+    here = Path(__file__).resolve().parent
+    # Try current dir, then parent, then grandparent
+    for base in (here, here.parent, here.parent.parent):
+        if (base / "public").is_dir():
+            return base
+    return here  # fallback: create public/ here if missing
+
+
+def positive_int(text):
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {text}")
+    return value
+
+
+def parse_args(argv=None):
+    p = argparse.ArgumentParser(description="Write the mock database to data/db.json")
+    p.add_argument("--out-dir", type=Path, help="output directory (default: <root>/data)")
+    p.add_argument("--target", type=Path, action="append", default=[], metavar="PATH",
+                   help="also write db.json to PATH (repeatable); every copy gets the same bytes, so a PATH's "
+                        "own users are replaced too. Copies are written concurrently and replaced atomically")
+    p.add_argument("--profile", choices=PROFILES, default="pretty",
+                   help="pretty: indented db.json; compact: minified db.json + .gz/.br sidecars")
+    p.add_argument("--report", action="store_true",
+                   help="compare size and write/parse time of every profile, then exit")
+    p.add_argument("--shards", action="store_true",
+                   help="also write <collection>.json, surveys/<id>.json and manifest.json")
+    p.add_argument("--index", action="store_true",
+                   help="also write db.json.<collection>.idx byte-offset indexes (see seedkit.offsets)")
+    p.add_argument("--scales", action="store_true",
+                   help="also write db.scales.json, with option lists interned in a shared table")
+    p.add_argument("--search", action="store_true",
+                   help="also write the db.json.search.idx full-text index (see seedkit.search)")
+    p.add_argument("--views", action="store_true",
+                   help="also write paged active/free/premium views under views/ (see seedkit.views)")
+    p.add_argument("--page-size", type=positive_int, default=PAGE_SIZE, help="surveys per view page")
+    p.add_argument("--sqlite", nargs="?", type=Path, const=True, metavar="PATH",
+                   help="also export users/surveys to an indexed SQLite file (default: <out-dir>/db.sqlite)")
+    p.add_argument("--validate", action=argparse.BooleanOptionalAction, default=None,
+                   help="check the catalog before writing (default: on, off for --synthetic)")
+    p.add_argument("--metrics", type=Path, metavar="PATH",
+                   help="write per-stage timings, memory and throughput as JSON")
+    p.add_argument("--cprofile", type=Path, metavar="DIR",
+                   help="with --metrics, also dump a cProfile .prof per stage into DIR")
+    p.add_argument("--incremental", action="store_true",
+                   help="keep timestamps of unchanged surveys and skip the write if nothing changed")
+    p.add_argument("--watch", action="store_true",
+                   help="after writing, keep polling this file and re-emit only the surveys that change "
+                        "(with their --index, --shards and --views output)")
+    p.add_argument("--merge-users", nargs="?", type=Path, const=True, metavar="PATH",
+                   help="keep the users already in PATH (default: the db.json being replaced) "
+                        "instead of writing an empty list; streamed, upserted by id")
+
+    g = p.add_argument_group("synthetic catalog (load testing)")
+    g.add_argument("--synthetic", action="store_true",
+                   help="fabricate a catalog from the surveys above instead of writing them")
+    g.add_argument("--surveys", type=int, default=1000, help="number of surveys (N)")
+    g.add_argument("--users", type=int, default=100, help="number of users (M)")
+    g.add_argument("--completions", type=int, default=0,
+                   help="number of completions (K), written to completions.jsonl")
+    g.add_argument("--columns", action="store_true",
+                   help="also export the completions as memory-mappable .npy columns under completions.cols "
+                        "(see seedkit.columnar; needs numpy)")
+    g.add_argument("--seed", type=int, default=0, help="RNG seed; same seed, same bytes")
+    g.add_argument("--workers", type=int, default=None,
+                   help="generator and validator processes (default: CPU count, 1 = in-process)")
+    args = p.parse_args(argv)
+    if args.incremental and args.synthetic:
+        p.error("--incremental applies to the hand-written catalog, not --synthetic")
+    if args.watch and (args.synthetic or args.report):
+        p.error("--watch follows the hand-written catalog; it cannot be combined with --synthetic or --report")
+    if args.watch and (args.search or args.sqlite or args.scales):
+        p.error("--watch keeps db.json, --index, --shards and --views current; "
+                "run --search, --sqlite and --scales without it")
+    if args.merge_users and args.synthetic:
+        p.error("--merge-users applies to the hand-written catalog, not --synthetic")
+    if args.columns and not (args.synthetic and args.completions):
+        p.error("--columns exports the completions of --synthetic --completions K")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    metrics = Metrics(enabled=bool(args.metrics), cprofile_dir=args.cprofile)
+    metrics.record("build", BUILD_SECONDS, records=len(surveys))
+    try:
+        run(args, metrics)
+    finally:
+        if args.metrics:
+            metrics.write(args.metrics)
+            print(f"✓ Wrote {args.metrics}")
+
+
+def run(args, metrics):
+    with metrics.stage("resolve_root"):
+        out_dir = args.out_dir or find_root() / "data"
+        out_dir.mkdir(parents=True, exist_ok=True)
+    out_path = out_dir / "db.json"
+    targets = [t for t in args.target if t.resolve() != out_path.resolve()]
+    for target in targets:
+        target.parent.mkdir(parents=True, exist_ok=True)
+
+    if args.synthetic:
+        def collections():
+            return [
+                ("users", (make_user(args.seed, i) for i in range(args.users))),
+                ("surveys", (make_survey(args.seed, i, surveys) for i in range(args.surveys))),
+            ]
+    else:
+        source = out_path if args.merge_users is True else args.merge_users
+        merges = []
+
+        def users():
+            if not source:
+                return iter([])     # Option A: keep users empty; app uses localStorage
+            # Read lazily: db.json is only replaced by rename once the new one is complete
+            merges.append(UserMerge())
+            return merged_users(source, iter([]), merges[-1])
+
+        def collections():
+            return [
+                ("users", users()),
+                ("surveys", iter_surveys()),
+            ]
+
+    if args.report:
+        print(format_report(profile_report(collections)))
+        return
+
+    indent, sidecars = PROFILES[args.profile]
+
+    if args.validate if args.validate is not None else not args.synthetic:
+        with metrics.stage("validate") as st:
+            if args.synthetic:
+                violations = validate_synthetic(args.seed, args.surveys, surveys, workers=args.workers)
+            else:
+                violations = validate(collections()[1][1])
+            st["records"] = args.surveys if args.synthetic else len(surveys)
+        if violations:
+            print(f"✗ {len(violations)} catalog violation(s), nothing written:\n"
+                  + format_violations(violations), file=sys.stderr)
+            sys.exit(1)
+
+    if args.incremental:
+        stamps = load_stamps(out_path)
+        changes = {}
+        fresh = collections
+
+        def collections():
+            users, (name, records) = fresh()
+            return [users, (name, restamp(records, stamps, NOW, changes))]
+
+        expected = [out_path]
+        if sidecars:
+            expected.append(out_path.with_name("db.json.gz"))
+        if args.index:
+            expected += [index_path(out_path, c) for c in ("users", "surveys")]
+        if args.shards:
+            expected.append(out_dir / "manifest.json")
+        if args.sqlite:
+            expected.append(out_dir / "db.sqlite" if args.sqlite is True else args.sqlite)
+        if args.scales:
+            expected.append(out_dir / "db.scales.json")
+        if args.views:
+            expected.append(out_dir / "views" / "index.json")
+        if args.search:
+            expected.append(search_index_path(out_path))
+        with metrics.stage("incremental_check") as st:
+            digest = output_digest(collections(), indent)
+            unchanged = all(file_digest(p) == digest for p in [out_path, *targets]) \
+                and all(p.exists() for p in expected) and load_options(out_path) == options_stamp(args)
+            st["records"] = sum(changes.values())
+        if unchanged:
+            print(f"✓ {out_path} is up to date ({changes['unchanged']} surveys unchanged), nothing written")
+            if args.watch:
+                watch_catalog(args, out_dir, collections, targets)
+            return
+        removed = len(stamps) - changes["changed"] - changes["unchanged"]
+        print(f"  {changes['added']} added, {changes['changed']} changed, "
+              f"{changes['unchanged']} unchanged, {removed} removed")
+
+    index = IndexBuilder() if args.index else None
+    on_record = index.add if index else None
+    with metrics.stage("write") as st:
+        if args.synthetic:
+            stats = generate(out_dir, surveys, args.surveys, args.users, args.completions,
+                             seed=args.seed, workers=args.workers, indent=indent, on_record=on_record,
+                             mirrors=targets)
+        else:
+            # Records are streamed one at a time, so memory stays flat as the catalog grows
+            stats = write_profile(out_path, collections(), args.profile, on_record=on_record, mirrors=targets)
+        st["records"], st["bytes"] = stats["surveys"] + stats["users"], stats["bytes"]
+    if args.synthetic:
+        print(f"✓ Wrote {out_path} with {stats['surveys']} surveys, {stats['users']} users"
+              + (f" and {stats['completions']} completions" if args.completions else ""))
+    else:
+        print(f"✓ Wrote {out_path} with {stats['surveys']} surveys"
+              + (f" and {stats['users']} users" if args.merge_users else ""))
+        if args.merge_users and merges[-1].conflicts:
+            print(f"! {merges[-1].counts['conflicts']} user conflict(s), first record kept:\n"
+                  + format_conflicts(merges[-1].conflicts), file=sys.stderr)
+    if targets:
+        print(f"✓ Wrote the same bytes to {', '.join(map(str, targets))}")
+
+    if not args.synthetic:
+        # write_profile already took care of the sidecars
+        if sidecars:
+            metrics.record("sidecars", sum(v["seconds"] for v in stats["sidecars"].values()),
+                           bytes=sum(v["bytes"] for v in stats["sidecars"].values()))
+    elif sidecars:
+        with metrics.stage("sidecars") as st:
+            written = write_sidecars(out_path)
+            st["bytes"] = sum(v["bytes"] for v in written.values())
+    else:
+        remove_sidecars(out_path)
+
+    if index:
+        with metrics.stage("index") as st:
+            written = index.write(out_path, ("users", "surveys"))
+            st["bytes"] = sum(p.stat().st_size for p in written.values())
+        print(f"✓ Wrote {', '.join(p.name for p in written.values())}")
+
+    if args.shards:
+        with metrics.stage("shards") as st:
+            summary = write_shards(out_dir, collections(), indent)
+            st["records"] = sum(s["count"] for s in summary)
+            st["bytes"] = sum(s["bytes"] for s in summary)
+        print(f"✓ Wrote {', '.join(s['file'] for s in summary)}, per-record files and manifest.json")
+    else:
+        remove_shards(out_dir)
+
+    if args.scales:
+        with metrics.stage("scales") as st:
+            counts = write_db(out_dir / "db.scales.json", interned_collections(collections()), indent)
+            st["records"], st["bytes"] = counts["surveys"] + counts["users"], counts["bytes"]
+        print(f"✓ Wrote db.scales.json ({counts['scales']} distinct option scales)")
+
+    if args.search:
+        with metrics.stage("search") as st:
+            built = SearchIndexBuilder().add_all(collections()[1][1]).write(search_index_path(out_path))
+            st["records"], st["bytes"] = built["docs"], search_index_path(out_path).stat().st_size
+        print(f"✓ Wrote {search_index_path(out_path).name} ({built['terms']} terms)")
+
+    if args.views:
+        with metrics.stage("views") as st:
+            index = write_views(out_dir, collections()[1][1], args.page_size, indent)
+            st["records"] = sum(v["total"] for v in index["views"])
+        print(f"✓ Wrote {sum(v['pages'] for v in index['views'])} view pages under {out_dir / 'views'}")
+    else:
+        remove_views(out_dir)
+
+    if args.sqlite:
+        db_path = out_dir / "db.sqlite" if args.sqlite is True else args.sqlite
+        with metrics.stage("sqlite") as st:
+            counts = export_sqlite(db_path, collections())
+            st["records"] = counts["surveys"] + counts["users"]
+            st["bytes"] = Path(db_path).stat().st_size
+        print(f"✓ Wrote {db_path} ({counts['surveys']} surveys, {counts['users']} users)")
+
+    if args.columns:
+        with metrics.stage("columns") as st:
+            try:
+                manifest = export_columns([out_dir / "completions.jsonl"], out_path, out_dir / "completions.cols")
+            except RuntimeError as e:
+                sys.exit(str(e))
+            st["records"] = manifest["stats"]["completions"]
+            st["bytes"] = sum(p.stat().st_size for p in (out_dir / "completions.cols").iterdir())
+        print(f"✓ Wrote completions.cols ({manifest['stats']['answers']} answers as .npy columns)")
+
+    if args.incremental:
+        save_options(out_path, options_stamp(args))
+    else:
+        # only an incremental run may be skipped by the next one
+        options_path(out_path).unlink(missing_ok=True)
+
+    if args.watch:
+        watch_catalog(args, out_dir, collections, targets)
+
+
+def watch_catalog(args, out_dir, collections, targets=()):
+    # Cache what was just written, then follow edits to this file until Ctrl+C
+    indent, sidecars = PROFILES[args.profile]
+    (_, users), (_, records) = collections()
+    catalog = Catalog(out_dir, list(records), list(users), indent, index=args.index, shards=args.shards,
+                      views=args.views, page_size=args.page_size, sidecars=sidecars, mirrors=targets)
+
+    def check(changed):
+        violations = validate(changed)
+        return format_violations(violations) if violations else None
+
+    try:
+        watch(Path(__file__).resolve(), catalog, validate=check if args.validate is not False else None)
+    except KeyboardInterrupt:
+        print("  stopped watching")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,2 @@
+# seedkit/__init__.py
+# Helpers used by seed.py to build and emit the mock database.
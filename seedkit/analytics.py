@@ -0,0 +1,281 @@
+# seedkit/analytics.py
+# Per-question option tallies over completion exports.
+#
+# Answers are encoded as integer option indices against the catalog's
+# items[].options, a chunk of completions at a time, and counted with numpy:
+# every (survey, item, option) is one cell of a flat counts array, every
+# (survey, item pair, option pair) one cell of the cross-tab array, so a
+# chunk is tallied with a handful of bincount calls whatever its size.
+#
+# Inputs are completions.jsonl or a client export of the localStorage
+# completions map (see seedkit.completions), or a seedkit.columnar export
+# directory, which is tallied from memory-mapped columns without any JSON.
+#
+#   python -m seedkit.analytics data/completions.jsonl --db data/db.json --crosstab
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+from time import perf_counter
+
+from seedkit.completions import iter_completions, iter_jsonl, split_ranges
+from seedkit.jsonstream import iter_collection
+
+try:
+    import numpy as np  # optional: pip install numpy
+except ImportError:
+    np = None
+
+CHUNK = 100_000  # completions encoded per numpy pass
+
+
+def _require_numpy():
+    if np is None:
+        raise RuntimeError("seedkit.analytics needs numpy: pip install numpy")
+
+
+def item_key(item, n):
+    # TakeSurvey.jsx keys answers by item id, falling back to i_<position>
+    return item.get("id") or f"i_{n}"
+
+
+class Codebook:
+    """Integer codes for every survey, item and option in a catalog."""
+
+    def __init__(self, surveys):
+        _require_numpy()
+        self.ids, self.names, self.items = [], [], []  # items: per survey [(prompt, options)]
+        self._index = {}   # survey id -> survey number
+        self._lookup = []  # per survey: {(item key, option): (item number, option number)}
+        for survey in surveys:
+            if survey.get("id") in self._index:
+                continue
+            self._index[survey["id"]] = len(self.ids)
+            self.ids.append(survey["id"])
+            self.names.append(survey.get("name"))
+            items = [(it.get("prompt"), list(it.get("options") or [])) for it in survey.get("items") or []]
+            self.items.append(items)
+            self._lookup.append({(item_key(it, n), o): (n, k)
+                                 for n, it in enumerate(survey.get("items") or [])
+                                 for k, o in enumerate(items[n][1])})
+
+        self.width = max((len(items) for items in self.items), default=0)  # items per row
+        n = len(self.ids)
+        # nopt[s, i]: options of item i of survey s (0 past the survey's last item)
+        self.nopt = np.zeros((n, max(self.width, 1)), dtype=np.int64)
+        for s, items in enumerate(self.items):
+            self.nopt[s, :len(items)] = [len(options) for _, options in items]
+        # cell of (s, i, option 0) in the flat counts array
+        flat = self.nopt.ravel()
+        self.cell_base = (np.cumsum(flat) - flat).reshape(self.nopt.shape)
+        self.cells = int(flat.sum())
+
+        # cross-tabs: one block of nopt[s,i] x nopt[s,j] cells per survey and item pair i < j
+        self.pairs = [(i, j) for i in range(self.width) for j in range(i + 1, self.width)]
+        sizes = np.stack([self.nopt[:, i] * self.nopt[:, j] for i, j in self.pairs], axis=1) \
+            if self.pairs else np.zeros((n, 0), dtype=np.int64)
+        flat = sizes.ravel()
+        self.pair_base = (np.cumsum(flat) - flat).reshape(sizes.shape)
+        self.pair_cells = int(flat.sum())
+
+    @classmethod
+    def from_db(cls, path):
+        return cls(iter_collection(path, "surveys"))
+
+    def survey_number(self, survey_id, default=None):
+        """Row of survey `survey_id` in every per-survey array, `default` if the book lacks it."""
+        return self._index.get(survey_id, default)
+
+    def encode(self, completions):
+        """(survey numbers, answer matrix, stats) for (survey id, answers) pairs.
+
+        The matrix has one row per completion and one column per item, holding
+        the chosen option's index or -1. Completions of unknown surveys and
+        answers that match no option are counted in stats and left out.
+        """
+        index, lookup, width = self._index, self._lookup, self.width
+        surveys, rows = [], []
+        unknown = unmatched = 0
+        for sid, answers in completions:
+            s = index.get(sid)
+            if s is None:
+                unknown += 1
+                continue
+            row = [-1] * width
+            codes = lookup[s]
+            for answer in answers.items():
+                try:
+                    i, code = codes[answer]
+                except (KeyError, TypeError):  # unknown item or option, or not a string
+                    unmatched += 1
+                else:
+                    row[i] = code
+            surveys.append(s)
+            rows.extend(row)
+        s = np.array(surveys, dtype=np.int64)
+        matrix = np.array(rows, dtype=np.int16).reshape(len(surveys), width)
+        return s, matrix, {"unknownSurvey": unknown, "unmatchedAnswer": unmatched}
+
+
+class Tally:
+    """Running counts; add() one encoded chunk at a time, merge() partial tallies."""
+
+    def __init__(self, book, crosstab=False):
+        self.responses = np.zeros(len(book.ids), dtype=np.int64)
+        self.counts = np.zeros(book.cells, dtype=np.int64)
+        self.crosstab = np.zeros(book.pair_cells, dtype=np.int64) if crosstab else None
+        self.stats = {"completions": 0, "answers": 0, "unknownSurvey": 0, "unmatchedAnswer": 0}
+        self._book = book
+
+    def add(self, s, matrix, stats):
+        book = self._book
+        self.responses += np.bincount(s, minlength=len(self.responses))
+        answered = matrix >= 0
+        rows, cols = np.nonzero(answered)
+        cells = book.cell_base[s[rows], cols] + matrix[rows, cols]
+        self.counts += np.bincount(cells, minlength=len(self.counts))
+        if self.crosstab is not None and book.pairs:
+            parts = []
+            for p, (i, j) in enumerate(book.pairs):
+                both = answered[:, i] & answered[:, j]
+                sp = s[both]
+                parts.append(book.pair_base[sp, p] + matrix[both, i] * book.nopt[sp, j] + matrix[both, j])
+            self.crosstab += np.bincount(np.concatenate(parts), minlength=len(self.crosstab))
+        self.stats["completions"] += len(s)
+        self.stats["answers"] += len(rows)
+        for key in ("unknownSurvey", "unmatchedAnswer"):
+            self.stats[key] += stats[key]
+        return self
+
+    def merge(self, other):
+        self.responses += other.responses
+        self.counts += other.counts
+        if self.crosstab is not None:
+            self.crosstab += other.crosstab
+        for key, value in other.stats.items():
+            self.stats[key] += value
+        return self
+
+    def report(self, top=None):
+        """JSON-ready per-survey, per-item counts and percentages (surveys with responses only)."""
+        book = self._book
+        out = []
+        for s in np.flatnonzero(self.responses):
+            items = []
+            for i, (prompt, options) in enumerate(book.items[s]):
+                base = book.cell_base[s, i]
+                counts = self.counts[base:base + len(options)].tolist()
+                answered = sum(counts)
+                items.append({
+                    "item": i,
+                    "prompt": prompt,
+                    "answered": answered,
+                    "options": [{"option": o, "count": c, "pct": round(100 * c / answered, 1) if answered else 0.0}
+                                for o, c in zip(options, counts)],
+                })
+            entry = {"id": book.ids[s], "name": book.names[s], "responses": int(self.responses[s]),
+                     "items": items}
+            if self.crosstab is not None:
+                entry["crosstabs"] = []
+                for p, (i, j) in enumerate(book.pairs):
+                    ni, nj = book.nopt[s, i], book.nopt[s, j]
+                    if ni and nj:
+                        base = book.pair_base[s, p]
+                        block = self.crosstab[base:base + ni * nj].reshape(ni, nj)
+                        entry["crosstabs"].append({"items": [i, j], "counts": block.tolist()})
+            out.append(entry)
+        out.sort(key=lambda e: -e["responses"])
+        return {**self.stats, "surveys": out[:top] if top else out}
+
+
+def _answers(records):
+    for record in records:
+        yield record.get("surveyId"), record.get("answers") or {}
+
+
+def _tally(book, completions, crosstab, chunk=CHUNK):
+    tally = Tally(book, crosstab)
+    completions = iter(completions)
+    while batch := list(islice(completions, chunk)):
+        tally.add(*book.encode(batch))
+    return tally
+
+
+_worker_book = None
+
+
+def _init_worker(book):
+    global _worker_book
+    _worker_book = book
+
+
+def _tally_range(task):
+    path, start, stop, crosstab = task
+    return _tally(_worker_book, _answers(iter_jsonl(path, start, stop)), crosstab)
+
+
+def tally(paths, book, crosstab=False, workers=1):
+    """Tally every input in `paths` (.jsonl, a client export or a columns dir) against `book`.
+
+    With workers > 1 (None for the CPU count) .jsonl files are split into
+    byte ranges and tallied in a process pool.
+    """
+    _require_numpy()
+    total = Tally(book, crosstab)
+    for path in map(Path, paths):
+        if path.is_dir():
+            from seedkit.columnar import Columns
+
+            total.merge(Columns(path).tally(book, crosstab))
+        elif path.suffix != ".jsonl" or workers == 1:
+            total.merge(_tally(book, _answers(iter_completions(path)), crosstab))
+        else:
+            workers = workers or os.cpu_count() or 1
+            tasks = [(str(path), a, b, crosstab) for a, b in split_ranges(path, workers * 4)]
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(book,)) as pool:
+                for part in pool.map(_tally_range, tasks):
+                    total.merge(part)
+    return total
+
+
+def format_report(report, limit=5):
+    lines = [f"{report['completions']:,} completions, {report['answers']:,} answers "
+             f"({report['unknownSurvey']:,} for unknown surveys, {report['unmatchedAnswer']:,} unmatched)"]
+    for survey in report["surveys"][:limit]:
+        lines.append(f"\n{survey['name']}  ({survey['responses']:,} responses)")
+        for item in survey["items"]:
+            lines.append(f"  {item['prompt']}")
+            for o in item["options"]:
+                lines.append(f"    {o['pct']:5.1f}%  {o['count']:>10,}  {o['option']}")
+    if len(report["surveys"]) > limit:
+        lines.append(f"\n... and {len(report['surveys']) - limit} more surveys")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    p = argparse.ArgumentParser(description="Tally survey answers from completion exports")
+    p.add_argument("inputs", nargs="+", type=Path,
+                   help="completions.jsonl, client completions export or seedkit.columnar directory")
+    p.add_argument("--db", type=Path, default=Path("data/db.json"), help="catalog with items[].options")
+    p.add_argument("--crosstab", action="store_true", help="also count every item pair within a survey")
+    p.add_argument("--workers", type=int, default=1, help="processes for .jsonl inputs (0 = CPU count)")
+    p.add_argument("--out", type=Path, help="write the full report as JSON")
+    args = p.parse_args()
+
+    try:
+        t0 = perf_counter()
+        book = Codebook.from_db(args.db)
+        result = tally(args.inputs, book, args.crosstab, args.workers or None)
+        report = result.report()
+        elapsed = perf_counter() - t0
+    except RuntimeError as e:
+        sys.exit(str(e))
+    print(format_report(report))
+    print(f"\n{report['answers']:,} answers in {elapsed:.2f}s ({report['answers'] / elapsed:,.0f}/s)")
+    if args.out:
+        args.out.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"✓ Wrote {args.out}")
@@ -0,0 +1,166 @@
+# seedkit/bench.py
+# Benchmark seed generation, serialization and single-id lookup across
+# catalog sizes. Each size runs in a fresh process so peak RSS is per size.
+#
+#   python -m seedkit.bench                       # 10^2 .. 10^6 surveys
+#   python -m seedkit.bench --sizes 100,10000 --out bench.json --compare old.json
+import json
+import os
+import platform
+import random
+import resource
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+from time import perf_counter, time
+
+SIZES = (10 ** 2, 10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6)
+LOOKUPS = 1000
+
+
+def _peak_rss_bytes():
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == "darwin" else rss * 1024  # Linux reports KiB
+
+
+def _timed(fn):
+    t0 = perf_counter()
+    result = fn()
+    return perf_counter() - t0, result
+
+
+def _per_lookup(fn, ids):
+    t0 = perf_counter()
+    for rid in ids:
+        fn(rid)
+    return (perf_counter() - t0) / len(ids)
+
+
+def bench_size(n, seed=0):
+    """All measurements for one catalog size; meant to run in its own process."""
+    from seed import surveys as templates
+    from seedkit.emit import write_db
+    from seedkit.offsets import IndexBuilder, RecordIndex
+    from seedkit.shards import write_shards
+    from seedkit.synth import make_survey
+
+    row = {"surveys": n}
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        row["generate_s"], catalog = _timed(lambda: [make_survey(seed, i, templates) for i in range(n)])
+        payload = {"users": [], "surveys": catalog}
+
+        # What seed.py used to do: one json.dump of the whole payload
+        dump_path = tmp / "dump.json"
+
+        def dump():
+            with open(dump_path, "w", encoding="utf-8") as f:
+                json.dump(payload, f, ensure_ascii=False, indent=2)
+        row["json_dump_s"], _ = _timed(dump)
+        row["bytes"] = dump_path.stat().st_size
+
+        index = IndexBuilder()
+        db_path = tmp / "db.json"
+        row["stream_write_s"], _ = _timed(
+            lambda: write_db(db_path, [("users", []), ("surveys", catalog)], on_record=index.add))
+        index.write(db_path, ("surveys",))
+        row["shard_write_s"], _ = _timed(lambda: write_shards(tmp, [("surveys", catalog)]))
+
+        ids = [s["id"] for s in random.Random(seed).choices(catalog, k=LOOKUPS)]
+        last_id = catalog[-1]["id"]
+        del payload, catalog
+
+        def parse():
+            with open(db_path, "rb") as f:
+                return json.loads(f.read())
+        row["parse_s"], db = _timed(parse)
+
+        # [...slug].js on a cold start: parse everything, then Array.find
+        def cold_lookup():
+            data = parse()["surveys"]
+            return next(s for s in data if s["id"] == last_id)
+        row["lookup_parse_scan_s"], _ = _timed(cold_lookup)
+        # ... and warm, with the parsed db cached; worst case is the last id
+        warm = db["surveys"]
+        row["lookup_scan_s"] = _per_lookup(lambda rid: next(s for s in warm if s["id"] == rid), [last_id] * 10)
+        del db, warm
+
+        with RecordIndex(db_path) as idx:
+            row["lookup_index_s"] = _per_lookup(lambda rid: idx.get("surveys", rid), ids)
+
+        def shard_lookup(rid):
+            with open(tmp / "surveys" / f"{rid}.json", "rb") as f:
+                return json.loads(f.read())
+        row["lookup_shard_s"] = _per_lookup(shard_lookup, ids)
+
+    row["peak_rss_bytes"] = _peak_rss_bytes()
+    return row
+
+
+def run(sizes=SIZES, seed=0, log=None):
+    rows = []
+    for n in sizes:
+        # A fresh interpreter per size keeps ru_maxrss from leaking across sizes
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+            row = pool.submit(bench_size, n, seed).result()
+        rows.append(row)
+        if log:
+            log(format_row(row))
+    return {
+        "meta": {
+            "timestamp": int(time()),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "seed": seed,
+        },
+        "results": rows,
+    }
+
+
+def format_row(r):
+    return (f"{r['surveys']:>9,}  gen {r['generate_s']:7.3f}s  dump {r['json_dump_s']:7.3f}s  "
+            f"stream {r['stream_write_s']:7.3f}s  {r['bytes'] / 1e6:9.1f} MB  parse {r['parse_s']:7.3f}s  "
+            f"lookup: parse+scan {r['lookup_parse_scan_s'] * 1e3:9.2f}ms  scan {r['lookup_scan_s'] * 1e3:8.3f}ms  "
+            f"index {r['lookup_index_s'] * 1e6:6.1f}us  shard {r['lookup_shard_s'] * 1e6:6.1f}us  "
+            f"rss {r['peak_rss_bytes'] / 2 ** 20:7.0f} MiB")
+
+
+def compare(old, new, threshold=1.10):
+    """Lines for every metric that got worse than old by more than `threshold`x."""
+    before = {r["surveys"]: r for r in old["results"]}
+    lines = []
+    for r in new["results"]:
+        prev = before.get(r["surveys"])
+        if not prev:
+            continue
+        for key, value in r.items():
+            if key == "surveys" or not prev.get(key):
+                continue
+            ratio = value / prev[key]
+            if ratio > threshold:
+                lines.append(f"{r['surveys']:>9,} {key:<22} {prev[key]:.6g} -> {value:.6g} ({ratio:.2f}x)")
+    return lines
+
+
+if __name__ == "__main__":
+    import argparse
+
+    p = argparse.ArgumentParser(description="Benchmark seed generation, serialization and lookup")
+    p.add_argument("--sizes", default=",".join(map(str, SIZES)),
+                   help="comma-separated catalog sizes (default: 10^2..10^6)")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--out", type=Path, default=Path("seed-bench.json"), help="results file (JSON)")
+    p.add_argument("--compare", type=Path, help="earlier results file; report metrics >10%% worse")
+    args = p.parse_args()
+
+    report = run([int(n) for n in args.sizes.split(",")], args.seed, log=print)
+    args.out.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    print(f"✓ Wrote {args.out}")
+
+    if args.compare:
+        worse = compare(json.loads(args.compare.read_text(encoding="utf-8")), report)
+        print("\n".join(["Regressions:"] + worse) if worse else "No regressions")
+        sys.exit(1 if worse else 0)
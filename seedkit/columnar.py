@@ -0,0 +1,282 @@
+# seedkit/columnar.py
+# Columnar export of completions: typed .npy arrays plus string dictionaries.
+#
+# Completions are decoded from JSON once, here; analytics jobs then open the
+# columns with np.load(mmap_mode="r") (zero-copy, pages come straight from
+# the file cache) and scan them at memory bandwidth with no parsing at all.
+#
+#   <out>/manifest.json                 row counts, dtypes, stats, sources
+#   <out>/users.json                    user dictionary: index -> user id
+#   <out>/surveys.json                  survey dictionary: index -> {id, name, items}, catalog order first
+#   <out>/completion.user.npy           int32  one row per completion
+#   <out>/completion.survey.npy         int32
+#   <out>/completion.completed_at.npy   int64  ms since the epoch (view as datetime64[ms]; NaT if missing)
+#   <out>/answer.completion.npy         int64  one row per answer, ascending: its row in completion.*
+#   <out>/answer.item.npy               int32  position in the survey's items
+#   <out>/answer.option.npy             int32  position in that item's options
+#
+# Option strings live once in surveys.json (items[item].options[option]);
+# the answer columns hold no strings at all.
+#
+#   python -m seedkit.columnar data/completions.jsonl --db data/db.json --out data/completions.cols
+#   python -m seedkit.analytics data/completions.cols --db data/db.json
+import json
+import shutil
+import struct
+from datetime import datetime, timezone
+from itertools import islice
+from pathlib import Path
+from time import perf_counter
+
+from seedkit.analytics import CHUNK, Codebook, Tally
+from seedkit.completions import iter_completions
+from seedkit.jsonstream import iter_collection
+from seedkit.shards import swap_dir
+
+try:
+    import numpy as np  # optional: pip install numpy
+except ImportError:
+    np = None
+
+HEADER = 128  # .npy header bytes; fixed, so the row count can be filled in on close
+COLUMNS = {
+    "completion.user": "<i4",
+    "completion.survey": "<i4",
+    "completion.completed_at": "<i8",
+    "answer.completion": "<i8",
+    "answer.item": "<i4",
+    "answer.option": "<i4",
+}
+
+
+def _require_numpy():
+    if np is None:
+        raise RuntimeError("seedkit.columnar needs numpy: pip install numpy")
+
+
+def _header(dtype, rows):
+    # .npy format 1.0: magic, version, header length, then a dict literal padded to HEADER bytes
+    text = "{'descr': %r, 'fortran_order': False, 'shape': (%d,), }" % (dtype.str, rows)
+    return b"\x93NUMPY\x01\x00" + struct.pack("<H", HEADER - 10) + text.ljust(HEADER - 11).encode("latin-1") + b"\n"
+
+
+class _Column:
+    """A 1-d .npy file appended to a chunk at a time."""
+
+    def __init__(self, path, dtype):
+        self.dtype = np.dtype(dtype)
+        self.rows = 0
+        self._f = open(path, "wb")
+        self._f.write(_header(self.dtype, 0))
+
+    def append(self, values):
+        values = np.ascontiguousarray(values, dtype=self.dtype)
+        self._f.write(values.data)
+        self.rows += len(values)
+
+    def close(self):
+        self._f.seek(0)
+        self._f.write(_header(self.dtype, self.rows))
+        self._f.close()
+
+
+def to_millis(stamps):
+    """completedAt ISO strings -> int64 ms since the epoch, NaT for missing ones."""
+    # Date.toISOString() always ends in Z, which numpy parses fastest without
+    if all(s and s.endswith("Z") for s in stamps):
+        return np.array([s[:-1] for s in stamps], dtype="datetime64[ms]").view(np.int64)
+    out = np.full(len(stamps), np.datetime64("NaT", "ms").view(np.int64), dtype=np.int64)
+    for i, s in enumerate(stamps):
+        if s:
+            dt = datetime.fromisoformat(s.replace("Z", "+00:00"))
+            dt = dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+            out[i] = round(dt.timestamp() * 1000)
+    return out
+
+
+class Exporter:
+    """Encode completion records against a catalog into columns under out_dir."""
+
+    def __init__(self, out_dir, surveys):
+        _require_numpy()
+        self.out_dir = Path(out_dir)
+        self.book = Codebook(surveys)
+        # catalog surveys first, unknown ones appended
+        self.survey_index = {sid: s for s, sid in enumerate(self.book.ids)}
+        self.extra_surveys = []
+        self.user_index, self.user_ids = {}, []
+        self.stats = {"completions": 0, "answers": 0, "unknownSurvey": 0, "unmatchedAnswer": 0}
+        self._tmp = self.out_dir.with_name(f".{self.out_dir.name}.tmp")
+        shutil.rmtree(self._tmp, ignore_errors=True)
+        self._tmp.mkdir(parents=True)
+        self._cols = {name: _Column(self._tmp / f"{name}.npy", dtype) for name, dtype in COLUMNS.items()}
+
+    def add(self, records, chunk=CHUNK):
+        records = iter(records)
+        known = len(self.book.ids)
+        while batch := list(islice(records, chunk)):
+            base = self.stats["completions"]
+            users, surveys, stamps, rows, pairs = [], [], [], [], []
+            for n, record in enumerate(batch):
+                uid, sid = record.get("userId"), record.get("surveyId")
+                u = self.user_index.get(uid)
+                if u is None:
+                    u = self.user_index[uid] = len(self.user_ids)
+                    self.user_ids.append(uid)
+                s = self.survey_index.get(sid)
+                if s is None:
+                    s = self.survey_index[sid] = known + len(self.extra_surveys)
+                    self.extra_surveys.append(sid)
+                users.append(u)
+                surveys.append(s)
+                stamps.append(record.get("completedAt"))
+                if s < known:
+                    rows.append(n)
+                    pairs.append((sid, record.get("answers") or {}))
+                else:
+                    self.stats["unknownSurvey"] += 1
+            self._cols["completion.user"].append(users)
+            self._cols["completion.survey"].append(surveys)
+            self._cols["completion.completed_at"].append(to_millis(stamps))
+
+            _, matrix, stats = self.book.encode(pairs)
+            r, item = np.nonzero(matrix >= 0)  # row-major, so completions stay ascending
+            self._cols["answer.completion"].append(base + np.asarray(rows, dtype=np.int64)[r])
+            self._cols["answer.item"].append(item)
+            self._cols["answer.option"].append(matrix[r, item])
+            self.stats["completions"] += len(batch)
+            self.stats["answers"] += len(r)
+            self.stats["unmatchedAnswer"] += stats["unmatchedAnswer"]
+        return self
+
+    def close(self, sources=()):
+        """Finish every column and the dictionaries, then swap them in as out_dir."""
+        for col in self._cols.values():
+            col.close()
+        book = self.book
+        catalog = [{"id": sid, "name": name, "items": [{"prompt": p, "options": o} for p, o in items]}
+                   for sid, name, items in zip(book.ids, book.names, book.items)]
+        catalog += [{"id": sid, "name": None, "items": []} for sid in self.extra_surveys]
+        (self._tmp / "surveys.json").write_text(json.dumps(catalog, ensure_ascii=False), encoding="utf-8")
+        (self._tmp / "users.json").write_text(json.dumps(self.user_ids, ensure_ascii=False), encoding="utf-8")
+        manifest = {
+            "columns": {name: {"dtype": col.dtype.str, "rows": col.rows} for name, col in self._cols.items()},
+            "surveys": len(catalog),
+            "users": len(self.user_ids),
+            "stats": self.stats,
+            "sources": [str(p) for p in sources],
+        }
+        (self._tmp / "manifest.json").write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+        swap_dir(self._tmp, self.out_dir)
+        return manifest
+
+
+def export(inputs, db_path, out_dir, chunk=CHUNK):
+    """Columns for every completion in `inputs` (.jsonl or client exports); returns the manifest."""
+    exporter = Exporter(out_dir, iter_collection(db_path, "surveys"))
+    for path in inputs:
+        exporter.add(iter_completions(path), chunk)
+    return exporter.close(inputs)
+
+
+class Columns:
+    """An export opened zero-copy: every column is a read-only memory map."""
+
+    def __init__(self, path):
+        _require_numpy()
+        self.path = Path(path)
+        self.manifest = json.loads((self.path / "manifest.json").read_text(encoding="utf-8"))
+        for name in COLUMNS:
+            setattr(self, name.replace(".", "_"), np.load(self.path / f"{name}.npy", mmap_mode="r"))
+
+    def surveys(self):
+        return json.loads((self.path / "surveys.json").read_text(encoding="utf-8"))
+
+    def users(self):
+        return json.loads((self.path / "users.json").read_text(encoding="utf-8"))
+
+    def tally(self, book, crosstab=False, chunk=CHUNK):
+        """An analytics.Tally of the columns against `book`.
+
+        Surveys are matched by id; one whose items differ from the book's
+        counts as unknown, since its item and option positions would not line up.
+        """
+        exported = self.surveys()
+        remap = np.array([book.survey_number(s["id"], -1) for s in exported] or [0], dtype=np.int64)
+        for i, s in enumerate(exported):
+            b = remap[i]
+            if b >= 0 and book.items[b] != [(it["prompt"], it["options"]) for it in s["items"]]:
+                remap[i] = -1
+        result = Tally(book, crosstab)
+        rows = len(self.completion_survey)
+        surveys = remap[self.completion_survey]
+        known = surveys >= 0
+        if not crosstab:
+            # straight from the answer columns: one bincount of cells per chunk
+            answers = len(self.answer_completion)
+            for start in range(0, answers, chunk * 8):
+                s = surveys[self.answer_completion[start:start + chunk * 8]]
+                keep = s >= 0
+                cells = book.cell_base[s[keep], self.answer_item[start:start + chunk * 8][keep]] \
+                    + self.answer_option[start:start + chunk * 8][keep]
+                result.counts += np.bincount(cells, minlength=len(result.counts))
+                result.stats["answers"] += int(keep.sum())
+            result.responses += np.bincount(surveys[known], minlength=len(result.responses))
+            result.stats["completions"] += int(known.sum())
+            result.stats["unknownSurvey"] += int(rows - known.sum())
+            result.stats["unmatchedAnswer"] += self.manifest["stats"]["unmatchedAnswer"]
+            return result
+
+        width = max(book.width, 1)
+        bounds = np.searchsorted(self.answer_completion, np.arange(0, rows + chunk, chunk))
+        for n, start in enumerate(range(0, rows, chunk)):
+            stop = min(start + chunk, rows)
+            s = surveys[start:stop]
+            keep = known[start:stop]
+            lo, hi = bounds[n], bounds[n + 1]
+            at = self.answer_completion[lo:hi] - start
+            mine = keep[at]
+            matrix = np.full((stop - start, width), -1, dtype=np.int16)
+            matrix[at[mine], self.answer_item[lo:hi][mine]] = self.answer_option[lo:hi][mine]
+            result.add(s[keep], matrix[keep], {"unknownSurvey": int((~keep).sum()), "unmatchedAnswer": 0})
+        # answers that matched no option never made it into the columns
+        result.stats["unmatchedAnswer"] += self.manifest["stats"]["unmatchedAnswer"]
+        return result
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    p = argparse.ArgumentParser(description="Export completions as memory-mappable .npy columns")
+    p.add_argument("inputs", nargs="+", type=Path, help="completions.jsonl or client completions export")
+    p.add_argument("--db", type=Path, default=Path("data/db.json"), help="catalog the answers are coded against")
+    p.add_argument("--out", type=Path, default=Path("data/completions.cols"))
+    p.add_argument("--compare", action="store_true",
+                   help="then tally the JSON inputs and the columns, and compare times and results")
+    args = p.parse_args()
+
+    try:
+        t0 = perf_counter()
+        manifest = export(args.inputs, args.db, args.out)
+        elapsed = perf_counter() - t0
+        stats = manifest["stats"]
+        size = sum(f.stat().st_size for f in args.out.iterdir())
+        print(f"✓ Wrote {args.out}: {stats['completions']:,} completions, {stats['answers']:,} answers, "
+              f"{size / 1e6:,.1f} MB in {elapsed:.2f}s")
+        if args.compare:
+            from seedkit.analytics import tally
+
+            book = Codebook.from_db(args.db)
+            t0 = perf_counter()
+            from_json = tally(args.inputs, book)
+            json_s = perf_counter() - t0
+            t0 = perf_counter()
+            from_cols = Columns(args.out).tally(book)
+            cols_s = perf_counter() - t0
+            same = (from_json.counts == from_cols.counts).all() and from_json.stats == from_cols.stats
+            print(f"  tally from JSON    {json_s:8.2f}s  ({stats['answers'] / json_s:>13,.0f} answers/s)")
+            print(f"  tally from columns {cols_s:8.2f}s  ({stats['answers'] / cols_s:>13,.0f} answers/s)")
+            print(f"  results agree: {bool(same)}")
+    except RuntimeError as e:
+        sys.exit(str(e))
@@ -0,0 +1,82 @@
+# seedkit/completions.py
+# Readers for completion exports, shared by the analytics and ledger jobs.
+#
+# Two shapes are accepted, both yielded as flat
+# {"userId", "surveyId", "answers", "completedAt"} records:
+#
+#   completions.jsonl   one record per line, as seed.py --synthetic writes it
+#   *.json              the client's localStorage map (COMPLETIONS_KEY in
+#                       src/lib/surveys.js): {userId: {surveyId: {answers, completedAt}}}
+#
+# markCompleted() stores whatever the page hands it as `answers`, and
+# TakeSurvey.jsx hands it {answers, completedAt: Date.now()}, so real exports
+# nest the answers one level down; iter_client unwraps them.
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+
+BATCH = 10_000  # jsonl lines decoded per json.loads call
+
+
+def iter_jsonl(path, start=0, stop=None, batch=BATCH):
+    """Records from the completions.jsonl lines that start in [start, stop)."""
+    with open(path, "rb") as f:
+        if start:
+            f.seek(start - 1)
+            f.readline()  # finish the line the range starts inside; it belongs to the previous one
+        while True:
+            lines = []
+            while len(lines) < batch and (stop is None or f.tell() < stop):
+                line = f.readline()
+                if not line:
+                    break
+                if line.strip():
+                    lines.append(line)
+            if not lines:
+                return
+            # one decode per batch instead of per line
+            yield from json.loads(b"[" + b",".join(lines) + b"]")
+
+
+def _iso(stamp):
+    # Date.now() milliseconds -> the Date.toISOString() form the other records use
+    if isinstance(stamp, (int, float)) and not isinstance(stamp, bool):
+        dt = datetime.fromtimestamp(stamp / 1000, tz=timezone.utc)
+        return dt.strftime("%Y-%m-%dT%H:%M:%S.") + f"{int(stamp) % 1000:03d}Z"
+    return stamp
+
+
+def _unwrap(completion):
+    """(answers, completedAt) of one stored completion, whichever page wrote it."""
+    answers, completed = completion.get("answers") or {}, completion.get("completedAt")
+    if isinstance(answers, dict) and isinstance(answers.get("answers"), dict):
+        # TakeSurvey.jsx: {answers: {answers: {...}, completedAt: ms}, completedAt: iso}
+        completed = answers.get("completedAt") or completed
+        answers = answers["answers"]
+    elif isinstance(answers, dict) and set(answers) <= {"finishedAt", "completedAt"}:
+        # SurveyFlow.jsx records only when the flow finished
+        completed = answers.get("finishedAt") or answers.get("completedAt") or completed
+        answers = {}
+    return answers, _iso(completed)
+
+
+def iter_client(path):
+    """Flat records from a {userId: {surveyId: {answers, completedAt}}} export."""
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    for uid, by_survey in data.items():
+        for sid, completion in (by_survey or {}).items():
+            answers, completed = _unwrap(completion or {})
+            yield {"userId": uid, "surveyId": sid, "answers": answers, "completedAt": completed}
+
+
+def iter_completions(path):
+    path = Path(path)
+    return iter_jsonl(path) if path.suffix == ".jsonl" else iter_client(path)
+
+
+def split_ranges(path, parts):
+    """Cut a .jsonl file into about `parts` (start, stop) byte ranges for iter_jsonl."""
+    size = Path(path).stat().st_size
+    step = -(-size // parts) or 1
+    return [(a, min(a + step, size)) for a in range(0, size, step)]
@@ -0,0 +1,282 @@
+# seedkit/eligibility.py
+# Which surveys can a user take next? Same rules as Surveys.jsx: active
+# surveys, premium ones only for premium users (plan "premium" or a paid
+# tier), never one the user already completed (getCompletedIds).
+#
+# Surveys get a bit position in display order. The catalog is two packed
+# uint64 bitmasks (active, active & free); every user's completions are a
+# sparse bitset holding only the 64-bit words that have a bit set. For a
+# batch of users, word w of (tier mask & ~completed) is computed for every
+# user still short of N surveys at once, so a batch of millions finishes in
+# a few vectorized passes over the first words.
+#
+#   python -m seedkit.eligibility --bench 100000 --users 1000000
+from pathlib import Path
+from time import perf_counter
+
+from seedkit.completions import iter_completions
+from seedkit.views import SORTS
+
+try:
+    import numpy as np  # optional: pip install numpy
+except ImportError:
+    np = None
+
+PAID_TIERS = frozenset({"silver", "gold", "platinum"})
+BATCH = 100_000  # users per vectorized pass in next_batch
+
+
+def _require_numpy():
+    if np is None:
+        raise RuntimeError("seedkit.eligibility needs numpy: pip install numpy")
+
+
+def is_premium_user(user):
+    # isPremiumUser() in src/pages/Surveys.jsx
+    return user.get("plan") == "premium" or user.get("tier") in PAID_TIERS
+
+
+def _pack(flags):
+    """Bool array -> little-endian uint64 words (bit i of the mask = position i)."""
+    bits = np.packbits(np.asarray(flags, dtype=bool), bitorder="little")
+    bits = np.concatenate([bits, np.zeros(-len(bits) % 8, dtype=np.uint8)])
+    return bits.view("<u8").astype(np.uint64)
+
+
+class Eligibility:
+    """Catalog masks plus per-user completion bitsets.
+
+    `sort` is None for catalog order or a key of views.SORTS; "next N" means
+    the first N eligible surveys in that order.
+    """
+
+    def __init__(self, surveys, users=(), sort=None):
+        _require_numpy()
+        surveys = list(surveys)
+        if sort:
+            surveys.sort(key=SORTS[sort])
+        self.ids = [s["id"] for s in surveys]
+        self.position = {sid: i for i, sid in enumerate(self.ids)}
+        active = np.array([s.get("status", "active") == "active" for s in surveys], dtype=bool)
+        premium = np.array([bool(s.get("premium")) for s in surveys], dtype=bool)
+        self.words = -(-len(surveys) // 64)
+        # masks[0]: what free users may take, masks[1]: premium users
+        self.masks = np.stack([_pack(active & ~premium), _pack(active)]) if surveys \
+            else np.zeros((2, 0), dtype=np.uint64)
+
+        self.user_ids, premium_users = [], []
+        self.user_index = {}
+        for user in users:
+            if user.get("id") not in self.user_index:
+                self.user_index[user["id"]] = len(self.user_ids)
+                self.user_ids.append(user["id"])
+                premium_users.append(is_premium_user(user))
+        self.tier = np.array(premium_users, dtype=np.int64)
+        # sparse completion bitsets, sorted by key = user * words + word
+        self._keys = np.zeros(0, dtype=np.int64)
+        self._bits = np.zeros(0, dtype=np.uint64)
+
+    def add_completions(self, records):
+        """OR (userId, surveyId) records into the users' bitsets; unknown ids are ignored."""
+        users, surveys = self.user_index, self.position
+        u, p = [], []
+        for record in records:
+            un, pos = users.get(record.get("userId")), surveys.get(record.get("surveyId"))
+            if un is not None and pos is not None:
+                u.append(un)
+                p.append(pos)
+        self.add_pairs(u, p)
+        return len(u)
+
+    def add_pairs(self, users, positions):
+        """OR (user number, survey position) pairs into the bitsets."""
+        p = np.asarray(positions, dtype=np.int64)
+        keys = np.concatenate([self._keys, np.asarray(users, dtype=np.int64) * self.words + (p >> 6)])
+        bits = np.concatenate([self._bits, np.left_shift(np.uint64(1), (p & 63).astype(np.uint64))])
+        if not len(keys):
+            return
+        order = np.argsort(keys, kind="stable")
+        keys, bits = keys[order], bits[order]
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+        self._keys = keys[starts]
+        self._bits = np.bitwise_or.reduceat(bits, starts)
+
+    def completed(self, user_id):
+        """Survey ids the user completed, from their bitset."""
+        un = self.user_index[user_id]
+        lo, hi = np.searchsorted(self._keys, [un * self.words, (un + 1) * self.words])
+        out = []
+        for key, word in zip(self._keys[lo:hi].tolist(), self._bits[lo:hi].tolist()):
+            base = (key - un * self.words) * 64
+            while word:
+                low = word & -word
+                out.append(self.ids[base + low.bit_length() - 1])
+                word ^= low
+        return out
+
+    def _completed_words(self, users, w):
+        """Word w of each user's completion bitset (0 where they have none)."""
+        if not len(self._keys):
+            return np.zeros(len(users), dtype=np.uint64)
+        keys = users * self.words + w
+        at = np.minimum(np.searchsorted(self._keys, keys), len(self._keys) - 1)
+        return np.where(self._keys[at] == keys, self._bits[at], np.uint64(0))
+
+    def next_batch(self, users, n=10):
+        """For user numbers `users`, the positions of their next `n` eligible surveys.
+
+        Returns (row, position) arrays sorted by row, then position: row i of
+        the batch gets the positions where row == i.
+        """
+        users = np.asarray(users, dtype=np.int64)
+        tiers = self.tier[users]
+        found = np.zeros(len(users), dtype=np.int64)
+        hits = []  # (rows, word number, eligible word) for every non-zero word
+        pending = np.arange(len(users))
+        for w in range(self.words):
+            if not len(pending):
+                break
+            words = self.masks[tiers[pending], w] & ~self._completed_words(users[pending], w)
+            nonzero = words != 0
+            hits.append((pending[nonzero], w, words[nonzero]))
+            found[pending] += _popcount(words)
+            pending = pending[found[pending] < n]
+
+        rows = np.concatenate([h[0] for h in hits]) if hits else np.zeros(0, dtype=np.int64)
+        if not len(rows):
+            return rows, rows
+        base = np.concatenate([np.full(len(h[0]), h[1] * 64, dtype=np.int64) for h in hits])
+        words = np.concatenate([h[2] for h in hits])
+        # words were found in ascending w, so a stable sort by row keeps positions ascending
+        order = np.argsort(rows, kind="stable")
+        rows, base, words = rows[order], base[order], words[order]
+
+        # Peel off each word's lowest set bit, at most n times: row-major, the
+        # grid is then ordered by row and position already
+        k = min(n, 64)
+        grid = np.full((len(words), k), -1, dtype=np.int64)
+        for t in range(k):
+            live = words != 0
+            if not live.any():
+                break
+            low = words & (~words + np.uint64(1))
+            grid[live, t] = base[live] + np.log2(low[live].astype(np.float64)).astype(np.int64)
+            words ^= low
+        rows = np.repeat(rows, k)
+        positions = grid.ravel()
+        found = positions >= 0
+        rows, positions = rows[found], positions[found]
+        # keep the first n per row
+        index = np.arange(len(rows))
+        first = np.maximum.accumulate(np.where(np.r_[True, rows[1:] != rows[:-1]], index, 0))
+        keep = index - first < n
+        return rows[keep], positions[keep]
+
+    def next_for(self, user_ids, n=10):
+        """{user id: [next n eligible survey ids]} for a batch of user ids."""
+        out = {}
+        ids = list(user_ids)
+        for start in range(0, len(ids), BATCH):
+            chunk = ids[start:start + BATCH]
+            rows, positions = self.next_batch([self.user_index[u] for u in chunk], n)
+            lists = [[] for _ in chunk]
+            for r, pos in zip(rows.tolist(), positions.tolist()):
+                lists[r].append(self.ids[pos])
+            out.update(zip(chunk, lists))
+        return out
+
+
+def _popcount(words):
+    if hasattr(np, "bitwise_count"):  # numpy >= 2.0
+        return np.bitwise_count(words).astype(np.int64)
+    return np.unpackbits(words.astype("<u8").view(np.uint8).reshape(-1, 8), axis=1).sum(axis=1)
+
+
+def naive_next(surveys, user, completed, n=10):
+    """The per-user list scan the client does, for comparison."""
+    premium = is_premium_user(user)
+    out = []
+    for s in surveys:
+        if s.get("status", "active") == "active" and (premium or not s.get("premium")) \
+                and s["id"] not in completed:
+            out.append(s["id"])
+            if len(out) == n:
+                break
+    return out
+
+
+def load(db_path, completions=(), sort=None):
+    from seedkit.jsonstream import iter_collection
+
+    engine = Eligibility(iter_collection(db_path, "surveys"), iter_collection(db_path, "users"), sort)
+    for path in completions:
+        engine.add_completions(iter_completions(path))
+    return engine
+
+
+def bench(surveys=100_000, users=1_000_000, per_user=20, n=10, naive_users=2_000, seed=0):
+    """Time next-N for every user, bitsets vs the naive scan (sampled, then scaled)."""
+    from seed import surveys as templates
+    from seedkit.synth import make_survey
+
+    rng = np.random.default_rng(seed)
+    catalog = [make_survey(seed, i, templates) for i in range(surveys)]
+    user_list = [{"id": f"u{i}", "plan": "premium" if i % 4 == 0 else "free"} for i in range(users)]
+    # completions skew towards the top of the list, like real users working down it
+    pairs = rng.zipf(1.3, size=users * per_user) % surveys
+    owners = np.repeat(np.arange(users), per_user)
+
+    t0 = perf_counter()
+    engine = Eligibility(catalog, user_list)
+    build_s = perf_counter() - t0
+    t0 = perf_counter()
+    engine.add_pairs(owners, pairs)
+    load_s = perf_counter() - t0
+
+    t0 = perf_counter()
+    for start in range(0, users, BATCH):
+        engine.next_batch(np.arange(start, min(start + BATCH, users)), n)
+    batch_s = perf_counter() - t0
+
+    sample = rng.choice(users, size=min(naive_users, users), replace=False)
+    done = {}
+    mine = np.isin(owners, sample)
+    for u, p in zip(owners[mine].tolist(), pairs[mine].tolist()):
+        done.setdefault(u, set()).add(catalog[p]["id"])
+    t0 = perf_counter()
+    naive = [naive_next(catalog, user_list[u], done.get(u, ()), n) for u in sample.tolist()]
+    naive_s = (perf_counter() - t0) * users / len(sample)
+    fast = engine.next_for([user_list[u]["id"] for u in sample.tolist()], n)
+    agree = all(fast[user_list[u]["id"]] == got for u, got in zip(sample.tolist(), naive))
+    return {"surveys": surveys, "users": users, "completions": users * per_user, "n": n,
+            "build_s": build_s, "load_s": load_s, "batch_s": batch_s, "naive_s": naive_s, "agree": agree}
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    p = argparse.ArgumentParser(description="Next eligible surveys per user, or a benchmark")
+    p.add_argument("user", nargs="*", help="user ids to look up")
+    p.add_argument("--db", type=Path, default=Path("data/db.json"))
+    p.add_argument("--completions", type=Path, nargs="*", default=[], help="completions.jsonl / client export")
+    p.add_argument("-n", type=int, default=10, help="surveys per user")
+    p.add_argument("--sort", choices=SORTS, help="rank surveys like a view (default: catalog order)")
+    p.add_argument("--bench", type=int, metavar="SURVEYS", help="benchmark over a synthetic catalog")
+    p.add_argument("--users", type=int, default=1_000_000, help="users for --bench")
+    args = p.parse_args()
+
+    try:
+        if args.bench:
+            r = bench(args.bench, args.users, n=args.n)
+            print(f"{r['surveys']:,} surveys, {r['users']:,} users, {r['completions']:,} completions, next {r['n']}")
+            print(f"  masks {r['build_s']:.2f}s, completion bitsets {r['load_s']:.2f}s")
+            print(f"  bitsets    {r['batch_s']:8.2f}s  ({r['users'] / r['batch_s']:>12,.0f} users/s)")
+            print(f"  naive scan {r['naive_s']:8.2f}s  ({r['users'] / r['naive_s']:>12,.0f} users/s, extrapolated)")
+            print(f"  results agree: {r['agree']}")
+        else:
+            engine = load(args.db, args.completions, args.sort)
+            for uid, ids in engine.next_for(args.user or engine.user_ids[:10], args.n).items():
+                print(f"{uid}: {', '.join(ids) or '-'}")
+    except RuntimeError as e:
+        sys.exit(str(e))
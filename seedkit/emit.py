@@ -0,0 +1,182 @@
+# seedkit/emit.py
+import json
+
+from seedkit.targets import write_all
+
+
+class Fragment:
+    """A run of records already encoded by iter_records, stored in a file.
+
+    iter_json splices fragments in verbatim, which lets worker processes do
+    the encoding and the parent only copy bytes.
+    """
+
+    def __init__(self, path, count, offsets=None):
+        self.path = path
+        self.count = count
+        # optional "id<TAB>offset<TAB>length" lines, relative to the fragment start
+        self.offsets = offsets
+
+    def chunks(self, size=1 << 20):
+        with open(self.path, encoding="utf-8") as f:
+            while chunk := f.read(size):
+                yield chunk
+
+    def iter_offsets(self):
+        with open(self.offsets, encoding="utf-8") as f:
+            for line in f:
+                rid, offset, length = line.rstrip("\n").split("\t")
+                yield rid, int(offset), int(length)
+
+
+def _span(data):
+    """(start, length) of the record inside one encoded record chunk."""
+    start = len(data) - len(data.lstrip(b", \n"))
+    return start, len(data) - start
+
+
+def _encoder(indent):
+    if indent is None:
+        # minified: no whitespace at all, and json's C encoder does the work
+        return json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+    return json.JSONEncoder(ensure_ascii=False, indent=indent)
+
+
+def _record_text(enc, indent, record, depth=2):
+    # seedkit.model records render their own text, straight from their slots
+    render = getattr(record, "render", None)
+    if indent is None:
+        return render(None, 0) if render else enc.encode(record)
+    nl2 = "\n" + " " * (depth * indent)
+    if render:
+        return nl2 + render(indent, depth)
+    # strings are escaped, so every raw newline is json.dump indentation
+    return nl2 + enc.encode(record).replace("\n", nl2)
+
+
+def encode(record, indent=2):
+    """json.dumps(record, indent=indent) with this module's profile settings."""
+    return _encoder(indent).encode(record)
+
+
+def iter_records(records, indent=2):
+    """Yield the array body for `records` at collection depth, one per chunk."""
+    enc = _encoder(indent)
+    for n, record in enumerate(records):
+        yield ("," if n else "") + _record_text(enc, indent, record)
+
+
+class FragmentWriter:
+    """Append records to a Fragment file one at a time.
+
+    With `offsets`, the byte span of every record is logged there too, so
+    write_db can report spans for spliced fragments without re-reading them.
+    """
+
+    def __init__(self, path, indent=2, offsets=None):
+        self.path = path
+        self.indent = indent
+        self.count = 0
+        self.size = 0
+        self.offsets = offsets
+        self._enc = _encoder(indent)
+        self._f = open(path, "wb")
+        self._log = open(offsets, "w", encoding="utf-8") if offsets else None
+
+    def write(self, record):
+        data = (("," if self.count else "") + _record_text(self._enc, self.indent, record)).encode("utf-8")
+        if self._log:
+            start, length = _span(data)
+            self._log.write(f"{record['id']}\t{self.size + start}\t{length}\n")
+        self._f.write(data)
+        self.size += len(data)
+        self.count += 1
+
+    def close(self):
+        self._f.close()
+        if self._log:
+            self._log.close()
+        return Fragment(self.path, self.count, self.offsets)
+
+
+def iter_array(records, indent=2):
+    """Yield a top-level JSON array of `records`, one record per chunk."""
+    enc = _encoder(indent)
+    n = 0
+    yield "["
+    for record in records:
+        yield ("," if n else "") + _record_text(enc, indent, record, depth=1)
+        n += 1
+    yield "\n]" if n and indent is not None else "]"
+
+
+def iter_json(collections, indent=2):
+    """Yield the {"name": [...], ...} document one record at a time.
+
+    `collections` is a sequence of (name, iterable) pairs; the iterables are
+    consumed lazily so only one record is held in memory at once. The output
+    is byte-for-byte what json.dump(dict(collections), indent=indent) gives;
+    indent=None gives the minified form (separators=(",", ":")).
+    Iterables may also yield Fragment objects, which are copied as-is.
+    """
+    enc = _encoder(indent)
+    nl = "" if indent is None else "\n" + " " * indent
+    colon = ":" if indent is None else ": "
+
+    yield "{"
+    for i, (name, records) in enumerate(collections):
+        yield ("," if i else "") + nl + enc.encode(name) + colon + "["
+        n = 0
+        for record in records:
+            if isinstance(record, Fragment):
+                if not record.count:
+                    continue
+                if n:
+                    yield ","
+                yield from record.chunks()
+                n += record.count
+            else:
+                yield ("," if n else "") + _record_text(enc, indent, record)
+                n += 1
+        yield (nl + "]") if n else "]"
+    yield "\n}" if collections and indent is not None else "}"
+
+
+def write_db(path, collections, indent=2, on_record=None, mirrors=()):
+    """Stream `collections` into `path`; returns {name: count, "bytes": size}.
+
+    If given, on_record(name, id, offset, length) is called with the byte
+    span of every record in the file (fragments only if they logged offsets).
+    `mirrors` are more paths that get the same bytes, written concurrently
+    (see seedkit.targets). Every file is written under a temporary name,
+    fsync'ed and renamed into place, so readers never see a half-written db.
+    """
+    collections = list(collections)
+    counts = {name: 0 for name, _ in collections}
+    current = [None, None]  # (collection, record) iter_json is about to emit
+
+    def counted(name, records):
+        for record in records:
+            counts[name] += record.count if isinstance(record, Fragment) else 1
+            current[:] = name, record
+            yield record
+
+    def encoded():
+        size = 0
+        for chunk in iter_json([(name, counted(name, records)) for name, records in collections], indent=indent):
+            data = chunk.encode("utf-8")
+            name, record = current
+            # a lone "," is the separator iter_json emits ahead of a fragment
+            if on_record and record is not None and chunk != ",":
+                if not isinstance(record, Fragment):
+                    start, length = _span(data)
+                    on_record(name, record["id"], size + start, length)
+                elif record.offsets:
+                    for rid, offset, length in record.iter_offsets():
+                        on_record(name, rid, size + offset, length)
+                current[1] = None
+            yield data
+            size += len(data)
+
+    counts["bytes"] = write_all([path, *mirrors], encoded())
+    return counts
@@ -0,0 +1,543 @@
+# seedkit/fraud.py
+# Bulk scan for account farming: duplicate accounts and low-effort completions.
+#
+# Every completion earns its survey's payout, so one person behind many
+# accounts is paid many times. The scan has two halves, each a single pass.
+#
+# Accounts. Every user gets three keys, hashed to uint64 in one Python loop:
+# the canonical email (case, gmail dots and +tags folded), the email stem
+# (canonical local part with digits and punctuation dropped, so bett@,
+# bett1@ and bett2@ agree) and a MinHash signature of the character 3-grams
+# of name + stem. Shingling and the MinHash are numpy passes over all users
+# at once; the signature is cut into LSH bands so near-identical accounts
+# share a band key. Accounts are grouped by sorting keys (np.unique), never
+# compared pairwise, and groups linked by any key are merged into clusters
+# by label propagation. A stem or band shared by more than MAX_GROUP
+# accounts is a common name, not a farm, and links nobody.
+#
+# Completions. A completion is straight-lined when it answers all of at
+# least MIN_ITEMS items with the same option index, and too fast when it
+# comes less than SECONDS_PER_ITEM per item after the same user's previous
+# one. Both are computed over all completions at once: straight-lining from
+# the encoded answer matrix (or from the answer columns of a
+# seedkit.columnar export, without any JSON), speed from one sort by
+# (user, completedAt).
+#
+#   python -m seedkit.fraud data/completions.jsonl --db data/db.json --out data/fraud.jsonl
+#   python -m seedkit.fraud --bench 1000000
+import json
+import re
+from itertools import islice
+from pathlib import Path
+from time import perf_counter
+
+from seedkit.analytics import CHUNK, Codebook
+from seedkit.columnar import Columns, to_millis
+from seedkit.completions import iter_completions
+from seedkit.jsonstream import iter_collection
+from seedkit.users import hash_key, normalize_email
+
+try:
+    import numpy as np  # optional: pip install numpy
+except ImportError:
+    np = None
+
+MAX_GROUP = 50        # accounts sharing a stem or band key beyond this are a common name
+MINHASH = 32          # hash functions per signature
+BANDS = 4             # LSH bands of MINHASH // BANDS rows: ~0.85 Jaccard to share one
+MIN_SIMILARITY = 0.7  # estimated Jaccard a band match must also reach over the whole signature
+MIN_ITEMS = 4         # fewer items and the same answer throughout is just as likely honest
+SECONDS_PER_ITEM = 3  # less than this per item since the user's previous completion is too fast
+BATCH = 200_000       # users per MinHash pass
+
+SIGNALS = ("email", "stem", "minhash")
+_NON_LETTERS = re.compile(r"[^a-z]+")
+_GMAIL = frozenset({"gmail.com", "googlemail.com"})
+
+
+def _require_numpy():
+    if np is None:
+        raise RuntimeError("seedkit.fraud needs numpy: pip install numpy")
+
+
+def canonical_email(email):
+    """'B.Ett+promo@GoogleMail.com' -> 'bett@gmail.com': what the mailbox actually is."""
+    email = normalize_email(email)
+    local, at, domain = email.rpartition("@")
+    if not at:
+        return email
+    local = local.split("+", 1)[0]
+    if domain in _GMAIL:
+        local, domain = local.replace(".", ""), "gmail.com"
+    return f"{local}@{domain}"
+
+
+def email_stem(canonical):
+    """'bettkipkoech45@gmail.com' -> 'bettkipkoech@gmail.com': the handle without numbering."""
+    local, _, domain = canonical.rpartition("@")
+    return f"{_NON_LETTERS.sub('', local)}@{domain}"
+
+
+def _name(name):
+    # word order and spacing don't matter: "Bett Biss" is "Biss  Bett"
+    return " ".join(sorted(str(name or "").casefold().split()))
+
+
+# -- accounts -----------------------------------------------------------------
+
+class Accounts:
+    """Keys of every user, one row per user in the order given."""
+
+    def __init__(self, users):
+        _require_numpy()
+        self.ids, self.names, self.emails, texts = [], [], [], []
+        email_keys, stem_keys, passwords, created = [], [], [], []
+        for user in users:
+            email = canonical_email(user.get("email"))
+            stem = email_stem(email) if "@" in email else ""
+            name = _name(user.get("name"))
+            self.ids.append(user.get("id"))
+            self.names.append(user.get("name"))
+            self.emails.append(user.get("email"))
+            email_keys.append(hash_key(email) if email else 0)
+            # a stem with no letters left (123@...) says nothing about who owns it
+            stem_keys.append(hash_key(stem) if len(stem.partition("@")[0]) >= 3 else 0)
+            passwords.append(hash_key(str(user.get("password"))))
+            created.append(user.get("createdAt") if isinstance(user.get("createdAt"), int) else -1)
+            texts.append(f"{name} {stem.partition('@')[0]}")
+        self.email_keys = np.array(email_keys, dtype=np.uint64)
+        self.stem_keys = np.array(stem_keys, dtype=np.uint64)
+        self.passwords = np.array(passwords, dtype=np.uint64)
+        self.created = np.array(created, dtype=np.int64)
+        self.signatures = minhash(texts)
+
+    @classmethod
+    def from_db(cls, db_path):
+        return cls(iter_collection(db_path, "users"))
+
+    def __len__(self):
+        return len(self.ids)
+
+
+def _shingles(texts):
+    """(3-gram codes, owner) for every text, owners ascending."""
+    raw = [t.encode("utf-8") for t in texts]
+    lengths = np.fromiter(map(len, raw), dtype=np.int64, count=len(raw))
+    buf = np.frombuffer(b"".join(raw), dtype=np.uint8).astype(np.uint64)
+    if len(buf) < 3:
+        return np.zeros(0, dtype=np.uint64), np.zeros(0, dtype=np.int64)
+    owner = np.repeat(np.arange(len(raw)), lengths)[:-2]
+    ends = np.cumsum(lengths)
+    keep = np.arange(len(buf) - 2) + 2 < ends[owner]  # no gram across two texts
+    grams = (buf[:-2] << np.uint64(16)) | (buf[1:-1] << np.uint64(8)) | buf[2:]
+    return grams[keep], owner[keep]
+
+
+def minhash(texts, k=MINHASH, seed=0, batch=BATCH):
+    """(len(texts), k) uint64 MinHash signatures of character 3-grams; all-ones for texts under 3 bytes."""
+    _require_numpy()
+    rng = np.random.default_rng(seed)
+    # multiply-shift hashing: (a * x + b) >> 32 with odd 64-bit a, modulo 2**64
+    a = rng.integers(1, 2 ** 63, size=k, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+    b = rng.integers(0, 2 ** 63, size=k, dtype=np.uint64)
+    out = np.full((len(texts), k), np.iinfo(np.uint64).max, dtype=np.uint64)
+    for start in range(0, len(texts), batch):
+        grams, owner = _shingles(texts[start:start + batch])
+        if not len(grams):
+            continue
+        starts = np.flatnonzero(np.r_[True, owner[1:] != owner[:-1]])
+        rows = start + owner[starts]
+        with np.errstate(over="ignore"):
+            for j in range(k):
+                out[rows, j] = np.minimum.reduceat((grams * a[j] + b[j]) >> np.uint64(32), starts)
+    return out
+
+
+def _bands(signatures, bands=BANDS):
+    """One uint64 key per (user, band); rows of an all-ones (empty) signature get key 0."""
+    rows = signatures.shape[1] // bands
+    empty = signatures[:, 0] == np.iinfo(np.uint64).max
+    keys = []
+    with np.errstate(over="ignore"):
+        for band in range(bands):
+            key = np.zeros(len(signatures), dtype=np.uint64)
+            for col in range(band * rows, (band + 1) * rows):
+                key = key * np.uint64(0x9E3779B97F4A7C15) + signatures[:, col]
+            key[empty] = 0
+            keys.append(key)
+    return keys
+
+
+def _links(keys, max_group=None):
+    """(member, head) edges joining users with the same nonzero key, and the groups too large to use.
+
+    The head is the group's first user, so every group is a star.
+    """
+    idx = np.flatnonzero(keys != 0)
+    if not len(idx):
+        return idx, idx, 0
+    _, first, inverse, counts = np.unique(keys[idx], return_index=True, return_inverse=True, return_counts=True)
+    size = counts[inverse]
+    take = size >= 2
+    if max_group:
+        take &= size <= max_group
+    common = int((counts > max_group).sum()) if max_group else 0
+    members = idx[take]
+    return members, idx[first[inverse[take]]], common
+
+
+def _components(n, a, b):
+    """Connected-component labels (smallest member) for edges a-b, by min-label propagation."""
+    labels = np.arange(n)
+    if not len(a):
+        return labels
+    while True:
+        low = np.minimum(labels[a], labels[b])
+        new = labels.copy()
+        np.minimum.at(new, a, low)
+        np.minimum.at(new, b, low)
+        new = new[new]  # pointer jumping: labels only ever point at smaller ones
+        if np.array_equal(new, labels):
+            return labels
+        labels = new
+
+
+def duplicates(accounts, max_group=MAX_GROUP, bands=BANDS):
+    """Cluster labels for `accounts`, a bool mask per signal of who it linked, and common-key counts."""
+    found = {"email": _links(accounts.email_keys),
+             "stem": _links(accounts.stem_keys, max_group)}
+    band_links = [_links(key, max_group) for key in _bands(accounts.signatures, bands)]
+    members = np.concatenate([m for m, _, _ in band_links])
+    heads = np.concatenate([h for _, h, _ in band_links])
+    # a shared band is only a candidate: keep the pairs whose whole signatures agree enough
+    sig = accounts.signatures
+    similar = (sig[members] == sig[heads]).mean(axis=1) >= MIN_SIMILARITY if len(members) else members > 0
+    found["minhash"] = (members[similar], heads[similar], sum(c for _, _, c in band_links))
+    n = len(accounts)
+    a = np.concatenate([m for m, _, _ in found.values()])
+    b = np.concatenate([h for _, h, _ in found.values()])
+    labels = _components(n, a, b)
+    linked = {}
+    for signal, (members, heads, _) in found.items():
+        mask = np.zeros(n, dtype=bool)
+        mask[members] = True
+        mask[heads] = True
+        linked[signal] = mask
+    return labels, linked, {signal: common for signal, (_, _, common) in found.items()}
+
+
+def clusters(accounts, labels, linked):
+    """Yield one dict per cluster of two or more accounts, largest first."""
+    sizes = np.bincount(labels, minlength=len(labels))
+    members = np.flatnonzero(sizes[labels] >= 2)
+    if not len(members):
+        return
+    members = members[np.lexsort((members, labels[members], -sizes[labels[members]]))]
+    cuts = np.flatnonzero(np.diff(labels[members])) + 1
+    for group in np.split(members, cuts):
+        created = accounts.created[group]
+        created = created[created >= 0]
+        yield {
+            "users": [{"id": accounts.ids[u], "name": accounts.names[u], "email": accounts.emails[u]}
+                      for u in group.tolist()],
+            "signals": [s for s in SIGNALS if linked[s][group].any()],
+            "samePassword": bool((accounts.passwords[group] == accounts.passwords[group[0]]).all()),
+            "createdSpanHours": round(float(created.max() - created.min()) / 3.6e6, 1) if len(created) else None,
+        }
+
+
+# -- completions --------------------------------------------------------------
+
+class Effort:
+    """Straight-lined and too-fast flags for every completion, added a chunk at a time."""
+
+    def __init__(self):
+        _require_numpy()
+        self.user_ids, self.survey_ids = [], []
+        self._users = {}
+        self._parts = []  # (user, survey, completed_at, items, straight) arrays per chunk
+        self.stats = {"completions": 0, "unknownSurvey": 0}
+
+    def _user_numbers(self, uids):
+        index, ids = self._users, self.user_ids
+        out = []
+        for uid in uids:
+            u = index.get(uid)
+            if u is None:
+                u = index[uid] = len(ids)
+                ids.append(uid)
+            out.append(u)
+        return np.array(out, dtype=np.int64)
+
+    def add_records(self, records, book, chunk=CHUNK):
+        """Completion records coded against `book` (an analytics.Codebook)."""
+        if not self.survey_ids:
+            self.survey_ids = list(book.ids)
+        elif self.survey_ids != book.ids:
+            raise ValueError("completions were coded against different catalogs")
+        n_items = (book.nopt > 0).sum(axis=1)
+        records = iter(records)
+        while batch := list(islice(records, chunk)):
+            known = [r for r in batch if book.survey_number(r.get("surveyId")) is not None]
+            self.stats["unknownSurvey"] += len(batch) - len(known)
+            s, matrix, _ = book.encode((r["surveyId"], r.get("answers") or {}) for r in known)
+            answered = matrix >= 0
+            lo = np.where(answered, matrix, np.iinfo(np.int16).max).min(axis=1, initial=np.iinfo(np.int16).max)
+            hi = matrix.max(axis=1, initial=-1)
+            self._add(self._user_numbers(r.get("userId") for r in known), s,
+                      to_millis([r.get("completedAt") for r in known]), n_items[s],
+                      answered.sum(axis=1), lo, hi)
+        return self
+
+    def add_columns(self, cols, chunk=CHUNK):
+        """Every completion of a seedkit.columnar export, straight from its memory maps."""
+        exported = cols.surveys()
+        if self.survey_ids:
+            raise ValueError("a columns export must be scanned on its own")
+        self.survey_ids = [s["id"] for s in exported]
+        self.user_ids = cols.users()
+        self._users = None  # numbered by the export
+        n_items = np.array([len(s["items"]) for s in exported] or [0], dtype=np.int64)
+        rows = len(cols.completion_user)
+        bounds = np.searchsorted(cols.answer_completion, np.arange(0, rows + chunk * 8, chunk * 8))
+        for n, start in enumerate(range(0, rows, chunk * 8)):
+            stop = min(start + chunk * 8, rows)
+            at = cols.answer_completion[bounds[n]:bounds[n + 1]] - start
+            option = np.asarray(cols.answer_option[bounds[n]:bounds[n + 1]])
+            answered = np.bincount(at, minlength=stop - start)
+            lo = np.full(stop - start, np.iinfo(np.int32).max, dtype=np.int64)
+            hi = np.full(stop - start, -1, dtype=np.int64)
+            if len(at):
+                # answers are grouped by completion: one reduceat per run
+                runs = np.flatnonzero(np.r_[True, at[1:] != at[:-1]])
+                lo[at[runs]] = np.minimum.reduceat(option, runs)
+                hi[at[runs]] = np.maximum.reduceat(option, runs)
+            s = np.asarray(cols.completion_survey[start:stop], dtype=np.int64)
+            self._add(np.asarray(cols.completion_user[start:stop], dtype=np.int64), s,
+                      np.asarray(cols.completion_completed_at[start:stop]), n_items[s], answered, lo, hi)
+        return self
+
+    def _add(self, users, surveys, completed_at, items, answered, lo, hi):
+        straight = (items >= MIN_ITEMS) & (answered == items) & (lo == hi)
+        self._parts.append((users, surveys, completed_at, items, straight))
+        self.stats["completions"] += len(users)
+
+    def flags(self, seconds_per_item=SECONDS_PER_ITEM):
+        """(user, survey, completed_at, straight, fast, gap ms) arrays over every completion."""
+        if not self._parts:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty, empty, empty.astype(bool), empty.astype(bool), empty
+        user, survey, at, items, straight = (np.concatenate(col) for col in zip(*self._parts))
+        self._parts = [(user, survey, at, items, straight)]
+        gap = np.full(len(user), -1, dtype=np.int64)
+        order = np.lexsort((at, user))
+        nat = np.datetime64("NaT", "ms").view(np.int64)
+        prev, cur = order[:-1], order[1:]
+        same = (user[prev] == user[cur]) & (at[prev] != nat) & (at[cur] != nat)
+        gap[cur[same]] = at[cur[same]] - at[prev[same]]
+        fast = (gap >= 0) & (gap < items * seconds_per_item * 1000)
+        return user, survey, at, straight, fast, gap
+
+
+def _iso(ms):
+    return None if ms == np.datetime64("NaT", "ms").view(np.int64) else \
+        str(np.datetime64(int(ms), "ms")) + "Z"
+
+
+# -- report -------------------------------------------------------------------
+
+def scan(db_path=None, inputs=(), max_group=MAX_GROUP, seconds_per_item=SECONDS_PER_ITEM, out=None,
+         limit=10, users=None):
+    """Duplicate clusters over the users of `db_path` (or `users`) and effort flags over `inputs`.
+
+    `inputs` are completions.jsonl, client exports or one seedkit.columnar
+    directory; every finding goes to `out` as JSON Lines if given.
+    """
+    _require_numpy()
+    timings = {}
+    sink = open(out, "w", encoding="utf-8") if out else None
+    try:
+        t0 = perf_counter()
+        accounts = Accounts(users if users is not None else
+                            iter_collection(db_path, "users") if db_path else ())
+        labels, linked, common = duplicates(accounts, max_group)
+        found, clustered = [], set()
+        for n, cluster in enumerate(clusters(accounts, labels, linked)):
+            clustered.update(u["id"] for u in cluster["users"])
+            if len(found) < limit:
+                found.append(cluster)
+            if sink:
+                sink.write(json.dumps({"kind": "duplicates", "cluster": n, **cluster}, ensure_ascii=False) + "\n")
+        timings["accounts"] = perf_counter() - t0
+
+        t0 = perf_counter()
+        effort = Effort()
+        book = None
+        for path in map(Path, inputs):
+            if path.is_dir():
+                effort.add_columns(Columns(path))
+            else:
+                book = book or Codebook.from_db(db_path)
+                effort.add_records(iter_completions(path), book)
+        user, survey, at, straight, fast, gap = effort.flags(seconds_per_item)
+        flagged = straight | fast
+        timings["completions"] = perf_counter() - t0
+        in_clusters = np.array([uid in clustered for uid in effort.user_ids] or [False], dtype=bool)
+        if sink:
+            for c in np.flatnonzero(flagged).tolist():
+                sink.write(json.dumps({
+                    "kind": "straightLine" if straight[c] else "tooFast", "tooFast": bool(fast[c]),
+                    "userId": effort.user_ids[user[c]], "surveyId": effort.survey_ids[survey[c]],
+                    "completedAt": _iso(at[c]), "gapSeconds": gap[c] / 1000 if gap[c] >= 0 else None,
+                }, ensure_ascii=False) + "\n")
+    finally:
+        if sink:
+            sink.close()
+
+    per_user = np.bincount(user[flagged], minlength=len(effort.user_ids))
+    top = np.argsort(-per_user, kind="stable")[:limit]
+    return {
+        "users": len(accounts),
+        "clusters": int((np.bincount(labels, minlength=len(labels)) >= 2).sum()) if len(labels) else 0,
+        "clusteredUsers": len(clustered),
+        "bySignal": {s: int(linked[s].sum()) for s in SIGNALS},
+        "commonKeys": common,
+        "completions": effort.stats["completions"],
+        "unknownSurvey": effort.stats["unknownSurvey"],
+        "straightLined": int(straight.sum()),
+        "tooFast": int(fast.sum()),
+        "flaggedByClustered": int(flagged[in_clusters[user]].sum()) if len(user) else 0,
+        "topClusters": found,
+        "topUsers": [{"userId": effort.user_ids[u], "flagged": int(per_user[u]), "completions": int(c)}
+                     for u, c in zip(top.tolist(), np.bincount(user, minlength=len(per_user))[top].tolist())
+                     if per_user[u]],
+        "timings": timings,
+    }
+
+
+def format_report(report, limit=5):
+    lines = [f"{report['users']:,} users: {report['clusters']:,} duplicate clusters holding "
+             f"{report['clusteredUsers']:,} accounts (linked by " +
+             ", ".join(f"{s} {n:,}" for s, n in report["bySignal"].items()) + ")"]
+    for cluster in report["topClusters"][:limit]:
+        extra = ", same password" if cluster["samePassword"] else ""
+        lines.append(f"  {len(cluster['users'])} accounts via {'/'.join(cluster['signals'])}{extra}: " +
+                     ", ".join(u["email"] or str(u["id"]) for u in cluster["users"][:6]) +
+                     (" ..." if len(cluster["users"]) > 6 else ""))
+    if report["completions"]:
+        lines.append(f"{report['completions']:,} completions: {report['straightLined']:,} straight-lined, "
+                     f"{report['tooFast']:,} too fast ({report['flaggedByClustered']:,} flagged ones by "
+                     f"clustered accounts)")
+        for row in report["topUsers"][:limit]:
+            lines.append(f"  {row['userId']}  {row['flagged']:,} of {row['completions']:,} flagged")
+    return "\n".join(lines)
+
+
+# -- bench --------------------------------------------------------------------
+
+def plant_farms(users, farms, seed=0):
+    """Append `farms` groups of 3-8 accounts one person would make; returns the groups' ids."""
+    import random
+    import uuid
+
+    rng = random.Random(f"{seed}:farms")
+    planted = []
+    for f in range(farms):
+        handle = "".join(rng.choices("abcdefghijklmnopqrstuvwxyz", k=rng.randint(5, 10)))
+        name = f"{handle.title()} {rng.choice(('Bett', 'Kamau', 'Otieno', 'Wanjiru'))}"
+        domain = rng.choice(("gmail.com", "yahoo.com"))
+        created = 1757856000000 + rng.randrange(30 * 86_400_000)
+        emails = [f"{handle}@{domain}"] + [f"{handle}{k}@{domain}" for k in range(1, rng.randint(3, 8))]
+        if domain == "gmail.com":
+            emails[-1] = f"{handle[:2]}.{handle[2:]}+{f}@googlemail.com"  # the same mailbox as the first
+        else:
+            emails[-1] = f"{handle}{handle[-1]}@{domain}"  # a new handle, only MinHash can tie it back
+        group = []
+        for k, email in enumerate(emails):
+            uid = str(uuid.UUID(int=rng.getrandbits(128), version=4))
+            group.append(uid)
+            users.append({"id": uid, "name": name if k % 3 else name.upper(), "email": email,
+                          "password": f"farm{f}", "referral": None, "balance": 0,
+                          "createdAt": created + k * rng.randrange(60_000, 3_600_000), "plan": "free"})
+        planted.append(group)
+    return planted
+
+
+def bench(users=1_000_000, farms=1_000, completions=200_000, seed=0):
+    import tempfile
+
+    import seed as seed_script
+    from seedkit.columnar import export
+    from seedkit.emit import write_db
+    from seedkit.synth import make_completion, make_survey, make_user
+
+    templates = seed_script.surveys
+    people = [make_user(seed, i) for i in range(users)]
+    planted = plant_farms(people, farms, seed)
+    catalog = [make_survey(seed, i, templates) for i in range(200)]
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Path(tmp) / "db.json"
+        write_db(db, [("users", people), ("surveys", catalog)], None)
+        jsonl = Path(tmp) / "completions.jsonl"
+        # farm accounts answer every item with the first option, a survey every 10 seconds
+        farmed = [uid for group in planted for uid in group]
+        with open(jsonl, "w", encoding="utf-8") as f:
+            for k in range(completions):
+                f.write(json.dumps(make_completion(seed, k, users, len(catalog), templates)) + "\n")
+            for n, uid in enumerate(farmed):
+                for j, survey in enumerate(catalog[n % 50:n % 50 + 5]):
+                    f.write(json.dumps({"userId": uid, "surveyId": survey["id"],
+                                        "answers": {f"i_{i}": it["options"][0] for i, it in enumerate(survey["items"])},
+                                        "completedAt": f"2025-10-01T08:00:{10 * j:02d}.000Z"}) + "\n")
+        export([jsonl], db, Path(tmp) / "cols")
+        del people
+        out = Path(tmp) / "fraud.jsonl"
+        report = scan(db, [jsonl], out=out)
+        columns = scan(db, [Path(tmp) / "cols"])
+        with open(out, encoding="utf-8") as f:
+            found = [[u["id"] for u in row["users"]] for row in map(json.loads, f) if row["kind"] == "duplicates"]
+    where = {uid: n for n, group in enumerate(found) for uid in group}
+    farmed = set(farmed)
+    caught = sum(1 for group in planted if len({where.get(uid, -1 - k) for k, uid in enumerate(group)}) == 1)
+    keys = ("straightLined", "tooFast", "flaggedByClustered")
+    return {"users": users + len(farmed), "farms": farms, "caught": caught,
+            "strays": sum(uid not in farmed for group in found for uid in group),
+            "json_s": report["timings"]["completions"], "columns_s": columns["timings"]["completions"],
+            "report": report,
+            "columns_agree": all(report[k] == columns[k] for k in keys)}
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    p = argparse.ArgumentParser(description="Find duplicate accounts and straight-lined or too-fast completions")
+    p.add_argument("inputs", nargs="*", type=Path,
+                   help="completions.jsonl, client completions export or seedkit.columnar directory")
+    p.add_argument("--db", type=Path, default=Path("data/db.json"), help="users, and the catalog for JSON inputs")
+    p.add_argument("--max-group", type=int, default=MAX_GROUP,
+                   help="ignore a stem or MinHash key shared by more accounts than this")
+    p.add_argument("--seconds-per-item", type=float, default=SECONDS_PER_ITEM)
+    p.add_argument("--out", type=Path, help="write every cluster and flagged completion as JSON Lines")
+    p.add_argument("--bench", type=int, metavar="USERS", help="scan synthetic users with planted farms")
+    args = p.parse_args()
+
+    try:
+        if args.bench:
+            r = bench(args.bench)
+            t = r["report"]["timings"]
+            print(f"{r['users']:,} users: {r['caught']:,} of {r['farms']:,} planted farms clustered whole, "
+                  f"{r['strays']:,} other accounts clustered; accounts {t['accounts']:.2f}s")
+            print(f"{r['report']['completions']:,} completions: JSON {r['json_s']:.2f}s, columns {r['columns_s']:.2f}s "
+                  f"(same flags: {r['columns_agree']})")
+            print(format_report(r["report"]))
+            sys.exit(0)
+        t0 = perf_counter()
+        report = scan(args.db, args.inputs, args.max_group, args.seconds_per_item, args.out)
+        elapsed = perf_counter() - t0
+    except (RuntimeError, ValueError) as e:
+        sys.exit(str(e))
+    print(format_report(report))
+    print(f"\nScanned in {elapsed:.2f}s")
+    if args.out:
+        print(f"✓ Wrote {args.out}")
@@ -0,0 +1,104 @@
+# seedkit/incremental.py
+# Incremental re-seeding: keep timestamps of unchanged surveys and leave
+# db.json untouched (same bytes, same mtime) when nothing changed.
+#
+# db.json.options records the options that shaped the last incremental run's
+# artifacts (page size, which of --shards/--views/--sqlite/... were written);
+# a run with different options is never skipped, so none of them go stale.
+import hashlib
+import json
+from pathlib import Path
+
+from seedkit.emit import iter_json
+
+STAMPS = ("createdAt", "updatedAt")
+# seed.py options that change what gets written besides db.json's own bytes
+OPTIONS = ("profile", "index", "shards", "scales", "search", "views", "page_size", "sqlite", "merge_users",
+           "synthetic", "surveys", "users", "completions", "columns", "seed")
+
+
+def content_hash(survey):
+    """sha256 of the survey without its timestamps, independent of key order."""
+    body = {k: v for k, v in survey.items() if k not in STAMPS}
+    text = json.dumps(body, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def load_stamps(db_path):
+    """{id: (content hash, createdAt, updatedAt)} for the surveys already on disk."""
+    try:
+        with open(db_path, encoding="utf-8") as f:
+            old = json.load(f).get("surveys", [])
+    except (OSError, ValueError, AttributeError):
+        return {}
+    return {s["id"]: (content_hash(s), s.get("createdAt"), s.get("updatedAt"))
+            for s in old if isinstance(s, dict) and "id" in s}
+
+
+def restamp(surveys, stamps, now, changes=None):
+    """Yield surveys with createdAt/updatedAt carried over from `stamps`.
+
+    Unchanged surveys keep both stamps, changed ones keep createdAt and get
+    updatedAt=now, new ones get now for both. `changes` (a dict) is filled
+    with added/changed/unchanged counts.
+    """
+    if changes is not None:
+        changes.update(added=0, changed=0, unchanged=0)
+    for survey in surveys:
+        old = stamps.get(survey["id"])
+        survey = dict(survey)
+        if old is None:
+            kind = "added"
+            survey["createdAt"] = survey["updatedAt"] = now
+        elif old[0] == content_hash(survey):
+            kind = "unchanged"
+            survey["createdAt"], survey["updatedAt"] = old[1], old[2]
+        else:
+            kind = "changed"
+            survey["createdAt"], survey["updatedAt"] = old[1], now
+        if changes is not None:
+            changes[kind] += 1
+        yield survey
+
+
+def file_digest(path):
+    h = hashlib.sha256()
+    try:
+        with open(path, "rb") as f:
+            while chunk := f.read(1 << 20):
+                h.update(chunk)
+    except FileNotFoundError:
+        return None
+    return h.hexdigest()
+
+
+def output_digest(collections, indent=2):
+    """sha256 of what write_db would write, without writing anything."""
+    h = hashlib.sha256()
+    for chunk in iter_json(list(collections), indent=indent):
+        h.update(chunk.encode("utf-8"))
+    return h.hexdigest()
+
+
+def options_path(db_path):
+    return Path(db_path).with_name(Path(db_path).name + ".options")
+
+
+def options_stamp(args):
+    """The output-shaping options of a seed.py run, JSON-comparable."""
+    return {name: v if v is None or isinstance(v, (bool, int, str)) else str(v)
+            for name in OPTIONS for v in [getattr(args, name, None)]}
+
+
+def load_options(db_path):
+    try:
+        return json.loads(options_path(db_path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def save_options(db_path, stamp):
+    path = options_path(db_path)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(stamp, sort_keys=True), encoding="utf-8")
+    tmp.replace(path)
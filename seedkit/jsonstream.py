@@ -0,0 +1,102 @@
+# seedkit/jsonstream.py
+# Read one top-level array out of a {"name": [...], ...} file record by record,
+# without loading the document. Each record goes through json's C decoder;
+# only the record being decoded (plus one read chunk) is held in memory.
+import json
+
+CHUNK = 1 << 20
+_decoder = json.JSONDecoder()
+_WS = " \t\n\r"
+
+
+class _Reader:
+    def __init__(self, f):
+        self.f = f
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self):
+        data = self.f.read(CHUNK)
+        if not data:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + data
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Next non-whitespace character (not consumed), or "" at EOF."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WS:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"expected {char!r} in JSON stream, got {self.peek()!r}")
+        self.pos += 1
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buf, self.pos)
+                # a bare number at the very end of the buffer may be cut short
+                if end < len(self.buf) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self._fill()
+
+
+def _items(r):
+    r.expect("[")
+    if r.peek() == "]":
+        r.pos += 1
+        return
+    while True:
+        yield r.value()
+        if r.peek() == ",":
+            r.pos += 1
+            continue
+        r.expect("]")
+        return
+
+
+def iter_collection(path, name):
+    """Yield the records of the top-level array `name` in the JSON file at `path`.
+
+    Other top-level arrays are skipped element by element, so they never sit
+    in memory whole either. Yields nothing if the file or key is missing.
+    """
+    try:
+        f = open(path, encoding="utf-8")
+    except FileNotFoundError:
+        return
+    with f:
+        r = _Reader(f)
+        r.expect("{")
+        if r.peek() == "}":
+            return
+        while True:
+            key = r.value()
+            r.expect(":")
+            if r.peek() == "[":
+                for record in _items(r):
+                    if key == name:
+                        yield record
+                if key == name:
+                    return
+            else:
+                r.value()
+            if r.peek() == ",":
+                r.pos += 1
+                continue
+            r.expect("}")
+            return
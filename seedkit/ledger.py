@@ -0,0 +1,252 @@
+# seedkit/ledger.py
+# Recompute user balances from first principles and report drift.
+#
+# A user's expected balance is what Dashboard.jsx computes client-side: the
+# payout of every survey they completed, minus their withdrawals. Payouts are
+# looked up through a survey id -> number hash index, completions are mapped
+# to (user number, survey number) a chunk at a time, and each chunk is summed
+# per user with one weighted bincount.
+#
+# With a checkpoint, the per-user totals are saved after a run; the next run
+# resumes completions.jsonl at the byte offset it stopped at (client exports
+# have no order, so there only completions newer than the saved completedAt
+# watermark count) and adds just the new rows.
+#
+#   python -m seedkit.ledger data/completions.jsonl --db data/db.json --checkpoint data/ledger.npz
+import hashlib
+import json
+from itertools import islice
+from pathlib import Path
+from time import perf_counter
+
+from seedkit.completions import iter_client, iter_jsonl
+from seedkit.jsonstream import iter_collection
+
+try:
+    import numpy as np  # optional: pip install numpy
+except ImportError:
+    np = None
+
+CHUNK = 200_000
+TOLERANCE = 0.005  # balances are money; anything under half a cent is rounding
+GUARD = 4096       # bytes before a saved offset that must still match to resume there
+
+
+def _require_numpy():
+    if np is None:
+        raise RuntimeError("seedkit.ledger needs numpy: pip install numpy")
+
+
+class Ledger:
+    """Per-user earned/withdrawn totals against the stored balances in a db.json."""
+
+    def __init__(self, db_path):
+        _require_numpy()
+        self.payout_index = {}  # survey id -> survey number
+        payouts = []
+        for survey in iter_collection(db_path, "surveys"):
+            if survey.get("id") not in self.payout_index:
+                self.payout_index[survey["id"]] = len(payouts)
+                payouts.append(float(survey.get("payout") or 0))
+        self.payouts = np.array(payouts, dtype=np.float64)
+
+        self.user_index = {}  # user id -> user number
+        self.user_ids, stored = [], []
+        for user in iter_collection(db_path, "users"):
+            if user.get("id") not in self.user_index:
+                self.user_index[user["id"]] = len(self.user_ids)
+                self.user_ids.append(user["id"])
+                stored.append(float(user.get("balance") or 0))
+        self.stored = np.array(stored, dtype=np.float64)
+        self.earned = np.zeros(len(stored), dtype=np.float64)
+        self.withdrawn = np.zeros(len(stored), dtype=np.float64)
+        self.stats = {"completions": 0, "withdrawals": 0, "unknownUser": 0, "unknownSurvey": 0}
+        self.watermark = ""  # latest completedAt seen, ISO strings compare in time order
+        self.offsets = {}    # completions.jsonl path -> {"offset", "guard"}
+        self.recomputed = False  # a checkpoint was thrown away because its input was rewritten
+
+    def add_completions(self, records):
+        """Credit each record's survey payout to its user."""
+        users, surveys = self.user_index, self.payout_index
+        records = iter(records)
+        while chunk := list(islice(records, CHUNK)):
+            u, s = [], []
+            for record in chunk:
+                un = users.get(record.get("userId"))
+                sn = surveys.get(record.get("surveyId"))
+                if un is None:
+                    self.stats["unknownUser"] += 1
+                elif sn is None:
+                    self.stats["unknownSurvey"] += 1
+                else:
+                    u.append(un)
+                    s.append(sn)
+                done = record.get("completedAt") or ""
+                if done > self.watermark:
+                    self.watermark = done
+            if u:
+                self.earned += np.bincount(np.array(u, dtype=np.int64), weights=self.payouts[s],
+                                           minlength=len(self.earned))
+            self.stats["completions"] += len(u)
+
+    def add_withdrawals(self, records):
+        """Debit {"userId", "amount"} records (the client's withdrawals, tagged with a user)."""
+        u, amounts = [], []
+        for record in records:
+            un = self.user_index.get(record.get("userId"))
+            if un is None:
+                self.stats["unknownUser"] += 1
+                continue
+            u.append(un)
+            amounts.append(abs(float(record.get("amount") or 0)))
+        if u:
+            self.withdrawn += np.bincount(np.array(u, dtype=np.int64), weights=amounts,
+                                          minlength=len(self.withdrawn))
+        self.stats["withdrawals"] += len(u)
+
+    def can_resume(self, path):
+        """False if `path` was rewritten (not just appended to) since the checkpoint."""
+        saved = self.offsets.get(str(path))
+        if not saved:
+            return True
+        return saved["offset"] <= Path(path).stat().st_size and _guard(path, saved["offset"]) == saved["guard"]
+
+    def add_jsonl(self, path):
+        """add_completions() for a .jsonl file, starting where the last checkpoint left off."""
+        path = Path(path)
+        size = path.stat().st_size
+        saved = self.offsets.get(str(path))
+        start = saved["offset"] if saved and self.can_resume(path) else 0
+        self.add_completions(iter_jsonl(path, start, size))
+        self.offsets[str(path)] = {"offset": size, "guard": _guard(path, size)}
+        return start
+
+    def add_client(self, path, since=None):
+        """add_completions() for a client export, skipping what the watermark `since` covers.
+
+        `since` defaults to the current watermark. When several exports are
+        applied in one run, pass the checkpoint's watermark to each: the
+        watermark moves as records are added, and older entries in a later
+        file are still new.
+        """
+        mark = self.watermark if since is None else since
+        self.add_completions(r for r in iter_client(path) if (r.get("completedAt") or "") > mark)
+
+    def expected(self):
+        return self.earned - self.withdrawn
+
+    def mismatches(self, tolerance=TOLERANCE):
+        """(user numbers, expected, stored) where they differ, largest drift first."""
+        expected = self.expected()
+        drift = expected - self.stored
+        bad = np.flatnonzero(np.abs(drift) > tolerance)
+        bad = bad[np.argsort(-np.abs(drift[bad]), kind="stable")]
+        return bad, expected[bad], self.stored[bad]
+
+    def report(self, tolerance=TOLERANCE, limit=20):
+        bad, expected, stored = self.mismatches(tolerance)
+        drift = expected - stored
+        return {
+            **self.stats,
+            "users": len(self.user_ids),
+            "mismatched": len(bad),
+            "overstated": float(np.abs(drift[drift < 0]).sum()),  # stored higher than earned
+            "understated": float(drift[drift > 0].sum()),         # stored lower than earned
+            "watermark": self.watermark or None,
+            "recomputed": self.recomputed,
+            "top": [{"userId": self.user_ids[u], "expected": round(float(e), 2), "stored": round(float(s), 2)}
+                    for u, e, s in zip(bad[:limit], expected[:limit], stored[:limit])],
+        }
+
+    # -- checkpoint --------------------------------------------------------
+
+    def save(self, path):
+        meta = {"watermark": self.watermark, "offsets": self.offsets, "stats": self.stats}
+        tmp = Path(f"{path}.tmp.npz")
+        np.savez(tmp, ids=np.array([str(u).encode("utf-8") for u in self.user_ids]), earned=self.earned,
+                 withdrawn=self.withdrawn, meta=np.array(json.dumps(meta)))
+        tmp.replace(path)
+
+    def load(self, path):
+        """Carry totals over from a checkpoint; users it doesn't know start at zero."""
+        with np.load(path) as ckpt:
+            meta = json.loads(str(ckpt["meta"]))
+            ids = [uid.decode("utf-8") for uid in ckpt["ids"].tolist()]
+            earned, withdrawn = ckpt["earned"], ckpt["withdrawn"]
+            where = np.array([self.user_index.get(uid, -1) for uid in ids], dtype=np.int64)
+            known = where >= 0
+            self.earned[where[known]] = earned[known]
+            self.withdrawn[where[known]] = withdrawn[known]
+        self.watermark = meta["watermark"]
+        self.offsets = meta["offsets"]
+        self.stats = meta["stats"]
+        return self
+
+
+def _guard(path, offset):
+    """Hash of the bytes just before `offset`, to tell an appended file from a rewritten one."""
+    with open(path, "rb") as f:
+        f.seek(max(0, offset - GUARD))
+        return hashlib.blake2b(f.read(min(offset, GUARD)), digest_size=16).hexdigest()
+
+
+def run(inputs, db_path, withdrawals=None, checkpoint=None):
+    """Build the ledger for `inputs`, resuming from and updating `checkpoint` if given."""
+    ledger = Ledger(db_path)
+    if checkpoint and Path(checkpoint).exists():
+        ledger.load(checkpoint)
+        if not all(ledger.can_resume(p) for p in inputs if Path(p).suffix == ".jsonl"):
+            ledger = Ledger(db_path)
+            ledger.recomputed = True
+    since = ledger.watermark  # what the checkpoint already covers, the same for every input
+    for path in map(Path, inputs):
+        if path.suffix == ".jsonl":
+            ledger.add_jsonl(path)
+        else:
+            ledger.add_client(path, since)
+    if withdrawals:
+        # withdrawals are few; they are recounted every run rather than checkpointed
+        ledger.withdrawn[:] = 0
+        ledger.stats["withdrawals"] = 0
+        ledger.add_withdrawals(iter_jsonl(withdrawals) if Path(withdrawals).suffix == ".jsonl"
+                               else json.loads(Path(withdrawals).read_text(encoding="utf-8")))
+    if checkpoint:
+        ledger.save(checkpoint)
+    return ledger
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    p = argparse.ArgumentParser(description="Recompute balances from completions x payouts")
+    p.add_argument("inputs", nargs="+", type=Path, help="completions.jsonl or client completions export")
+    p.add_argument("--db", type=Path, default=Path("data/db.json"), help="users (stored balance) and surveys")
+    p.add_argument("--withdrawals", type=Path,
+                   help="withdrawals as .jsonl or a JSON array of {userId, amount}")
+    p.add_argument("--checkpoint", type=Path, help="resume from and save running totals here (.npz)")
+    p.add_argument("--tolerance", type=float, default=TOLERANCE)
+    p.add_argument("--out", type=Path, help="write every mismatch as JSON Lines")
+    args = p.parse_args()
+
+    try:
+        t0 = perf_counter()
+        ledger = run(args.inputs, args.db, args.withdrawals, args.checkpoint)
+        report = ledger.report(args.tolerance)
+        elapsed = perf_counter() - t0
+    except RuntimeError as e:
+        sys.exit(str(e))
+    if report["recomputed"]:
+        print("  completions were rewritten since the checkpoint; recomputed from scratch")
+    print(f"{report['completions']:,} completions credited to {report['users']:,} users in {elapsed:.2f}s "
+          f"({report['unknownUser']:,} unknown users, {report['unknownSurvey']:,} unknown surveys)")
+    print(f"{report['mismatched']:,} balances off: {report['understated']:,.2f} understated, "
+          f"{report['overstated']:,.2f} overstated")
+    for row in report["top"]:
+        print(f"  {row['userId']}  expected {row['expected']:>12,.2f}  stored {row['stored']:>12,.2f}")
+    if args.out:
+        bad, expected, stored = ledger.mismatches(args.tolerance)
+        with open(args.out, "w", encoding="utf-8") as f:
+            for u, e, s in zip(bad.tolist(), expected.tolist(), stored.tolist()):
+                f.write(json.dumps({"userId": ledger.user_ids[u], "expected": e, "stored": s}) + "\n")
+        print(f"✓ Wrote {args.out}")
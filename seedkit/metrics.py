@@ -0,0 +1,85 @@
+# seedkit/metrics.py
+# Per-stage instrumentation for seed runs: wall/CPU time, peak Python heap
+# (tracemalloc), records/s and bytes written, with optional cProfile dumps.
+#
+#   python seed.py --metrics seed-metrics.json --cprofile prof/
+#   python -m pstats prof/write.prof
+import cProfile
+import json
+import resource
+import sys
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from time import perf_counter, process_time, time
+
+
+class Metrics:
+    """Collects one entry per stage; does nothing unless `enabled`.
+
+        with metrics.stage("write") as st:
+            stats = write_db(...)
+            st["records"], st["bytes"] = stats["surveys"], stats["bytes"]
+    """
+
+    def __init__(self, enabled=False, cprofile_dir=None):
+        self.enabled = enabled
+        self.cprofile_dir = Path(cprofile_dir) if cprofile_dir else None
+        self.stages = []
+        self._peak = 0
+        self._t0, self._c0 = perf_counter(), process_time()
+        self._started_at = time()
+        if enabled and not tracemalloc.is_tracing():
+            # tracemalloc slows allocation-heavy code down, hence opt-in
+            tracemalloc.start()
+
+    @contextmanager
+    def stage(self, name):
+        info = {"name": name, "records": 0, "bytes": 0}
+        if not self.enabled:
+            yield info
+            return
+
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        prof = cProfile.Profile() if self.cprofile_dir else None
+        t0, c0 = perf_counter(), process_time()
+        if prof:
+            prof.enable()
+        try:
+            yield info
+        finally:
+            if prof:
+                prof.disable()
+            wall, cpu = perf_counter() - t0, process_time() - c0
+            _, peak = tracemalloc.get_traced_memory()
+            self._peak = max(self._peak, peak)
+            info.update(wall_s=wall, cpu_s=cpu, peak_alloc_bytes=max(peak - base, 0),
+                        records_per_s=info["records"] / wall if wall and info["records"] else None)
+            if prof:
+                self.cprofile_dir.mkdir(parents=True, exist_ok=True)
+                info["cprofile"] = str(self.cprofile_dir / f"{name}.prof")
+                prof.dump_stats(info["cprofile"])
+            self.stages.append(info)
+
+    def record(self, name, wall_s, **extra):
+        """Add a stage that was timed elsewhere (e.g. at import time)."""
+        if self.enabled:
+            self.stages.append({"name": name, "records": 0, "bytes": 0, "wall_s": wall_s, **extra})
+
+    def document(self):
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return {
+            "started_at": self._started_at,
+            "argv": sys.argv[1:],
+            "total_wall_s": perf_counter() - self._t0,
+            "total_cpu_s": process_time() - self._c0,
+            "peak_alloc_bytes": self._peak if self.enabled else None,
+            "peak_rss_bytes": rss if sys.platform == "darwin" else rss * 1024,
+            "records": sum(s["records"] for s in self.stages),
+            "bytes_written": sum(s["bytes"] for s in self.stages),
+            "stages": self.stages,
+        }
+
+    def write(self, path):
+        Path(path).write_text(json.dumps(self.document(), indent=2) + "\n", encoding="utf-8")
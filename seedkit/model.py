@@ -0,0 +1,272 @@
+# seedkit/model.py
+# Compact in-memory model for surveys and users.
+#
+# Records are __slots__ objects instead of dicts, repeated strings are
+# interned, and identical items (same prompt, same options) are one shared
+# Item whose option list is an interned tuple. Objects render their own JSON
+# text, byte-for-byte what json.dumps gives for the dict form, so write_db
+# takes them as records directly (see _record_text in seedkit.emit); the text
+# of a shared item is rendered once and reused.
+#
+#   python -m seedkit.model --surveys 1000000     # memory, dicts vs model
+import json
+import sys
+import tracemalloc
+from json.encoder import encode_basestring
+
+_MISSING = object()
+
+
+def _value(value, indent, level):
+    """JSON text for `value` nested `level` deep, as json.dumps(indent=indent) lays it out."""
+    if isinstance(value, str):
+        return encode_basestring(value)
+    if value is None:
+        return "null"
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    if isinstance(value, int):
+        return int.__repr__(value)
+    if isinstance(value, float):
+        return json.dumps(value)  # NaN/Infinity spelled the way json does
+    if isinstance(value, Record):
+        return value.render(indent, level)
+    if isinstance(value, (list, tuple)):
+        return _array(value, indent, level)
+    if isinstance(value, dict):
+        return _object(list(value.items()), indent, level)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _object(pairs, indent, level):
+    if not pairs:
+        return "{}"
+    if indent is None:
+        return "{" + ",".join(f"{encode_basestring(k)}:{_value(v, None, 0)}" for k, v in pairs) + "}"
+    inner = "\n" + " " * (indent * (level + 1))
+    body = ",".join(f"{inner}{encode_basestring(k)}: {_value(v, indent, level + 1)}" for k, v in pairs)
+    return "{" + body + "\n" + " " * (indent * level) + "}"
+
+
+def _array(values, indent, level):
+    if not values:
+        return "[]"
+    if indent is None:
+        return "[" + ",".join(_value(v, None, 0) for v in values) + "]"
+    inner = "\n" + " " * (indent * (level + 1))
+    return "[" + ",".join(inner + _value(v, indent, level + 1) for v in values) + "\n" + " " * (indent * level) + "]"
+
+
+class Record:
+    """Base for slotted records: FIELDS in slots, unknown keys kept in `extra`.
+
+    Keys come back in their original order; a record whose keys are not in
+    FIELDS order (then unknown ones) keeps that order in `_order`. Surveys
+    have an "items" field, so the (key, value) view is fields(), not items().
+    """
+
+    __slots__ = ("extra", "_order")
+    FIELDS = ()
+    INTERN = ()  # fields whose strings repeat across records
+
+    def __init_subclass__(cls, **kw):
+        super().__init_subclass__(**kw)
+        cls._ORDER = {key: i for i, key in enumerate(cls.FIELDS)}
+
+    def __init__(self, data, context=None):
+        extra = None
+        last = -1
+        in_order = True
+        for key, value in data.items():
+            at = self._ORDER.get(key, -1)
+            if at < 0:
+                extra = extra if extra is not None else {}
+                extra[key] = value
+                continue
+            if extra is not None or at < last:
+                in_order = False
+            last = max(last, at)
+            setattr(self, key, self._convert(key, value, context))
+        self.extra = extra
+        # the common case costs nothing; only a shuffled record carries its key order
+        self._order = None if in_order else tuple(sys.intern(k) if isinstance(k, str) else k for k in data)
+
+    def _convert(self, key, value, context):
+        return sys.intern(value) if key in self.INTERN and isinstance(value, str) else value
+
+    def fields(self):
+        """(key, value) pairs in the original key order, without building a dict."""
+        if self._order is not None:
+            for key in self._order:
+                yield key, self[key]
+            return
+        for key in self.FIELDS:
+            value = getattr(self, key, _MISSING)
+            if value is not _MISSING:
+                yield key, value
+        if self.extra:
+            yield from self.extra.items()
+
+    def to_dict(self):
+        return {k: v.to_dict() if isinstance(v, Record) else
+                [x.to_dict() for x in v] if isinstance(v, tuple) and v and isinstance(v[0], Record) else
+                list(v) if isinstance(v, tuple) else v
+                for k, v in self.fields()}
+
+    def render(self, indent=2, level=0):
+        return _object(list(self.fields()), indent, level)
+
+    def __getitem__(self, key):
+        value = getattr(self, key, _MISSING) if key in self.FIELDS else (self.extra or {}).get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+
+class Item(Record):
+    __slots__ = ("prompt", "options", "_text")
+    FIELDS = ("prompt", "options")
+    INTERN = ("prompt",)
+
+    def _convert(self, key, value, context):
+        if key == "options" and isinstance(value, list):
+            return tuple(sys.intern(o) if isinstance(o, str) else o for o in value)
+        return super()._convert(key, value, context)
+
+    def render(self, indent=2, level=0):
+        # shared by every survey that asks the same question: render once per layout
+        cached = getattr(self, "_text", None)
+        if cached and cached[0] == (indent, level):
+            return cached[1]
+        text = _object(list(self.fields()), indent, level)
+        self._text = ((indent, level), text)
+        return text
+
+
+class Survey(Record):
+    __slots__ = ("id", "name", "description", "payout", "currency", "premium", "status", "items",
+                 "createdAt", "updatedAt")
+    FIELDS = ("id", "name", "description", "payout", "currency", "premium", "status", "items",
+              "createdAt", "updatedAt")
+    INTERN = ("description", "currency", "status")
+
+    def __init__(self, data, items=None):
+        # `items` is the ItemTable that lets surveys share identical items
+        super().__init__(data, items if items is not None else ItemTable())
+
+    def _convert(self, key, value, context):
+        if key == "items" and isinstance(value, list):
+            return tuple(context.item(it) if isinstance(it, dict) else it for it in value)
+        return super()._convert(key, value, context)
+
+
+class Subscription(Record):
+    __slots__ = ("provider", "amount", "msisdn", "code", "paidAt")
+    FIELDS = ("provider", "amount", "msisdn", "code", "paidAt")
+    INTERN = ("provider",)
+
+
+class User(Record):
+    __slots__ = ("id", "name", "email", "password", "referral", "balance", "createdAt", "plan", "tier",
+                 "subscription")
+    FIELDS = ("id", "name", "email", "password", "referral", "balance", "createdAt", "plan", "tier",
+              "subscription")
+    INTERN = ("password", "plan", "tier")
+
+    def _convert(self, key, value, context):
+        if key == "subscription" and isinstance(value, dict):
+            return Subscription(value)
+        return super()._convert(key, value, context)
+
+
+class ItemTable:
+    """One Item per distinct (prompt, options); surveys point at the shared objects."""
+
+    def __init__(self):
+        self._items = {}
+
+    def item(self, data):
+        options = data.get("options")
+        if len(data) == 2 and isinstance(options, list) and "prompt" in data:
+            key = (data["prompt"], *options)
+        else:
+            try:
+                key = json.dumps(data, ensure_ascii=False)  # key order matters for the output
+            except TypeError:
+                return Item(data)
+        found = self._items.get(key)
+        if found is None:
+            found = self._items[key] = Item(data)
+        return found
+
+    def __len__(self):
+        return len(self._items)
+
+
+def surveys(records, table=None):
+    """Yield Survey objects for survey dicts, sharing items through `table`."""
+    table = table if table is not None else ItemTable()
+    for record in records:
+        yield Survey(record, table)
+
+
+def users(records):
+    for record in records:
+        yield User(record)
+
+
+def _traced(build):
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        kept = build()
+        return tracemalloc.get_traced_memory()[0] - before, kept
+    finally:
+        tracemalloc.stop()
+
+
+def measure(n, sample=100_000, seed=0):
+    """Bytes held by n surveys as json-loaded dicts vs Survey objects.
+
+    The dict form is measured on `sample` surveys and scaled (it does not fit
+    in memory at 1M on small machines); the model is measured at full size.
+    """
+    from seed import surveys as templates
+    from seedkit.emit import encode
+    from seedkit.synth import make_survey
+
+    def loaded(count):
+        # the shape json.load(db.json) gives: nothing shared between surveys
+        return (json.loads(encode(make_survey(seed, i, templates), None)) for i in range(count))
+
+    k = min(n, sample)
+    dict_bytes, kept = _traced(lambda: list(loaded(k)))
+    del kept
+    table = ItemTable()
+    model_bytes, kept = _traced(lambda: list(surveys(loaded(n), table)))
+    return {"surveys": n, "dict_bytes": dict_bytes * n / k, "dict_sampled": k,
+            "model_bytes": model_bytes, "distinct_items": len(table)}
+
+
+if __name__ == "__main__":
+    import argparse
+
+    p = argparse.ArgumentParser(description="Memory footprint of the survey catalog, dicts vs slotted model")
+    p.add_argument("--surveys", type=int, default=1_000_000)
+    p.add_argument("--sample", type=int, default=100_000, help="surveys measured in dict form, then scaled")
+    args = p.parse_args()
+    r = measure(args.surveys, args.sample)
+    per = lambda b: b / r["surveys"]  # noqa: E731
+    scaled = " (scaled from %s)" % f"{r['dict_sampled']:,}" if r["dict_sampled"] < r["surveys"] else ""
+    print(f"{r['surveys']:,} surveys, {r['distinct_items']:,} distinct items")
+    print(f"  dicts  {r['dict_bytes'] / 1e6:10,.0f} MB  {per(r['dict_bytes']):8,.0f} B/survey{scaled}")
+    print(f"  model  {r['model_bytes'] / 1e6:10,.0f} MB  {per(r['model_bytes']):8,.0f} B/survey")
+    print(f"  {r['dict_bytes'] / r['model_bytes']:.1f}x smaller")
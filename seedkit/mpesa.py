@@ -0,0 +1,459 @@
+# seedkit/mpesa.py
+# Reconcile premium subscriptions against an M-Pesa payment statement.
+#
+# Packages.jsx upgrades a user once they paste the confirmation SMS, keeping
+# the transaction code and amount (and, for synthetic users, the paying
+# msisdn) in user.subscription. The statement is the till's CSV export from
+# the M-Pesa portal, one row per transaction, and can be far larger than
+# memory.
+#
+# Premium users are the small side of a hash join: transaction code -> user
+# and msisdn -> users. The statement is the probe side. It is cut at line
+# boundaries into ranges of CHUNK bytes, each range is parsed and probed in a
+# worker process, and only a few ranges are in flight at once, so memory
+# holds the index and a handful of chunks whatever the statement's size.
+#
+# A payment settles the user whose code it carries. A payment whose code
+# matches nobody but whose msisdn belongs to a premium user is held until all
+# ranges are done and then settles that user if nothing else did (a mistyped
+# code); any other payment is an orphan and goes straight to --out. Premium
+# users left without a payment are flagged unpaid.
+#
+#   python -m seedkit.mpesa statement.csv --db data/db.json --workers 0 --out data/reconcile.jsonl
+import csv
+import io
+import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from time import perf_counter
+
+from seedkit.eligibility import is_premium_user
+from seedkit.jsonstream import iter_collection
+
+CHUNK = 8 << 20     # statement bytes parsed per task
+HEADER_LINES = 50   # portal exports put a few lines of account details above the header
+TOLERANCE = 0.01    # same as the amount check in ValidationModal
+
+# Accepted header names (lowercased) for each field, portal export first
+COLUMNS = {
+    "code": ("receipt no.", "receipt no", "receipt", "transid", "transaction id", "code"),
+    "amount": ("paid in", "transamount", "amount"),
+    "msisdn": ("other party info", "msisdn", "phone", "phone number"),
+    "status": ("transaction status", "status"),
+    "time": ("completion time", "transtime", "date"),
+}
+REQUIRED = ("code", "amount")
+
+KINDS = {
+    "unpaid": "premium users without a matching payment",
+    "orphan": "payments with no upgraded user",
+    "amount": "payments that differ from the subscription amount",
+    "msisdn": "payments from another number than the subscription's",
+    "byMsisdn": "users settled by msisdn only (code not on the statement)",
+    "duplicate": "receipts seen again for an already settled user",
+    "sharedCode": "users claiming a code another user already claimed",
+}
+
+
+def normalize_msisdn(value):
+    """'0712345678', '+254712345678', '254712345678 - JANE DOE' -> '254712345678'.
+
+    None for anything else, including the masked numbers (2547******78) some
+    portal exports show.
+    """
+    digits = str(value or "").split(" - ", 1)[0].strip()
+    if not digits.isdigit():
+        if "*" in digits:
+            return None
+        digits = "".join(c for c in digits if c.isdigit())
+    if len(digits) == 10 and digits[0] == "0":
+        digits = "254" + digits[1:]
+    # same shapes MpesaModal accepts: 0XXXXXXXXX or (+)254XXXXXXXXX
+    return digits if len(digits) == 12 and digits.startswith("254") else None
+
+
+def normalize_code(value):
+    # parseCode() in Packages.jsx upper-cases the code from the SMS
+    return str(value or "").strip().upper() or None
+
+
+def _amount(text):
+    try:
+        return float(str(text).replace(",", "").replace("Ksh", "").replace("KES", "").strip())
+    except ValueError:
+        return None
+
+
+class Index:
+    """Premium users keyed for the join: code -> user number, msisdn -> user numbers."""
+
+    def __init__(self):
+        self.ids = []       # user number -> id
+        self.expected = []  # user number -> (code, amount, msisdn), None without a subscription
+        self.codes = {}
+        self.phones = {}
+        self.shared = []    # (user number, code) for codes already claimed by an earlier user
+
+    def add(self, user):
+        if not is_premium_user(user):
+            return
+        u = len(self.ids)
+        self.ids.append(user.get("id"))
+        sub = user.get("subscription")
+        if not isinstance(sub, dict) or not normalize_code(sub.get("code")):
+            self.expected.append(None)
+            return
+        code = normalize_code(sub["code"])
+        msisdn = normalize_msisdn(sub.get("msisdn"))
+        self.expected.append((code, _amount(sub.get("amount")), msisdn))
+        if code in self.codes:
+            self.shared.append((u, code))
+        else:
+            self.codes[code] = u
+        if msisdn:
+            self.phones[msisdn] = self.phones.get(msisdn, ()) + (u,)
+
+    @classmethod
+    def from_users(cls, users):
+        index = cls()
+        for user in users:
+            index.add(user)
+        return index
+
+    @classmethod
+    def from_db(cls, db_path):
+        return cls.from_users(iter_collection(db_path, "users"))
+
+    def __len__(self):
+        return len(self.ids)
+
+
+def find_header(path):
+    """({field: column}, byte offset of the first row) for a statement CSV."""
+    with open(path, "rb") as f:
+        for _ in range(HEADER_LINES):
+            line = f.readline()
+            if not line:
+                break
+            names = [n.strip().lower() for n in next(csv.reader([line.decode("utf-8-sig", "replace")]), [])]
+            columns = {}
+            for field, accepted in COLUMNS.items():
+                found = next((names.index(a) for a in accepted if a in names), None)
+                if found is not None:
+                    columns[field] = found
+            if all(f in columns for f in REQUIRED):
+                return columns, f.tell()
+    raise ValueError(f"{path}: no header with a receipt and an amount column in the first {HEADER_LINES} lines")
+
+
+def _rows(path, start, stop):
+    """CSV rows of the lines that start in [start, stop)."""
+    with open(path, "rb") as f:
+        f.seek(max(0, start - 1))
+        if start:
+            f.readline()  # finish the line the range starts inside; it belongs to the previous one
+        begin = f.tell()
+        if begin >= stop:
+            return []
+        data = f.read(stop - begin)
+        if data and not data.endswith(b"\n"):
+            data += f.readline()  # the last line starts inside the range; read all of it
+    return csv.reader(io.StringIO(data.decode("utf-8", "replace"), newline=""))
+
+
+def _probe(index, columns, rows):
+    """Join one range of statement rows against `index`.
+
+    Payments are (code, amount, msisdn, time) tuples; matched ones come back
+    with their user number.
+    """
+    c_code, c_amount = columns["code"], columns["amount"]
+    c_msisdn, c_status, c_time = columns.get("msisdn"), columns.get("status"), columns.get("time")
+    width = max(columns.values()) + 1
+    codes, phones = index.codes, index.phones
+    matched, held, orphans = [], [], []
+    seen = skipped = 0
+    for row in rows:
+        if not any(row):
+            continue
+        seen += 1
+        if len(row) < width:
+            skipped += 1
+            continue
+        amount = _amount(row[c_amount]) if row[c_amount].strip() else None
+        if not amount or amount <= 0 or (c_status is not None and row[c_status].strip().lower() != "completed"):
+            skipped += 1  # withdrawals, charges, failed or reversed transactions
+            continue
+        code = normalize_code(row[c_code])
+        msisdn = normalize_msisdn(row[c_msisdn]) if c_msisdn is not None else None
+        payment = (code, amount, msisdn, row[c_time].strip() if c_time is not None else None)
+        u = codes.get(code)
+        if u is not None:
+            matched.append((u, payment))
+        elif msisdn in phones:
+            held.append(payment)
+        else:
+            orphans.append(payment)
+    return {"rows": seen, "skipped": skipped, "matched": matched, "held": held, "orphans": orphans}
+
+
+_worker = None
+
+
+def _init_worker(index, columns):
+    global _worker
+    _worker = (index, columns)
+
+
+def _probe_range(task):
+    index, columns = _worker
+    return _probe(index, columns, _rows(*task))
+
+
+def _in_order(pool, tasks, depth):
+    """pool results for `tasks` in order, with at most `depth` tasks submitted ahead."""
+    pending = deque()
+    for task in tasks:
+        pending.append(pool.submit(_probe_range, task))
+        if len(pending) >= depth:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def _payment(payment):
+    code, amount, msisdn, time = payment
+    return {"code": code, "amount": amount, "msisdn": msisdn, "time": time}
+
+
+class Findings:
+    """Counts per kind, the first `limit` of each, and every finding written to `out` if given."""
+
+    def __init__(self, out=None, limit=10):
+        self.counts = dict.fromkeys(KINDS, 0)
+        self.samples = {kind: [] for kind in KINDS}
+        self.limit = limit
+        self._out = open(out, "w", encoding="utf-8") if out else None
+
+    def flag(self, kind, **fields):
+        self.counts[kind] += 1
+        row = {"kind": kind, **fields}
+        if len(self.samples[kind]) < self.limit:
+            self.samples[kind].append(row)
+        if self._out:
+            self._out.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+    def close(self):
+        if self._out:
+            self._out.close()
+            self._out = None
+
+
+def reconcile(path, index, workers=1, findings=None, chunk=CHUNK):
+    """Join statement `path` against `index`; returns the report, flagging into `findings`.
+
+    With workers > 1 (None for the CPU count) ranges are probed in a process
+    pool, at most two per worker submitted ahead of the one being merged.
+    """
+    findings = findings if findings is not None else Findings()
+    columns, offset = find_header(path)
+    size = Path(path).stat().st_size
+    tasks = [(str(path), a, min(a + chunk, size)) for a in range(offset, size, chunk)]
+    ids, expected = index.ids, index.expected
+    settled = bytearray(len(index))
+    stats = {"rows": 0, "skipped": 0, "payments": 0}
+    held = []
+
+    for u, code in index.shared:
+        findings.flag("sharedCode", userId=ids[u], code=code, claimedBy=ids[index.codes[code]])
+
+    def settle(u, payment):
+        settled[u] = 1
+        _code, amount, msisdn = expected[u]
+        if amount is not None and abs(payment[1] - amount) >= TOLERANCE:
+            findings.flag("amount", userId=ids[u], expected=amount, payment=_payment(payment))
+        if msisdn and payment[2] and payment[2] != msisdn:
+            findings.flag("msisdn", userId=ids[u], expected=msisdn, payment=_payment(payment))
+
+    def merge(part):
+        for key in ("rows", "skipped"):
+            stats[key] += part[key]
+        stats["payments"] += len(part["matched"]) + len(part["held"]) + len(part["orphans"])
+        for u, payment in part["matched"]:
+            if settled[u]:
+                findings.flag("duplicate", userId=ids[u], payment=_payment(payment))
+                continue
+            settle(u, payment)
+        for payment in part["orphans"]:
+            findings.flag("orphan", payment=_payment(payment))
+        held.extend(part["held"])
+
+    if workers == 1 or len(tasks) < 2:
+        for task in tasks:
+            merge(_probe(index, columns, _rows(*task)))
+    else:
+        workers = min(workers or os.cpu_count() or 1, len(tasks))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(index, columns)) as pool:
+            for part in _in_order(pool, tasks, workers * 2):
+                merge(part)
+
+    # only now is it known which users no code settled
+    for payment in held:
+        u = next((u for u in index.phones[payment[2]] if not settled[u]), None)
+        if u is None:
+            findings.flag("orphan", payment=_payment(payment), msisdnUsers=[ids[v] for v in index.phones[payment[2]]])
+            continue
+        findings.flag("byMsisdn", userId=ids[u], expected=expected[u][0], payment=_payment(payment))
+        settle(u, payment)
+    for u, done in enumerate(settled):
+        if not done:
+            findings.flag("unpaid", userId=ids[u],
+                          reason="no subscription" if expected[u] is None else "no payment",
+                          code=expected[u][0] if expected[u] else None)
+    findings.close()
+    return {**stats, "premium": len(index), "paid": sum(settled), "chunks": len(tasks),
+            "counts": findings.counts, "samples": findings.samples}
+
+
+def run(statement, db_path, workers=1, out=None, chunk=CHUNK):
+    return reconcile(statement, Index.from_db(db_path), workers, Findings(out), chunk)
+
+
+# -- synthetic statements -----------------------------------------------------
+
+HEADER = ["Receipt No.", "Completion Time", "Details", "Transaction Status", "Paid In", "Withdrawn",
+          "Balance", "Other Party Info"]
+
+
+def write_statement(path, users, seed=0):
+    """Write a portal-style statement for `users`, with known defects; returns the expected counts.
+
+    Of the paid subscriptions 3% have no payment, 1% a mistyped code and 1% a
+    different amount; 5% more payments come from strangers and a third of
+    the rows are withdrawals or failed payments.
+    """
+    import random
+    from datetime import datetime, timezone
+
+    rng = random.Random(f"{seed}:statement")
+    letters = "ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"
+    rows, expect = [], dict.fromkeys(KINDS, 0)
+    for user in users:
+        sub = user.get("subscription")
+        if not is_premium_user(user):
+            continue
+        if not sub:
+            expect["unpaid"] += 1
+            continue
+        code, amount, at = sub["code"], sub["amount"], sub["paidAt"]
+        roll = rng.random()
+        if roll < 0.03:
+            expect["unpaid"] += 1
+            continue
+        if roll < 0.04:
+            code = code[:-1] + ("0" if code[-1] != "0" else "1")
+            expect["byMsisdn"] += 1
+        elif roll < 0.05:
+            amount += 100
+            expect["amount"] += 1
+        rows.append((at, code, "Completed", amount, sub["msisdn"], user.get("name", "")))
+    for _ in range(len(rows) // 20):
+        rows.append((rows[rng.randrange(len(rows))][0], "".join(rng.choices(letters, k=10)), "Completed",
+                     rng.choice((200, 400, 800)), f"2541{rng.randrange(10 ** 8):08d}", "WALK IN"))
+        expect["orphan"] += 1
+    for _ in range(len(rows) // 2):
+        at = rows[rng.randrange(len(rows))][0]
+        if rng.random() < 0.1:
+            rows.append((at, "".join(rng.choices(letters, k=10)), "Failed", 400, "254700000000", "FAILED"))
+        else:
+            rows.append((at, "".join(rng.choices(letters, k=10)), "Completed", -rng.randrange(100, 5000) * 10,
+                         None, "WITHDRAWAL"))
+    rows.sort(key=lambda r: r[0])
+    balance = 0.0
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write("Account Holder:,TRAJON ENTERTAINMENT\nTime Period:,Statement export\n\n")
+        out = csv.writer(f)
+        out.writerow(HEADER)
+        for at, code, status, amount, msisdn, name in rows:
+            when = datetime.fromtimestamp(at / 1000, tz=timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+            if status == "Completed":
+                balance += amount
+            paid_in, withdrawn = (f"{amount:,.2f}", "") if amount > 0 else ("", f"{amount:,.2f}")
+            party = f"{msisdn} - {name.upper()}" if msisdn else "Bank transfer"
+            out.writerow([code, when, "Merchant Customer Payment" if amount > 0 else "Business Payment to Bank",
+                          status, paid_in, withdrawn, f"{balance:,.2f}", party])
+    return expect
+
+
+def bench(users=200_000, seed=0, workers=None, chunk=CHUNK):
+    import tempfile
+
+    from seedkit.synth import make_user
+
+    people = [make_user(seed, i) for i in range(users)]
+    index = Index.from_users(people)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "statement.csv"
+        expect = write_statement(path, people, seed)
+        del people
+        size = path.stat().st_size
+        timings = {}
+        for n in dict.fromkeys((1, workers or os.cpu_count() or 1)):
+            t0 = perf_counter()
+            report = reconcile(path, index, n, chunk=chunk)
+            timings[n] = perf_counter() - t0
+    found = {k: v for k, v in report["counts"].items() if v or expect[k]}
+    return {"users": users, "premium": len(index), "bytes": size, "rows": report["rows"], "timings": timings,
+            "counts": found, "as_planted": found == {k: v for k, v in expect.items() if v or found.get(k)}}
+
+
+def format_report(report):
+    lines = [f"{report['rows']:,} statement rows in {report['chunks']:,} chunks: {report['payments']:,} payments "
+             f"({report['skipped']:,} other rows skipped)",
+             f"{report['paid']:,} of {report['premium']:,} premium users have a matching payment"]
+    for kind, label in KINDS.items():
+        if report["counts"][kind]:
+            lines.append(f"  {report['counts'][kind]:>10,}  {label}")
+            for row in report["samples"][kind][:3]:
+                payment = row.get("payment") or {}
+                lines.append(f"              {row.get('userId') or '-'}  {payment.get('code') or row.get('code') or ''}"
+                             f"  {payment.get('amount', '')}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    p = argparse.ArgumentParser(description="Reconcile premium users against an M-Pesa statement CSV")
+    p.add_argument("statement", type=Path, nargs="?", help="statement CSV exported from the M-Pesa portal")
+    p.add_argument("--db", type=Path, default=Path("data/db.json"), help="users with plan/tier/subscription")
+    p.add_argument("--workers", type=int, default=1, help="processes probing statement chunks (0 = CPU count)")
+    p.add_argument("--chunk", type=int, default=CHUNK, help="statement bytes per chunk")
+    p.add_argument("--out", type=Path, help="write every finding as JSON Lines")
+    p.add_argument("--bench", type=int, metavar="USERS", help="reconcile a synthetic statement for USERS users")
+    args = p.parse_args()
+
+    try:
+        if args.bench:
+            r = bench(args.bench, workers=args.workers or None, chunk=args.chunk)
+            print(f"{r['users']:,} users ({r['premium']:,} premium), statement {r['bytes'] / 1e6:,.0f} MB, "
+                  f"{r['rows']:,} rows")
+            for n, s in r["timings"].items():
+                print(f"  {n} worker(s)  {s:6.2f}s  {r['rows'] / s:12,.0f} rows/s")
+            print(f"  findings {r['counts']} {'as planted' if r['as_planted'] else 'DIFFER from the planted defects'}")
+            sys.exit(0 if r["as_planted"] else 1)
+        if not args.statement:
+            p.error("a statement CSV is required (or --bench)")
+        t0 = perf_counter()
+        report = run(args.statement, args.db, args.workers or None, args.out, args.chunk)
+        elapsed = perf_counter() - t0
+    except (RuntimeError, ValueError) as e:
+        sys.exit(str(e))
+    print(format_report(report))
+    print(f"\nReconciled in {elapsed:.2f}s ({report['rows'] / elapsed:,.0f} rows/s)")
+    if args.out:
+        print(f"✓ Wrote {args.out}")
@@ -0,0 +1,146 @@
+# seedkit/offsets.py
+# Byte-offset id index for db.json.
+#
+# For every collection, db.json.<collection>.idx holds the records' ids sorted,
+# each with the byte offset and length of the record inside db.json:
+#
+#   header  b"SIDX" | u16 version | u16 key width | u32 count
+#   entry   key (utf-8, NUL padded to key width) | u64 offset | u32 length
+#
+# Entries are fixed width, so the file can be mmap'd and binary-searched in
+# place; the record itself is then one mmap slice of db.json and one json.loads.
+import json
+import mmap
+import struct
+from array import array
+from pathlib import Path
+
+MAGIC = b"SIDX"
+VERSION = 1
+HEADER = struct.Struct("<4sHHI")
+SPAN = struct.Struct("<QI")
+
+
+def index_path(db_path, collection):
+    db_path = Path(db_path)
+    return db_path.with_name(f"{db_path.name}.{collection}.idx")
+
+
+class IndexBuilder:
+    """Collects spans from write_db(on_record=...) and writes the .idx files."""
+
+    def __init__(self):
+        self._ids = {}
+        self._spans = {}
+
+    def add(self, collection, rid, offset, length):
+        if collection not in self._ids:
+            self._ids[collection] = []
+            self._spans[collection] = array("Q")
+        self._ids[collection].append(str(rid).encode("utf-8"))
+        self._spans[collection].extend((offset, length))
+
+    def write(self, db_path, collections=None):
+        """Write one index per collection; returns {collection: index path}."""
+        written = {}
+        for name in collections or self._ids:
+            ids = self._ids.get(name, [])
+            path = index_path(db_path, name)
+            write_index(path, ids, self._spans.get(name, array("Q")), sorted_order(name, ids))
+            written[name] = path
+        return written
+
+
+def sorted_order(name, ids):
+    """Positions of `ids` (utf-8 bytes) in key order; duplicate ids are an error."""
+    order = sorted(range(len(ids)), key=ids.__getitem__)
+    for a, b in zip(order, order[1:]):
+        if ids[a] == ids[b]:
+            raise ValueError(f"{name}: duplicate id {ids[a].decode()!r}")
+    return order
+
+
+def write_index(path, ids, spans, order):
+    """Write an .idx file; `spans` is flat (offset, length) pairs parallel to `ids`."""
+    width = max(map(len, ids), default=0)
+    entry = struct.Struct(f"<{width}sQI")  # "s" NUL-pads the key, same layout as key + SPAN
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, width, len(ids)))
+        f.write(b"".join(entry.pack(ids[i], spans[2 * i], spans[2 * i + 1]) for i in order))
+
+
+class _Index:
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.width, self.count = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path}: not a seed index (or unsupported version)")
+        self._entry = self.width + SPAN.size
+
+    def _key(self, i):
+        at = HEADER.size + i * self._entry
+        return self._map[at:at + self.width]
+
+    def find(self, rid):
+        key = str(rid).encode("utf-8")
+        if len(key) > self.width:
+            return None
+        key = key.ljust(self.width, b"\0")
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.count and self._key(lo) == key:
+            return SPAN.unpack_from(self._map, HEADER.size + lo * self._entry + self.width)
+        return None
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+
+class RecordIndex:
+    """Fetch single records from db.json by id without parsing the rest.
+
+        with RecordIndex("data/db.json") as db:
+            survey = db.get("surveys", "401c13a3-...")
+    """
+
+    def __init__(self, db_path):
+        self.db_path = Path(db_path)
+        self._file = open(self.db_path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._indexes = {}
+
+    def _index(self, collection):
+        if collection not in self._indexes:
+            self._indexes[collection] = _Index(index_path(self.db_path, collection))
+        return self._indexes[collection]
+
+    def get_bytes(self, collection, rid):
+        """The record's raw JSON bytes, or None if the id is not indexed."""
+        span = self._index(collection).find(rid)
+        if span is None:
+            return None
+        offset, length = span
+        return self._map[offset:offset + length]
+
+    def get(self, collection, rid):
+        raw = self.get_bytes(collection, rid)
+        return None if raw is None else json.loads(raw)
+
+    def close(self):
+        for index in self._indexes.values():
+            index.close()
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,411 @@
+# seedkit/referrals.py
+# Referral tree over the user table: depth, downline size and multi-level
+# bonuses for every user.
+#
+# A user's `referral` (set at sign-up, Register.jsx) holds the referrer's
+# id. Users become numbers; the tree is one parent-pointer array
+# (-1 for roots). Depths come from a walk down the tree a level at a time,
+# downline sizes from summing those levels back up, and bonuses from one
+# weighted bincount per bonus level, so a build is linear in the number of
+# users. Referral loops (possible once records are edited by hand) are
+# reported and broken at their newest member, which becomes a root.
+#
+# Users who join later are added incrementally: a new user is a leaf, so it
+# only adds itself to its ancestors' downlines and its base to the bonus of
+# the first len(rates) of them. With a checkpoint, a run adds just the users
+# that are new in db.json and rebuilds only when an existing referral changed.
+#
+#   python -m seedkit.referrals --db data/db.json --checkpoint data/referrals.npz
+#   python -m seedkit.referrals --bench 1000000
+import json
+from pathlib import Path
+from time import perf_counter
+
+from seedkit.jsonstream import iter_collection
+
+try:
+    import numpy as np  # optional: pip install numpy
+except ImportError:
+    np = None
+
+RATES = (0.10, 0.05, 0.02)  # share of a referral's base paid to their 1st, 2nd and 3rd upline
+
+
+def _require_numpy():
+    if np is None:
+        raise RuntimeError("seedkit.referrals needs numpy: pip install numpy")
+
+
+def subscription_base(user):
+    # what the referred user paid for a tier (Packages.jsx); free users earn their upline nothing
+    return float((user.get("subscription") or {}).get("amount") or 0)
+
+
+def balance_base(user):
+    return float(user.get("balance") or 0)
+
+
+BASES = {"subscription": subscription_base, "balance": balance_base}
+
+
+class ReferralTree:
+    """Parent pointers plus per-user depth, downline size and bonus, as numpy arrays.
+
+    Arrays have spare capacity so joins append in amortized O(1); the first
+    len(self) entries are live, and are what .parent, .depth, .size, .bonus etc. return.
+    """
+
+    def __init__(self, rates=RATES, base="subscription"):
+        _require_numpy()
+        self.rates = tuple(float(r) for r in rates)
+        self.base_name = base
+        self._base_of = BASES[base]
+        self.ids = []
+        self.index = {}  # user id -> user number
+        self.n = 0
+        self._arrays = {"parent": np.int64, "depth": np.int32, "size": np.int64, "base": np.float64,
+                        "bonus": np.float64}
+        self._data = {name: np.zeros(0, dtype=dtype) for name, dtype in self._arrays.items()}
+        self.cycles = []      # [user ids] per referral loop, each referring to the next; the first one's was cut
+        self.unresolved = 0   # referrals naming nobody in the table (those users are roots)
+
+    def __len__(self):
+        return self.n
+
+    def __getattr__(self, name):
+        data = self.__dict__.get("_data")
+        if data is not None and name in data:
+            return data[name][:self.n]
+        raise AttributeError(name)
+
+    def _grow(self, extra):
+        need = self.n + extra
+        for name, values in self._data.items():
+            if len(values) < need:
+                grown = np.zeros(max(need, 2 * len(values), 1024), dtype=values.dtype)
+                grown[:self.n] = values[:self.n]
+                self._data[name] = grown
+
+    def _append(self, users):
+        """Number new users; returns (first, refs) with refs the raw referral of each."""
+        users = [u for u in users if u.get("id") is not None and str(u["id"]) not in self.index]
+        first = self.n
+        self._grow(len(users))
+        refs, bases = [], []
+        for k, user in enumerate(users, first):
+            uid = str(user["id"])
+            self.index[uid] = k
+            self.ids.append(uid)
+            refs.append(user.get("referral"))
+            bases.append(self._base_of(user))
+        self.n = first + len(users)
+        self._data["base"][first:self.n] = bases  # one bulk store; per-element ones would dominate
+        return first, refs
+
+    def _parent_of(self, ref):
+        return self.index.get(ref.strip(), -1) if isinstance(ref, str) else -1
+
+    def _resolve(self, first, refs):
+        parents = [self._parent_of(ref) for ref in refs]
+        self.unresolved += sum(1 for ref, p in zip(refs, parents) if p < 0 and isinstance(ref, str) and ref.strip())
+        self._data["parent"][first:first + len(refs)] = parents
+
+    def _break_cycles(self, nodes):
+        """Nodes whose parent chain never reaches a root sit on or under a loop: cut every loop."""
+        parent = self._data["parent"]
+        state = {}  # node -> walk number, so each node is walked once
+        for start in nodes:
+            walk, path, node = len(state), [], int(start)
+            while node >= 0 and node not in state:
+                state[node] = walk
+                path.append(node)
+                node = int(parent[node])
+            if node >= 0 and state[node] == walk:
+                loop = path[path.index(node):]
+                # numbers follow table order: cut the referral of whoever joined last
+                at = loop.index(max(loop))
+                loop = loop[at:] + loop[:at]
+                parent[loop[0]] = -1
+                self.cycles.append([self.ids[k] for k in loop])
+
+    # -- full build ---------------------------------------------------------
+
+    def build(self, users):
+        """Number every user and compute everything from scratch."""
+        first, refs = self._append(users)
+        self._resolve(first, refs)
+        n, parent = self.n, self.parent
+        parent[parent == np.arange(n)] = -1  # a self-referral is no referral
+        levels = self._levels()
+        if sum(len(level) for level in levels) < n:
+            seen = np.zeros(n, dtype=bool)
+            for level in levels:
+                seen[level] = True
+            self._break_cycles(np.flatnonzero(~seen))
+            levels = self._levels()
+
+        depth, size = self.depth, self.size
+        for d, level in enumerate(levels):
+            depth[level] = d
+        size[:] = 0
+        for level in reversed(levels[1:]):
+            np.add.at(size, parent[level], size[level] + 1)
+        self._bonuses()
+        return self
+
+    def _levels(self):
+        """Users by depth: roots, their referrals, theirs... (unreachable ones are left out)."""
+        parent = self.parent
+        children = np.argsort(parent, kind="stable")
+        linked = children[parent[children] >= 0]
+        counts = np.bincount(parent[linked], minlength=self.n) if len(linked) else np.zeros(self.n, np.int64)
+        starts = np.concatenate([[0], np.cumsum(counts)])
+        levels = [np.flatnonzero(parent < 0)]
+        while True:
+            frontier = levels[-1]
+            k = counts[frontier]
+            total = int(k.sum())
+            if not total:
+                return levels
+            # all children of the frontier, gathered as one range per frontier node
+            offsets = np.repeat(starts[frontier] - np.cumsum(k) + k, k) + np.arange(total)
+            levels.append(linked[offsets])
+
+    def _bonuses(self):
+        # weights[k]: base summed over each user's referrals exactly k+1 levels down
+        parent, base = self.parent, self.base
+        linked = np.flatnonzero(parent >= 0)
+        bonus = self.bonus
+        bonus[:] = 0
+        weights = base
+        for rate in self.rates:
+            weights = np.bincount(parent[linked], weights=weights[linked], minlength=self.n)
+            bonus += rate * weights
+
+    # -- incremental --------------------------------------------------------
+
+    def join(self, users):
+        """Add users who are new since the build; returns how many were added."""
+        first, refs = self._append(users)
+        if not refs:
+            return 0
+        self._resolve(first, refs)
+        parent, depth = self._data["parent"], self._data["depth"]
+        new = np.arange(first, self.n)
+        parent[new[parent[new] == new]] = -1
+        # new users may refer each other: settle depths parent-first
+        pending = new
+        while len(pending):
+            p = parent[pending]
+            ready = (p < first) | ~np.isin(p, pending)
+            if not ready.any():
+                self._break_cycles(pending)
+                continue
+            done = pending[ready]
+            depth[done] = np.where(parent[done] >= 0, depth[np.maximum(parent[done], 0)] + 1, 0)
+            pending = pending[~ready]
+        self._credit(new, self._data["base"][new], count=True)
+        return len(new)
+
+    def _credit(self, nodes, amounts, count=False):
+        """Walk up from `nodes`: +1 downline for every ancestor if `count`, bonus for the first levels."""
+        parent, size, bonus = self._data["parent"], self._data["size"], self._data["bonus"]
+        up = parent[nodes]
+        level = 0
+        while len(up):
+            live = up >= 0
+            up, amounts = up[live], amounts[live]
+            if count:
+                np.add.at(size, up, 1)
+            if level < len(self.rates):
+                np.add.at(bonus, up, self.rates[level] * amounts)
+            elif not count:
+                return
+            up = parent[up]
+            level += 1
+
+    def rebase(self, user_id, amount):
+        """A user's base changed (e.g. they upgraded): move their upline's bonuses with it."""
+        k = self.index[str(user_id)]
+        delta = float(amount) - self._data["base"][k]
+        self._data["base"][k] = amount
+        if delta:
+            self._credit(np.array([k]), np.array([delta]))
+
+    def sync(self, users):
+        """Bring a loaded tree up to date with the user table.
+
+        Returns {"joined", "rebased"}, or None if an existing user's referral
+        changed or a user disappeared, which needs a full build.
+        """
+        new, rebased, seen, unresolved, dangling = [], 0, 0, 0, set()
+        cut = {self.index[loop[0]] for loop in self.cycles}
+        for user in users:
+            k = self.index.get(str(user.get("id")))
+            if k is None:
+                new.append(user)
+                continue
+            seen += 1
+            # also catches a referral that resolves now because its referrer joined since
+            ref = user.get("referral")
+            p = self._parent_of(ref)
+            if k not in cut and p not in (self._data["parent"][k], k):
+                return None
+            if p < 0 and isinstance(ref, str) and ref.strip():
+                dangling.add(ref.strip())
+                unresolved += 1
+            base = self._base_of(user)
+            if base != self._data["base"][k]:
+                self.rebase(self.ids[k], base)
+                rebased += 1
+        if seen != self.n or any(str(u["id"]) in dangling for u in new):
+            return None  # ... or an unresolved referral names someone joining now
+        self.unresolved = unresolved
+        return {"joined": self.join(new), "rebased": rebased}
+
+    # -- results --------------------------------------------------------------
+
+    def report(self, limit=10):
+        depth, size, bonus, parent = self.depth, self.size, self.bonus, self.parent
+
+        def top(values):
+            order = np.argsort(-values, kind="stable")[:limit]
+            return [{"userId": self.ids[k], "downline": int(size[k]), "bonus": round(float(bonus[k]), 2),
+                     "depth": int(depth[k])} for k in order if values[k] > 0]
+
+        return {
+            "users": self.n,
+            "referred": int((parent >= 0).sum()),
+            "roots": int((parent < 0).sum()),
+            "maxDepth": int(depth.max()) if self.n else 0,
+            "unresolved": self.unresolved,
+            "cycles": len(self.cycles),
+            "bonusTotal": round(float(bonus.sum()), 2),
+            "rates": list(self.rates),
+            "topDownline": top(size),
+            "topBonus": top(bonus),
+        }
+
+    def rows(self):
+        parent = self.parent.tolist()
+        for k, (d, s, b) in enumerate(zip(self.depth.tolist(), self.size.tolist(), self.bonus.tolist())):
+            yield {"userId": self.ids[k], "referrer": self.ids[parent[k]] if parent[k] >= 0 else None,
+                   "depth": d, "downline": s, "bonus": round(b, 2)}
+
+    # -- checkpoint --------------------------------------------------------
+
+    def save(self, path):
+        meta = {"rates": self.rates, "base": self.base_name, "cycles": self.cycles, "unresolved": self.unresolved}
+        tmp = Path(f"{path}.tmp.npz")
+        np.savez(tmp, ids=np.array([uid.encode("utf-8") for uid in self.ids]), meta=np.array(json.dumps(meta)),
+                 **{name: values[:self.n] for name, values in self._data.items()})
+        tmp.replace(path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as ckpt:
+            meta = json.loads(str(ckpt["meta"]))
+            tree = cls(meta["rates"], meta["base"])
+            tree.ids = [uid.decode("utf-8") for uid in ckpt["ids"].tolist()]
+            tree.n = len(tree.ids)
+            tree._data = {name: ckpt[name].astype(dtype) for name, dtype in tree._arrays.items()}
+        tree.index = {uid: k for k, uid in enumerate(tree.ids)}
+        tree.cycles, tree.unresolved = meta["cycles"], meta["unresolved"]
+        return tree
+
+
+def run(db_path, checkpoint=None, rates=RATES, base="subscription"):
+    """(tree, how) for the users in db_path; how is "built" or the sync() counts."""
+    if checkpoint and Path(checkpoint).exists():
+        tree = ReferralTree.load(checkpoint)
+        if tree.rates == tuple(rates) and tree.base_name == base:
+            synced = tree.sync(iter_collection(db_path, "users"))
+            if synced is not None:
+                tree.save(checkpoint)
+                return tree, synced
+    tree = ReferralTree(rates, base).build(iter_collection(db_path, "users"))
+    if checkpoint:
+        tree.save(checkpoint)
+    return tree, "built"
+
+
+def naive(users, rates=RATES, base=subscription_base):
+    """Per-user walk up the referral chain, for checking: {id: (depth, downline, bonus)}."""
+    parent = {u["id"]: u.get("referral") for u in users}
+    out = {uid: [0, 0, 0.0] for uid in parent}
+    for user in users:
+        node, level, amount = parent[user["id"]], 0, base(user)
+        while node in parent:
+            out[node][1] += 1
+            if level < len(rates):
+                out[node][2] += rates[level] * amount
+            node, level = parent[node], level + 1
+            out[user["id"]][0] += 1
+    return {uid: tuple(v) for uid, v in out.items()}
+
+
+def bench(users=1_000_000, join=10_000, seed=0, sample=2_000):
+    from seedkit.synth import make_user
+
+    people = [make_user(seed, i) for i in range(users + join)]
+    t0 = perf_counter()
+    tree = ReferralTree().build(people[:users])
+    build_s = perf_counter() - t0
+    t0 = perf_counter()
+    tree.join(people[users:])
+    join_s = perf_counter() - t0
+    t0 = perf_counter()
+    full = ReferralTree().build(people)
+    rebuild_s = perf_counter() - t0
+    same = all((a == b).all() for a, b in ((tree.depth, full.depth), (tree.size, full.size))) \
+        and np.allclose(tree.bonus, full.bonus)
+    check = naive(people[:sample])
+    small = ReferralTree().build(people[:sample])
+    agree = all(check[uid][:2] == (d, s) and abs(check[uid][2] - b) < 1e-6
+                for uid, d, s, b in zip(small.ids, small.depth.tolist(), small.size.tolist(), small.bonus.tolist()))
+    return {"users": users, "join": join, "build_s": build_s, "join_s": join_s, "rebuild_s": rebuild_s,
+            "incremental_matches": bool(same), "naive_agrees": agree, "report": full.report(3)}
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    p = argparse.ArgumentParser(description="Referral depths, downlines and multi-level bonuses")
+    p.add_argument("--db", type=Path, default=Path("data/db.json"))
+    p.add_argument("--rates", type=float, nargs="+", default=list(RATES),
+                   help="bonus share per upline level, nearest first")
+    p.add_argument("--base", choices=BASES, default="subscription", help="amount the rates apply to")
+    p.add_argument("--checkpoint", type=Path, help="resume from and save the tree here (.npz)")
+    p.add_argument("--out", type=Path, help="write every user's depth, downline and bonus as JSON Lines")
+    p.add_argument("--bench", type=int, metavar="USERS", help="time build vs incremental joins on synthetic users")
+    args = p.parse_args()
+
+    try:
+        if args.bench:
+            r = bench(args.bench)
+            print(f"{r['users']:,} users: build {r['build_s']:.2f}s; {r['join']:,} joins {r['join_s'] * 1e3:.0f} ms "
+                  f"incrementally vs {r['rebuild_s']:.2f}s rebuilt")
+            print(f"  incremental == rebuild: {r['incremental_matches']}, naive walk agrees: {r['naive_agrees']}")
+            print(f"  max depth {r['report']['maxDepth']}, {r['report']['referred']:,} referred users")
+            sys.exit(0)
+        t0 = perf_counter()
+        tree, how = run(args.db, args.checkpoint, tuple(args.rates), args.base)
+        elapsed = perf_counter() - t0
+    except RuntimeError as e:
+        sys.exit(str(e))
+    r = tree.report()
+    done = "built" if how == "built" else f"{how['joined']:,} joined, {how['rebased']:,} rebased"
+    print(f"{r['users']:,} users ({done}) in {elapsed:.2f}s: {r['referred']:,} referred, max depth {r['maxDepth']}, "
+          f"bonuses {r['bonusTotal']:,.2f}")
+    if r["unresolved"]:
+        print(f"! {r['unresolved']:,} referral(s) name no known user; those users count as roots")
+    for loop in tree.cycles[:10]:
+        print(f"! referral loop cut at {loop[0]}: {' -> '.join(loop)} -> {loop[0]}")
+    for row in r["topDownline"]:
+        print(f"  {row['userId']}  downline {row['downline']:>9,}  bonus {row['bonus']:>12,.2f}  depth {row['depth']}")
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            for row in tree.rows():
+                f.write(json.dumps(row, ensure_ascii=False) + "\n")
+        print(f"✓ Wrote {args.out}")
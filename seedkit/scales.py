@@ -0,0 +1,118 @@
+# seedkit/scales.py
+# Interned option scales: each distinct items[].options list is stored once in
+# a top-level "scales" table and items point at it by index.
+#
+#   {"users": [...], "surveys": [{..., "items": [{"prompt": "...", "scale": 0}]}],
+#    "scales": [["Very satisfied", "Satisfied", "Neutral", ...], ...]}
+#
+#   python -m seedkit.scales data/db.json     # measure the savings
+import json
+import sys
+import tracemalloc
+from pathlib import Path
+
+
+class ScaleTable:
+    """Assigns a stable index to every distinct option list, in first-seen order."""
+
+    def __init__(self, scales=()):
+        self.scales = []
+        self._ids = {}
+        for options in scales:
+            self.intern(options)
+
+    def intern(self, options):
+        key = tuple(options)
+        sid = self._ids.get(key)
+        if sid is None:
+            sid = self._ids[key] = len(self.scales)
+            self.scales.append(list(options))
+        return sid
+
+    def __iter__(self):
+        # Lazy on purpose: as the last collection in iter_json, the table is
+        # read only after every survey has been interned
+        return iter(self.scales)
+
+    def __len__(self):
+        return len(self.scales)
+
+
+def intern_survey(survey, table):
+    items = []
+    for item in survey.get("items") or []:
+        item = dict(item)
+        item["scale"] = table.intern(item.pop("options", None) or [])
+        items.append(item)
+    return {**survey, "items": items}
+
+
+def intern_surveys(surveys, table):
+    for survey in surveys:
+        yield intern_survey(survey, table)
+
+
+def interned_collections(collections):
+    """Rewrite (name, iterable) pairs so surveys reference a trailing "scales" table."""
+    table = ScaleTable()
+    out = [(name, intern_surveys(records, table) if name == "surveys" else records)
+           for name, records in collections]
+    out.append(("scales", table))
+    return out
+
+
+def expand_survey(survey, scales):
+    """The survey in the regular shape, with items[].options filled back in."""
+    items = []
+    for item in survey.get("items") or []:
+        item = dict(item)
+        item["options"] = list(scales[item.pop("scale")])
+        items.append(item)
+    return {**survey, "items": items}
+
+
+def expand(doc):
+    """Rebuild the regular {"users": [...], "surveys": [...]} document."""
+    scales = doc.get("scales", [])
+    out = {k: v for k, v in doc.items() if k != "scales"}
+    out["surveys"] = [expand_survey(s, scales) for s in doc.get("surveys", [])]
+    return out
+
+
+def _parsed_bytes(text):
+    tracemalloc.start()
+    try:
+        doc = json.loads(text)
+        return tracemalloc.get_traced_memory()[0], doc
+    finally:
+        tracemalloc.stop()
+
+
+def measure(doc):
+    """Compare bytes on disk and memory once parsed, regular vs interned."""
+    table = ScaleTable()
+    interned = {**doc, "surveys": [intern_survey(s, table) for s in doc.get("surveys", [])],
+                "scales": table.scales}
+    rows = {}
+    for name, value in (("regular", doc), ("interned", interned)):
+        pretty = json.dumps(value, ensure_ascii=False, indent=2)
+        compact = json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+        memory, parsed = _parsed_bytes(compact)
+        rows[name] = {"pretty_bytes": len(pretty.encode("utf-8")),
+                      "compact_bytes": len(compact.encode("utf-8")),
+                      "parsed_bytes": memory}
+        del parsed
+    rows["scales"] = len(table)
+    rows["items"] = sum(len(s.get("items") or []) for s in doc.get("surveys", []))
+    return rows
+
+
+if __name__ == "__main__":
+    path = Path(sys.argv[1] if len(sys.argv) > 1 else "data/db.json")
+    with open(path, encoding="utf-8") as f:
+        result = measure(json.load(f))
+    reg, intd = result["regular"], result["interned"]
+    print(f"{result['items']:,} items share {result['scales']:,} distinct option scales")
+    for key in ("pretty_bytes", "compact_bytes", "parsed_bytes"):
+        saved = 1 - intd[key] / reg[key] if reg[key] else 0
+        print(f"{key:<14} {reg[key]:>14,} -> {intd[key]:>14,}  ({saved:.1%} smaller)")
@@ -0,0 +1,276 @@
+# seedkit/search.py
+# Inverted full-text index over survey names, descriptions, prompts and options.
+#
+# db.json.search.idx layout (little-endian):
+#
+#   header    b"SRCH" | u16 version | u32 docs | u32 terms | u64 x4 section offsets
+#   ids       survey ids, "\n"-joined (doc number -> id)
+#   terms     sorted terms, "\n"-joined
+#   offsets   u64[terms + 1]: where each term's postings start
+#   docs      u32[postings]: doc numbers, ascending within a term
+#   weights   u8[postings]: summed field weights for (term, doc)
+#
+#   python -m seedkit.search data/db.json "satisf* service"
+#   python -m seedkit.search --bench 1000000
+import heapq
+import mmap
+import re
+import struct
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+from time import perf_counter
+
+MAGIC = b"SRCH"
+VERSION = 1
+HEADER = struct.Struct("<4sHII4Q")
+WEIGHTS = {"name": 4, "description": 2, "prompt": 2, "option": 1}
+TOKEN = re.compile(r"[^\W_]+")
+# When a term's postings are this many times longer than the candidate set,
+# binary-search candidates into it instead of walking the whole list
+PROBE_RATIO = 16
+
+
+def index_path(db_path):
+    db_path = Path(db_path)
+    return db_path.with_name(db_path.name + ".search.idx")
+
+
+def tokenize(text):
+    return TOKEN.findall(text.casefold()) if isinstance(text, str) else []
+
+
+def survey_terms(survey):
+    """{term: summed field weight} for one survey."""
+    terms = {}
+
+    def add(text, weight):
+        for term in tokenize(text):
+            terms[term] = min(terms.get(term, 0) + weight, 255)
+
+    add(survey.get("name"), WEIGHTS["name"])
+    add(survey.get("description"), WEIGHTS["description"])
+    for item in survey.get("items") or []:
+        add(item.get("prompt"), WEIGHTS["prompt"])
+        for option in item.get("options") or []:
+            add(option, WEIGHTS["option"])
+    return terms
+
+
+class SearchIndexBuilder:
+    def __init__(self):
+        self.ids = []
+        self._postings = {}  # term -> (array of doc numbers, array of weights)
+
+    def add(self, survey):
+        doc = len(self.ids)
+        self.ids.append(str(survey["id"]))
+        for term, weight in survey_terms(survey).items():
+            entry = self._postings.get(term)
+            if entry is None:
+                entry = self._postings[term] = (array("I"), array("B"))
+            entry[0].append(doc)
+            entry[1].append(weight)
+
+    def add_all(self, surveys):
+        for survey in surveys:
+            self.add(survey)
+        return self
+
+    def write(self, path):
+        terms = sorted(self._postings)
+        offsets = array("Q", [0])
+        for term in terms:
+            offsets.append(offsets[-1] + len(self._postings[term][0]))
+
+        ids = "\n".join(self.ids).encode("utf-8")
+        term_block = "\n".join(terms).encode("utf-8")
+        ids_at = HEADER.size
+        terms_at = ids_at + len(ids)
+        offsets_at = terms_at + len(term_block)
+        postings_at = offsets_at + offsets.itemsize * len(offsets)
+        # keep the u32 section 4-byte aligned so it can be cast in place
+        pad = -postings_at % 4
+        postings_at += pad
+
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, len(self.ids), len(terms),
+                                ids_at, terms_at, offsets_at, postings_at))
+            f.write(ids)
+            f.write(term_block)
+            offsets.tofile(f)
+            f.write(b"\0" * pad)
+            for term in terms:
+                self._postings[term][0].tofile(f)
+            for term in terms:
+                self._postings[term][1].tofile(f)
+        Path(tmp).replace(path)
+        return {"docs": len(self.ids), "terms": len(terms), "postings": offsets[-1]}
+
+
+class SearchIndex:
+    """Query a db.json.search.idx file in place (mmap).
+
+        with SearchIndex("data/db.json.search.idx") as idx:
+            idx.search("customer satisf*")   # -> [(survey id, score), ...]
+    """
+
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.docs, n_terms, ids_at, terms_at, offsets_at, postings_at = \
+            HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path}: not a search index (or unsupported version)")
+        view = memoryview(self._map)
+        self._ids_block = (ids_at, terms_at)
+        self._ids = None
+        self.terms = bytes(view[terms_at:offsets_at]).decode("utf-8").split("\n") if n_terms else []
+        self._offsets = view[offsets_at:offsets_at + 8 * (n_terms + 1)].cast("Q")
+        total = self._offsets[n_terms]
+        self._docs = view[postings_at:postings_at + 4 * total].cast("I")
+        self._weights = view[postings_at + 4 * total:postings_at + 5 * total]
+
+    def _doc_id(self, doc):
+        if self._ids is None:
+            start, end = self._ids_block
+            self._ids = self._map[start:end].decode("utf-8").split("\n")
+        return self._ids[doc]
+
+    def _term_range(self, token):
+        if token.endswith("*"):
+            prefix = token[:-1].casefold()
+            if not prefix:
+                return range(0)
+            return range(bisect_left(self.terms, prefix), bisect_left(self.terms, prefix + "\U0010ffff"))
+        i = bisect_left(self.terms, token)
+        return range(i, i + 1) if i < len(self.terms) and self.terms[i] == token else range(0)
+
+    def _postings(self, t):
+        a, b = self._offsets[t], self._offsets[t + 1]
+        return self._docs[a:b], self._weights[a:b]
+
+    def _size(self, terms):
+        return sum(self._offsets[t + 1] - self._offsets[t] for t in terms)
+
+    def _parse(self, query):
+        groups = []
+        for raw in query.split():
+            tokens = tokenize(raw)
+            if raw.endswith("*") and tokens:
+                tokens[-1] += "*"
+            groups.extend(self._term_range(token) for token in tokens)
+        return groups
+
+    def search(self, query, limit=20):
+        """Surveys matching every query word (AND); "word*" matches as a prefix.
+
+        Returns up to `limit` (survey id, score) pairs, best score first.
+        """
+        groups = self._parse(query)
+        if not groups or not all(groups):
+            return []
+        groups.sort(key=self._size)
+
+        scores = {}
+        for t in groups[0]:
+            docs, weights = self._postings(t)
+            for doc, weight in zip(docs, weights):
+                scores[doc] = scores.get(doc, 0) + weight
+
+        for group in groups[1:]:
+            if not scores:
+                return []
+            matched = {}
+            for t in group:
+                docs, weights = self._postings(t)
+                if len(docs) > PROBE_RATIO * len(scores):
+                    for doc in scores:
+                        i = bisect_left(docs, doc)
+                        if i < len(docs) and docs[i] == doc:
+                            matched[doc] = matched.get(doc, scores[doc]) + weights[i]
+                else:
+                    for doc, weight in zip(docs, weights):
+                        if doc in scores:
+                            matched[doc] = matched.get(doc, scores[doc]) + weight
+            scores = matched
+
+        best = heapq.nsmallest(limit, scores.items(), key=lambda kv: (-kv[1], kv[0]))
+        return [(self._doc_id(doc), score) for doc, score in best]
+
+    def close(self):
+        # drop the memoryviews before the map they point into
+        del self._offsets, self._docs, self._weights
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def bench(n, queries=200, seed=0):
+    """Build an index over n synthetic surveys and time typical queries."""
+    import random
+    import tempfile
+
+    from seed import surveys as templates
+    from seedkit.synth import make_survey
+
+    t0 = perf_counter()
+    builder = SearchIndexBuilder().add_all(make_survey(seed, i, templates) for i in range(n))
+    build_s = perf_counter() - t0
+    rng = random.Random(seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "search.idx"
+        stats = builder.write(path)
+        stats["bytes"] = path.stat().st_size
+        del builder
+        with SearchIndex(path) as idx:
+            words = [t for t in idx.terms if len(t) > 3 and not t.isdigit()]
+            kinds = {
+                "number": lambda: str(rng.randrange(1, n + 1)),
+                "word": lambda: rng.choice(words),
+                "prefix": lambda: rng.choice(words)[:4] + "*",
+                "word AND number": lambda: f"{rng.choice(words)} {rng.randrange(1, n + 1)}",
+                "word AND word": lambda: f"{rng.choice(words)} {rng.choice(words)}",
+            }
+            rows = []
+            for kind, make in kinds.items():
+                times = []
+                for _ in range(queries):
+                    q = make()
+                    t0 = perf_counter()
+                    idx.search(q)
+                    times.append(perf_counter() - t0)
+                times.sort()
+                rows.append({"query": kind, "p50_ms": times[len(times) // 2] * 1e3,
+                             "p99_ms": times[int(len(times) * 0.99)] * 1e3})
+    return {"surveys": n, "build_s": build_s, **stats, "queries": rows}
+
+
+if __name__ == "__main__":
+    import argparse
+
+    p = argparse.ArgumentParser(description="Query or benchmark the survey search index")
+    p.add_argument("db", nargs="?", default="data/db.json", help="db.json whose .search.idx to query")
+    p.add_argument("query", nargs="?", help="words to AND together; word* for a prefix")
+    p.add_argument("--bench", type=int, metavar="N", help="benchmark over N synthetic surveys")
+    args = p.parse_args()
+
+    if args.bench:
+        result = bench(args.bench)
+        print(f"{result['surveys']:,} surveys, {result['terms']:,} terms, {result['postings']:,} postings, "
+              f"{result['bytes'] / 1e6:.1f} MB, built in {result['build_s']:.1f}s")
+        for row in result["queries"]:
+            print(f"  {row['query']:<16} p50 {row['p50_ms']:8.3f} ms   p99 {row['p99_ms']:8.3f} ms")
+    else:
+        path = index_path(args.db)
+        if not path.exists():
+            p.error(f"{path} not found; run `python seed.py --search` first")
+        with SearchIndex(path) as idx:
+            for sid, score in idx.search(args.query or ""):
+                print(f"{score:4d}  {sid}")
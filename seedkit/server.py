@@ -0,0 +1,377 @@
+# seedkit/server.py
+# Local stand-in for the /api/mock endpoints (api/mock/*.js), for load tests
+# on a plain Linux box without Vercel.
+#
+# The JS handlers read and JSON.parse data/db.json on every request
+# ([...slug].js once per cold start). Here db.json is read once: records sit
+# in an id -> record index as compact seedkit.model objects, and each
+# response body is encoded once, together with its ETag and, the first time
+# a client asks for it, its gzip bytes. A request is then a dict lookup and
+# one socket write, or an empty 304 when If-None-Match still matches.
+#
+#   GET /api/mock                       the whole db, like api/mock/index.js
+#   GET /api/mock/surveys               surveys; ?view=&sort= or ?cursor= serve --views pages
+#   GET /api/mock/users                 users
+#   GET /api/mock/<collection>[/<id>]   a collection or one record, like [...slug].js
+#
+#   python -m seedkit.server --db data/db.json --port 3002
+#   python -m seedkit.server --bench 10000     # throughput and latency vs re-parsing per request
+import asyncio
+import gzip
+import hashlib
+import json
+import re
+import socket
+from pathlib import Path
+from time import perf_counter
+from urllib.parse import parse_qs, unquote
+
+from seedkit import model
+from seedkit.emit import encode
+from seedkit.jsonstream import iter_collection
+
+COLLECTIONS = (("users", model.users), ("surveys", model.surveys))
+GZIP_MIN = 1024  # smaller bodies go out uncompressed
+REASONS = {200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed"}
+CURSOR = re.compile(r"^([a-z]+)\.([a-z]+)\.(\d+)$")  # CURSOR in api/mock/_utils.js
+
+
+class Response:
+    """A response body encoded once; ETag and gzip bytes are computed on first use."""
+
+    __slots__ = ("status", "body", "_etag", "_gzip")
+
+    def __init__(self, status, body):
+        self.status = status
+        self.body = body
+        self._etag = self._gzip = None
+
+    def etag(self):
+        if self._etag is None:
+            self._etag = '"%s"' % hashlib.blake2b(self.body, digest_size=12).hexdigest()
+        return self._etag
+
+    def gzipped(self):
+        if self._gzip is None:
+            self._gzip = gzip.compress(self.body, 6, mtime=0)
+        return self._gzip
+
+
+def _error(status, message):
+    return Response(status, encode({"error": message}, None).encode("utf-8"))
+
+
+def _split(target):
+    path, _, query = target.partition("?")
+    return [unquote(p) for p in path.split("/") if p], {k: v[0] for k, v in parse_qs(query).items()}
+
+
+def _page_token(query):
+    # api/mock/surveys.js: a cursor, or the first page of ?view= in ?sort= order
+    return query.get("cursor") or f"{query['view']}.{query.get('sort') or 'payout'}.1"
+
+
+class MockData:
+    """db.json loaded once, with every response body ready to send."""
+
+    def __init__(self, db_path):
+        self.db_path = Path(db_path)
+        self.index = {}   # collection -> {str(id): record}
+        self.lists = {}   # collection -> Response with the whole array
+        self._records = {}  # (collection, id) -> Response, filled as records are asked for
+        parts = []
+        for name, convert in COLLECTIONS:
+            index, texts = {}, []
+            for record in convert(iter_collection(self.db_path, name)):
+                texts.append(record.render(None, 0).encode("utf-8"))
+                # [...slug].js matches with Array.find: the first record with the id wins
+                index.setdefault(str(record.get("id")), record)
+            body = b"[" + b",".join(texts) + b"]"
+            self.index[name], self.lists[name] = index, Response(200, body)
+            parts.append(encode(name, None).encode("utf-8") + b":" + body)
+        self.db = Response(200, b"{" + b",".join(parts) + b"}")
+        self.pages = {}  # cursor -> Response, from the --views output next to db.json
+        views = self.db_path.parent / "views"
+        for path in views.glob("*/*/*.json"):
+            view, sort = path.parent.parent.name, path.parent.name
+            self.pages[f"{view}.{sort}.{path.stem}"] = Response(200, path.read_bytes())
+
+    def route(self, parts, query):
+        if parts[:2] != ["api", "mock"]:
+            return _error(404, "Not found")
+        rest = parts[2:]
+        if not rest:
+            return self.db
+        name = rest[0]
+        if name == "surveys" and len(rest) == 1 and (query.get("cursor") or query.get("view")):
+            token = _page_token(query)
+            return self.pages.get(token) or _error(404, f"Unknown cursor '{token}'")
+        if name not in self.index:
+            return _error(404, f"Collection '{name}' not found")
+        if len(rest) == 1:
+            return self.lists[name]
+        key = (name, rest[1])
+        found = self._records.get(key)
+        if found is None:
+            record = self.index[name].get(rest[1])
+            if record is None:
+                return _error(404, f"Item '{rest[1]}' not found")
+            found = self._records[key] = Response(200, record.render(None, 0).encode("utf-8"))
+        return found
+
+
+class Reparse:
+    """What the JS handlers do today: read and parse db.json per request, stringify the answer."""
+
+    def __init__(self, db_path):
+        self.db_path = Path(db_path)
+
+    def route(self, parts, query):
+        if parts[:2] != ["api", "mock"]:
+            return _error(404, "Not found")
+        with open(self.db_path, encoding="utf-8") as f:
+            db = json.load(f)
+        rest = parts[2:]
+        if not rest:
+            return Response(200, encode(db, None).encode("utf-8"))
+        name = rest[0]
+        if name == "surveys" and len(rest) == 1 and (query.get("cursor") or query.get("view")):
+            token = _page_token(query)
+            m = CURSOR.match(token)
+            path = self.db_path.parent / "views" / m[1] / m[2] / f"{m[3]}.json" if m else None
+            if path is None or not path.exists():
+                return _error(404, f"Unknown cursor '{token}'")
+            return Response(200, path.read_bytes())
+        data = db.get(name)
+        if data is None:
+            return _error(404, f"Collection '{name}' not found")
+        if len(rest) == 1:
+            return Response(200, encode(data, None).encode("utf-8"))
+        match = next((x for x in data if str(x and x.get("id")) == rest[1]), None)
+        if match is None:
+            return _error(404, f"Item '{rest[1]}' not found")
+        return Response(200, encode(match, None).encode("utf-8"))
+
+
+def _not_modified(response, tag, headers):
+    header = headers.get("if-none-match")
+    if not header or response.status != 200:
+        return False
+    tags = {t.strip().removeprefix("W/") for t in header.split(",")}
+    return "*" in tags or tag in tags or response.etag() in tags
+
+
+def respond(data, method, target, headers):
+    """Status line, headers and body (bytes) for one request."""
+    if method not in ("GET", "HEAD"):
+        response, extra = _error(405, "Method Not Allowed"), "Allow: GET, HEAD\r\n"
+    else:
+        response, extra = data.route(*_split(target)), ""
+    body = response.body
+    tag = response.etag()
+    if len(body) >= GZIP_MIN and "gzip" in headers.get("accept-encoding", ""):
+        body = response.gzipped()
+        tag = tag[:-1] + '-gz"'  # a different representation needs a different validator
+        extra += "Content-Encoding: gzip\r\n"
+    status = response.status
+    if _not_modified(response, tag, headers):
+        status, body = 304, b""
+    if headers.get("connection", "").lower() == "close":
+        extra += "Connection: close\r\n"
+    head = (f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"ETag: {tag}\r\n"
+            "Vary: Accept-Encoding\r\n"
+            "Cache-Control: no-cache\r\n"
+            f"{extra}\r\n").encode("latin-1")
+    return head, b"" if method == "HEAD" else body
+
+
+async def _handle(data, reader, writer):
+    try:
+        while True:
+            request = await reader.readuntil(b"\r\n\r\n")
+            lines = request.decode("latin-1").split("\r\n")
+            try:
+                method, target, version = lines[0].split(" ", 2)
+            except ValueError:
+                writer.write(b"HTTP/1.1 400 Bad Request\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
+                break
+            headers = {}
+            for line in lines[1:]:
+                key, sep, value = line.partition(":")
+                if sep:
+                    headers[key.strip().lower()] = value.strip()
+            if int(headers.get("content-length") or 0):
+                await reader.readexactly(int(headers["content-length"]))
+            head, body = respond(data, method, target, headers)
+            if len(body) < 65536:
+                writer.write(head + body)
+            else:
+                writer.write(head)
+                writer.write(body)
+            await writer.drain()
+            keep = headers.get("connection", "").lower()
+            if keep == "close" or (version == "HTTP/1.0" and keep != "keep-alive"):
+                break
+    except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(data, host="127.0.0.1", port=3002, ready=None):
+    server = await asyncio.start_server(lambda r, w: _handle(data, r, w), host, port, backlog=1024)
+    if ready is not None:
+        ready.set()
+    async with server:
+        await server.serve_forever()
+
+
+# -- load test ---------------------------------------------------------------
+
+def _requests(paths, headers="", etags=None):
+    """Raw GET requests for `paths`, with a per-path If-None-Match if `etags` is given."""
+    out = []
+    for path in paths:
+        extra = headers + (f"If-None-Match: {etags[path]}\r\n" if etags else "")
+        out.append(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n{extra}\r\n".encode("latin-1"))
+    return out
+
+
+async def _load(port, requests, count, connections):
+    latencies = []
+    statuses = {}
+
+    async def client(n, offset):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        for i in range(n):
+            t0 = perf_counter()
+            writer.write(requests[(offset + i * connections) % len(requests)])
+            head = await reader.readuntil(b"\r\n\r\n")
+            await reader.readexactly(int(re.search(rb"(?i)content-length: *(\d+)", head)[1]))
+            latencies.append(perf_counter() - t0)
+            status = int(head.split(b" ", 2)[1])
+            statuses[status] = statuses.get(status, 0) + 1
+        writer.close()
+
+    t0 = perf_counter()
+    share = -(-count // connections)
+    await asyncio.gather(*(client(min(share, count - c * share), c) for c in range(connections)
+                           if count > c * share))
+    elapsed = perf_counter() - t0
+    latencies.sort()
+    pick = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1e3  # noqa: E731
+    return {"requests": len(latencies), "rps": len(latencies) / elapsed, "p50_ms": pick(0.50),
+            "p95_ms": pick(0.95), "p99_ms": pick(0.99), "statuses": statuses}
+
+
+async def _etags(port, paths):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    tags = {}
+    for path in dict.fromkeys(paths):
+        writer.write(f"HEAD {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode("latin-1"))
+        head = await reader.readuntil(b"\r\n\r\n")
+        tags[path] = re.search(rb"(?i)etag: *(\S+)", head)[1].decode("latin-1")
+    writer.close()
+    return tags
+
+
+def _run_server(kind, db_path, port, ready):
+    data = (MockData if kind == "indexed" else Reparse)(db_path)
+    asyncio.run(serve(data, port=port, ready=ready))
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def bench(surveys=10_000, users=1_000, requests=2_000, connections=8, reparse_requests=100, seed=0):
+    """Serve a synthetic db from a child process and load it: indexed server vs re-parse per request."""
+    import multiprocessing
+    import random
+    import tempfile
+
+    from seed import surveys as templates
+    from seedkit.emit import write_db
+    from seedkit.synth import make_survey, make_user
+    from seedkit.views import write_views
+
+    catalog = [make_survey(seed, i, templates) for i in range(surveys)]
+    rng = random.Random(seed)
+    # mostly single records, like the survey and profile pages; some list pages and the users list
+    paths = [f"/api/mock/surveys/{rng.choice(catalog)['id']}" for _ in range(900)]
+    paths += ["/api/mock/surveys?view=active", "/api/mock/surveys?view=free&sort=newest"] * 40
+    paths += ["/api/mock/users"] * 20
+    rng.shuffle(paths)
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "db.json"
+        write_db(db_path, [("users", [make_user(seed, i) for i in range(users)]), ("surveys", catalog)], None)
+        write_views(tmp, catalog, indent=None)
+        del catalog
+        runs = [("reparse", "identity", reparse_requests, ""),
+                ("indexed", "identity", requests, ""),
+                ("indexed", "gzip", requests, "Accept-Encoding: gzip\r\n")]
+        for kind, label, count, headers in runs:
+            port = _free_port()
+            ready = multiprocessing.Event()
+            t0 = perf_counter()
+            proc = multiprocessing.Process(target=_run_server, args=(kind, db_path, port, ready), daemon=True)
+            proc.start()
+            ready.wait()
+            startup = perf_counter() - t0
+            try:
+                raw = _requests(paths, headers)
+                if kind == "indexed":
+                    asyncio.run(_load(port, raw, len(raw), connections))  # warm-up: encode and gzip once
+                rows.append({"server": kind, "response": label, "startup_s": startup,
+                             **asyncio.run(_load(port, raw, count, connections))})
+                if kind == "indexed" and not headers:
+                    # revalidation: the client already holds every body
+                    raw = _requests(paths, etags=asyncio.run(_etags(port, paths)))
+                    rows.append({"server": kind, "response": "if-none-match", "startup_s": startup,
+                                 **asyncio.run(_load(port, raw, count, connections))})
+            finally:
+                proc.terminate()
+                proc.join()
+    return {"surveys": surveys, "users": users, "connections": connections, "rows": rows}
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    p = argparse.ArgumentParser(description="Serve the /api/mock routes from db.json, or load-test them")
+    p.add_argument("--db", type=Path, default=Path("data/db.json"))
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=3002)
+    p.add_argument("--reparse", action="store_true",
+                   help="re-read and parse db.json on every request, like the JS handlers (baseline)")
+    p.add_argument("--bench", type=int, metavar="SURVEYS", help="load-test both servers on a synthetic db")
+    p.add_argument("--requests", type=int, default=2_000)
+    p.add_argument("--connections", type=int, default=8)
+    args = p.parse_args()
+
+    if args.bench:
+        r = bench(args.bench, requests=args.requests, connections=args.connections)
+        print(f"{r['surveys']:,} surveys, {r['users']:,} users, {r['connections']} keep-alive connections")
+        print(f"  {'server':<8} {'response':<14} {'startup':>8} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+        for row in r["rows"]:
+            print(f"  {row['server']:<8} {row['response']:<14} {row['startup_s']:7.2f}s {row['rps']:9,.0f} "
+                  f"{row['p50_ms']:8.2f} {row['p95_ms']:8.2f} {row['p99_ms']:8.2f}")
+        sys.exit(0)
+
+    if not args.db.exists():
+        sys.exit(f"{args.db} not found; run python seed.py first")
+    t0 = perf_counter()
+    data = Reparse(args.db) if args.reparse else MockData(args.db)
+    print(f"✓ Loaded {args.db} in {perf_counter() - t0:.2f}s; serving /api/mock on http://{args.host}:{args.port}")
+    try:
+        asyncio.run(serve(data, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
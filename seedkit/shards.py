@@ -0,0 +1,102 @@
+# seedkit/shards.py
+# Sharded output: one file per collection, one file per record, and a manifest.
+#
+#   data/surveys.json          the whole collection (same array as db.json)
+#   data/surveys/<id>.json     one record
+#   data/manifest.json         ids, byte sizes and sha256 of everything above
+import hashlib
+import re
+import shutil
+from pathlib import Path
+
+from seedkit.emit import FragmentWriter, encode, iter_array, write_db
+from seedkit.jsonstream import iter_collection
+
+# Record ids become file names, so they must not be able to escape the directory
+SAFE_ID = re.compile(r"^[A-Za-z0-9_-]+$")
+
+
+def swap_dir(tmp, dest):
+    # Two renames, so readers see either the old set of files or the new one
+    old = dest.with_name(f".{dest.name}.old")
+    if old.exists():
+        shutil.rmtree(old)
+    if dest.exists():
+        dest.rename(old)
+    tmp.rename(dest)
+    if old.exists():
+        shutil.rmtree(old)
+
+
+def write_shards(out_dir, collections, indent=2, per_record=("surveys",)):
+    """Write collection files, per-record files and manifest.json in one pass.
+
+    `collections` is a sequence of (name, iterable) pairs, as for write_db.
+    Per-record files are only written for the collections in `per_record`.
+    Returns the per-collection summaries that went into the manifest.
+    """
+    out_dir = Path(out_dir)
+    entries = FragmentWriter(out_dir / ".manifest-records.part", indent=indent)
+    summary = []
+
+    for name, records in collections:
+        stats = {"name": name, "file": f"{name}.json", "count": 0}
+        rec_dir = out_dir / f".{name}.tmp" if name in per_record else None
+        if rec_dir:
+            shutil.rmtree(rec_dir, ignore_errors=True)
+            rec_dir.mkdir(parents=True)
+
+        def split(records):
+            for record in records:
+                stats["count"] += 1
+                if rec_dir:
+                    rid = str(record.get("id", ""))
+                    if not SAFE_ID.match(rid):
+                        raise ValueError(f"{name}: id {rid!r} cannot be used as a file name")
+                    data = encode(record, indent).encode("utf-8")
+                    (rec_dir / f"{rid}.json").write_bytes(data)
+                    entries.write({"collection": name, "id": rid, "path": f"{name}/{rid}.json",
+                                   "bytes": len(data), "sha256": hashlib.sha256(data).hexdigest()})
+                yield record
+
+        digest = hashlib.sha256()
+        size = 0
+        col_path = out_dir / stats["file"]
+        col_tmp = col_path.with_name(col_path.name + ".tmp")
+        with open(col_tmp, "wb") as f:
+            for chunk in iter_array(split(records), indent):
+                data = chunk.encode("utf-8")
+                f.write(data)
+                digest.update(data)
+                size += len(data)
+        col_tmp.replace(col_path)
+        if rec_dir:
+            swap_dir(rec_dir, out_dir / name)
+
+        stats.update(bytes=size, sha256=digest.hexdigest(), perRecord=bool(rec_dir))
+        summary.append(stats)
+
+    write_db(out_dir / "manifest.json", [
+        ("collections", iter(summary)),
+        ("records", iter([entries.close()])),
+    ], indent=indent)
+    Path(entries.path).unlink()
+    return summary
+
+
+def remove_shards(out_dir):
+    """Delete what an earlier write_shards() left in out_dir, as listed in its manifest.
+
+    The mock API prefers shards over db.json, so a run without --shards must
+    not leave the old ones behind.
+    """
+    out_dir = Path(out_dir)
+    manifest = out_dir / "manifest.json"
+    if not manifest.exists():
+        return
+    for entry in iter_collection(manifest, "collections"):
+        name = str(entry.get("name", ""))
+        if SAFE_ID.match(name):
+            (out_dir / f"{name}.json").unlink(missing_ok=True)
+            shutil.rmtree(out_dir / name, ignore_errors=True)
+    manifest.unlink()
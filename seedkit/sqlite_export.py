@@ -0,0 +1,144 @@
+# seedkit/sqlite_export.py
+# Export the users/surveys payload into a normalized, indexed SQLite file.
+#
+#   SELECT * FROM surveys WHERE status = 'active' AND premium = 1 AND payout > 40;
+#   SELECT * FROM users WHERE plan = 'premium';
+import os
+import sqlite3
+from itertools import islice
+
+BATCH = 10_000
+
+# Child tables key on the integer rowid rather than repeating the uuid per row
+SCHEMA = """
+CREATE TABLE surveys (
+    pk INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    name TEXT,
+    description TEXT,
+    payout REAL,
+    currency TEXT,
+    premium INTEGER NOT NULL,
+    status TEXT,
+    created_at INTEGER,
+    updated_at INTEGER
+);
+CREATE TABLE items (
+    survey_pk INTEGER NOT NULL REFERENCES surveys(pk),
+    position INTEGER NOT NULL,
+    prompt TEXT,
+    PRIMARY KEY (survey_pk, position)
+) WITHOUT ROWID;
+CREATE TABLE options (
+    survey_pk INTEGER NOT NULL,
+    item_position INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    label TEXT,
+    PRIMARY KEY (survey_pk, item_position, position),
+    FOREIGN KEY (survey_pk, item_position) REFERENCES items(survey_pk, position)
+) WITHOUT ROWID;
+CREATE TABLE users (
+    pk INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    name TEXT,
+    email TEXT,
+    password TEXT,
+    referral TEXT,
+    balance REAL,
+    created_at INTEGER,
+    plan TEXT,
+    tier TEXT
+);
+CREATE TABLE subscriptions (
+    user_pk INTEGER PRIMARY KEY REFERENCES users(pk),
+    provider TEXT,
+    amount REAL,
+    msisdn TEXT,
+    code TEXT,
+    business TEXT,
+    paid_at INTEGER
+);
+"""
+
+# Built after the bulk load: one sort per index instead of a b-tree update per row
+INDEXES = """
+CREATE INDEX surveys_status ON surveys(status);
+CREATE INDEX surveys_premium ON surveys(premium);
+CREATE INDEX surveys_payout ON surveys(payout);
+CREATE INDEX users_plan ON users(plan);
+CREATE INDEX users_email ON users(email);
+"""
+
+
+def _survey_rows(batch, first_pk):
+    surveys, items, options = [], [], []
+    for pk, s in enumerate(batch, first_pk):
+        surveys.append((pk, s["id"], s.get("name"), s.get("description"), s.get("payout"),
+                        s.get("currency"), int(bool(s.get("premium"))), s.get("status"),
+                        s.get("createdAt"), s.get("updatedAt")))
+        for i, item in enumerate(s.get("items") or []):
+            items.append((pk, i, item.get("prompt")))
+            options.extend((pk, i, j, label) for j, label in enumerate(item.get("options") or []))
+    return {"surveys": surveys, "items": items, "options": options}
+
+
+def _user_rows(batch, first_pk):
+    users, subscriptions = [], []
+    for pk, u in enumerate(batch, first_pk):
+        users.append((pk, u["id"], u.get("name"), u.get("email"), u.get("password"), u.get("referral"),
+                      u.get("balance"), u.get("createdAt"), u.get("plan"), u.get("tier")))
+        sub = u.get("subscription")
+        if isinstance(sub, dict):
+            subscriptions.append((pk, sub.get("provider"), sub.get("amount"), sub.get("msisdn"),
+                                  sub.get("code"), sub.get("business"), sub.get("paidAt")))
+    return {"users": users, "subscriptions": subscriptions}
+
+
+ROWS = {"surveys": _survey_rows, "users": _user_rows}
+INSERTS = {
+    "surveys": "INSERT INTO surveys VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+    "items": "INSERT INTO items VALUES (?, ?, ?)",
+    "options": "INSERT INTO options VALUES (?, ?, ?, ?)",
+    "users": "INSERT INTO users VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+    "subscriptions": "INSERT INTO subscriptions VALUES (?, ?, ?, ?, ?, ?, ?)",
+}
+
+
+def export_sqlite(path, collections):
+    """Write `collections` ((name, iterable) pairs) to a fresh SQLite file at `path`.
+
+    Records are flattened and inserted BATCH at a time with executemany, all
+    in one transaction; returns {table: row count}.
+    """
+    tmp = f"{path}.tmp"
+    if os.path.exists(tmp):
+        os.remove(tmp)
+    con = sqlite3.connect(tmp, isolation_level=None)
+    counts = {table: 0 for table in INSERTS}
+    try:
+        # The file is built from scratch and renamed at the end, so a crash only
+        # loses the temp file: no journal or fsync needed while loading
+        con.execute("PRAGMA journal_mode = OFF")
+        con.execute("PRAGMA synchronous = OFF")
+        con.execute("BEGIN")
+        for statement in SCHEMA.split(";"):
+            if statement.strip():
+                con.execute(statement)
+        for name, records in collections:
+            to_rows = ROWS.get(name)
+            if to_rows is None:
+                continue
+            records = iter(records)
+            while batch := list(islice(records, BATCH)):
+                for table, rows in to_rows(batch, counts[name] + 1).items():
+                    con.executemany(INSERTS[table], rows)
+                    counts[table] += len(rows)
+        for statement in INDEXES.split(";"):
+            if statement.strip():
+                con.execute(statement)
+        con.execute("COMMIT")
+        con.execute("ANALYZE")
+    finally:
+        con.close()
+    os.replace(tmp, path)
+    return counts
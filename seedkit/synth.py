@@ -0,0 +1,183 @@
+# seedkit/synth.py
+# Synthetic catalog generator for load testing.
+#
+# Every user, survey and completion is a pure function of (seed, index), so the
+# output does not depend on the shard size or the number of worker processes:
+# shards are generated in parallel and concatenated in index order.
+import hashlib
+import json
+import random
+import shutil
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+
+from seedkit.emit import Fragment, FragmentWriter, write_db
+
+EPOCH = 1757856000000  # mid-Sept 2025, same window as the root db.json sample
+DAY_MS = 24 * 60 * 60 * 1000
+SHARD_SIZE = 50_000
+
+# Tier prices mirror PLANS in src/pages/Packages.jsx
+TIERS = {"silver": 200, "gold": 400, "platinum": 800}
+FIRST_NAMES = ["Biss", "Evance", "Amina", "Brian", "Faith", "Kevin", "Mercy",
+               "Otieno", "Wanjiru", "Kiprop", "Achieng", "Mwangi", "Naliaka"]
+LAST_NAMES = ["Bett", "Kamau", "Odhiambo", "Wekesa", "Cheruiyot", "Njoroge",
+              "Mutua", "Atieno", "Kiptoo", "Wambui", "Omondi", "Chebet"]
+
+
+def _rng(seed, kind, i):
+    return random.Random(f"{seed}:{kind}:{i}")
+
+
+def _digest(seed, kind, i, size):
+    return hashlib.blake2b(f"{seed}:{kind}:{i}".encode(), digest_size=size).digest()
+
+
+def record_id(seed, kind, i):
+    """Stable uuid4-shaped id for the i-th record of `kind`."""
+    return str(uuid.UUID(bytes=_digest(seed, kind, i, 16), version=4))
+
+
+def _iso(ms):
+    # Same format as Date.prototype.toISOString() in markCompleted()
+    dt = datetime.fromtimestamp(ms / 1000, tz=timezone.utc)
+    return dt.strftime("%Y-%m-%dT%H:%M:%S.") + f"{ms % 1000:03d}Z"
+
+
+def make_survey(seed, i, templates):
+    rng = _rng(seed, "survey", i)
+    base = templates[rng.randrange(len(templates))]
+    items = base["items"]
+    keep = sorted(rng.sample(range(len(items)), rng.randint(1, len(items))))
+    created = EPOCH + rng.randrange(30 * DAY_MS)
+    return {
+        "id": record_id(seed, "survey", i),
+        "name": f"{base['name']} #{i + 1}",
+        "description": base["description"],
+        "payout": rng.randint(30, 90),
+        "currency": "ksh",
+        "premium": rng.random() < 0.3,
+        "status": "active" if rng.random() < 0.9 else rng.choice(("draft", "archived")),
+        "items": [items[k] for k in keep],
+        "createdAt": created,
+        "updatedAt": created,
+    }
+
+
+def make_user(seed, i):
+    rng = _rng(seed, "user", i)
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    created = EPOCH + rng.randrange(30 * DAY_MS)
+    user = {
+        "id": record_id(seed, "user", i),
+        "name": f"{first} {last}",
+        "email": f"{first}.{last}{i}@example.com".lower(),
+        "password": "123456",
+        # Referrers always come earlier, so chains point back in time
+        "referral": record_id(seed, "user", rng.randrange(i)) if i and rng.random() < 0.2 else None,
+        "balance": rng.randrange(0, 500),
+        "createdAt": created,
+        "plan": "free",
+    }
+    if rng.random() < 0.35:
+        tier = rng.choice(list(TIERS))
+        user["plan"] = "premium"
+        user["tier"] = tier
+        user["subscription"] = {
+            "provider": "mpesa",
+            "amount": TIERS[tier],
+            "msisdn": f"2547{rng.randrange(10 ** 8):08d}",
+            "code": "".join(rng.choices("ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789", k=10)),
+            "paidAt": created + rng.randrange(DAY_MS),
+        }
+    return user
+
+
+def completion_pair(seed, k, users, surveys):
+    """(user index, survey index) of the k-th completion; unique while k < users * surveys."""
+    u, j = k % users, k // users
+    offset = int.from_bytes(_digest(seed, "offset", u, 8), "big")
+    return u, (offset + j) % surveys
+
+
+def make_completion(seed, k, users, surveys, templates):
+    u, s = completion_pair(seed, k, users, surveys)
+    rng = _rng(seed, "completion", k)
+    survey = make_survey(seed, s, templates)
+    return {
+        "userId": record_id(seed, "user", u),
+        "surveyId": survey["id"],
+        "answers": {f"i_{n}": rng.choice(it["options"]) for n, it in enumerate(survey["items"])},
+        "completedAt": _iso(survey["createdAt"] + rng.randrange(7 * DAY_MS)),
+    }
+
+
+def _write_shard(task):
+    kind, start, stop, path, opts = task
+    seed, indent = opts["seed"], opts["indent"]
+    if kind == "users":
+        records = (make_user(seed, i) for i in range(start, stop))
+    elif kind == "surveys":
+        records = (make_survey(seed, i, opts["templates"]) for i in range(start, stop))
+    else:
+        records = (make_completion(seed, k, opts["users"], opts["surveys"], opts["templates"])
+                   for k in range(start, stop))
+
+    if kind == "completions":
+        # completions export is JSON Lines: one compact record per line
+        with open(path, "w", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+        return Fragment(path, stop - start)
+
+    out = FragmentWriter(path, indent, offsets=path.with_suffix(".offsets") if opts["offsets"] else None)
+    for record in records:
+        out.write(record)
+    return out.close()
+
+
+def generate(out_dir, templates, surveys, users, completions=0, seed=0,
+             workers=None, indent=2, shard_size=SHARD_SIZE, on_record=None, mirrors=()):
+    """Write out_dir/db.json (+ completions.jsonl) with a synthetic catalog.
+
+    on_record and mirrors (more copies of db.json) are passed through to write_db.
+    """
+    if completions and completions > users * surveys:
+        raise ValueError("completions cannot exceed users * surveys (one per pair)")
+
+    out_dir = Path(out_dir)
+    shard_dir = out_dir / ".shards"
+    shard_dir.mkdir(parents=True, exist_ok=True)
+
+    opts = {"seed": seed, "indent": indent, "templates": templates,
+            "users": users, "surveys": surveys, "offsets": on_record is not None}
+    tasks = []
+    for kind, total in (("users", users), ("surveys", surveys), ("completions", completions)):
+        for n, start in enumerate(range(0, total, shard_size)):
+            path = shard_dir / f"{kind}-{n:05d}.part"
+            tasks.append((kind, start, min(start + shard_size, total), path, opts))
+
+    if workers == 1:
+        done = [_write_shard(t) for t in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # map() keeps task order, which keeps the merge deterministic
+            done = list(pool.map(_write_shard, tasks))
+
+    parts = {"users": [], "surveys": [], "completions": []}
+    for (kind, *_), fragment in zip(tasks, done):
+        parts[kind].append(fragment)
+
+    stats = write_db(out_dir / "db.json", [("users", parts["users"]), ("surveys", parts["surveys"])],
+                     indent=indent, on_record=on_record, mirrors=mirrors)
+    if completions:
+        with open(out_dir / "completions.jsonl", "wb") as out:
+            for part in parts["completions"]:
+                with open(part.path, "rb") as f:
+                    shutil.copyfileobj(f, out)
+        stats["completions"] = completions
+
+    shutil.rmtree(shard_dir)
+    return stats
@@ -0,0 +1,124 @@
+# seedkit/targets.py
+# Write one byte stream to several files at once, atomically.
+#
+# The same db.json is read from more than one place: data/db.json by the
+# api/mock handlers and json-server, the root db.json, a copy under public/.
+# The stream is serialized once and regrouped into blocks; each block is a
+# single bytes object handed to every target's writer thread, so an emit
+# takes about as long as the slowest disk instead of the sum of all of them.
+#
+# Every target is written to <name>.tmp next to it and fsync'ed. Only when
+# all of them are complete are they renamed over the old files (then the
+# directories are fsync'ed), so a reader sees the old file or the new one,
+# never half of one, and a failed emit leaves every target as it was.
+#
+#   python -m seedkit.targets data/db.json db.json public/db.json   # copy the first to the rest
+import os
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+BLOCK = 1 << 20  # bytes handed to the writers at a time
+BACKLOG = 8      # blocks a slow target may fall behind before the producer waits
+
+
+def fsync_dir(path):
+    """Make a rename inside directory `path` durable (a no-op where directories can't be opened)."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _blocks(chunks, size):
+    pending, n = [], 0
+    for chunk in chunks:
+        pending.append(chunk)
+        n += len(chunk)
+        if n >= size:
+            yield b"".join(pending)
+            pending, n = [], 0
+    if pending:
+        yield b"".join(pending)
+
+
+def _drain(tmp, blocks):
+    ended = False  # took the None that ends the stream
+    try:
+        with open(tmp, "wb") as f:
+            while (block := blocks.get()) is not None:
+                f.write(block)
+            ended = True
+            f.flush()
+            os.fsync(f.fileno())
+    except BaseException:
+        # keep taking blocks so the producer never waits on a dead writer
+        # (once the stream has ended there is nothing left to take)
+        while not ended and blocks.get() is not None:
+            pass
+        raise
+
+
+def write_all(paths, chunks, size=BLOCK):
+    """Write the bytes from `chunks` to every path in `paths`; returns the byte count.
+
+    `chunks` is consumed once, on the calling thread. Either every target is
+    replaced or, if anything fails, none is.
+    """
+    paths = [Path(p) for p in dict.fromkeys(map(str, paths))]
+    tmps = [f"{p}.tmp" for p in paths]
+    queues = [queue.Queue(BACKLOG) for _ in paths]
+    total = 0
+    done = False
+    try:
+        with ThreadPoolExecutor(max_workers=len(paths), thread_name_prefix="emit") as pool:
+            writers = [pool.submit(_drain, tmp, q) for tmp, q in zip(tmps, queues)]
+            try:
+                for block in _blocks(chunks, size):
+                    for q in queues:
+                        q.put(block)
+                    total += len(block)
+            finally:
+                for q in queues:
+                    q.put(None)
+            for w in writers:
+                w.result()  # re-raises a writer's error
+        for tmp, path in zip(tmps, paths):
+            os.replace(tmp, path)
+        done = True
+    finally:
+        if not done:
+            for tmp in tmps:
+                Path(tmp).unlink(missing_ok=True)
+    for folder in dict.fromkeys(p.parent for p in paths):
+        fsync_dir(folder)
+    return total
+
+
+def copy_file(source, paths, size=BLOCK):
+    """write_all() with the bytes of an existing file."""
+    def read():
+        with open(source, "rb") as f:
+            while block := f.read(size):
+                yield block
+
+    return write_all(paths, read(), size)
+
+
+if __name__ == "__main__":
+    import argparse
+    from time import perf_counter
+
+    p = argparse.ArgumentParser(description="Copy a file to several targets concurrently and atomically")
+    p.add_argument("source", type=Path)
+    p.add_argument("targets", nargs="+", type=Path)
+    args = p.parse_args()
+    t0 = perf_counter()
+    written = copy_file(args.source, args.targets)
+    print(f"✓ Wrote {written:,} bytes to {', '.join(map(str, args.targets))} in {perf_counter() - t0:.2f}s")
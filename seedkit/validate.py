@@ -0,0 +1,204 @@
+# seedkit/validate.py
+# Schema validation for the survey catalog, run by seed.py before anything is
+# written. Catches what would otherwise only break later in TakeSurvey.jsx.
+#
+#   python -m seedkit.validate --bench 1000000
+import math
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from time import perf_counter
+
+from seedkit.synth import make_survey
+
+# Allowed values mirror the <select>s in src/pages/AddSurvey.jsx
+CURRENCIES = frozenset({"ksh", "usd", "eur"})
+STATUSES = frozenset({"active", "draft", "archived"})
+CHUNK = 20_000
+
+
+def _text(v):
+    return isinstance(v, str) and v.strip() != ""
+
+
+def _number(v):
+    return isinstance(v, (int, float)) and not isinstance(v, bool) and math.isfinite(v)
+
+
+# Survey-level rules: (rule, field, predicate, message). Item-level checks are
+# structural and live in check_survey itself.
+RULES = (
+    ("id", "id", _text, "id must be a non-empty string"),
+    ("name", "name", _text, "name must be a non-empty string"),
+    ("payout", "payout", lambda v: _number(v) and v >= 0, "payout must be a non-negative number"),
+    ("currency", "currency", CURRENCIES.__contains__,
+     f"currency must be one of {', '.join(sorted(CURRENCIES))}"),
+    ("status", "status", STATUSES.__contains__, f"status must be one of {', '.join(sorted(STATUSES))}"),
+    ("premium", "premium", lambda v: isinstance(v, bool), "premium must be true or false"),
+)
+
+
+def _compile(rules):
+    # The rule table is frozen into the closure once, not looked up per survey
+    checks = tuple(rules)
+
+    def check_survey(survey, index):
+        if not isinstance(survey, dict):
+            return [{"surveyId": None, "index": index, "item": None,
+                     "rule": "type", "message": "survey must be an object"}]
+        sid = survey.get("id")
+        out = []
+        for rule, field, pred, msg in checks:
+            try:
+                ok = pred(survey.get(field))
+            except TypeError:  # unhashable value in a set lookup
+                ok = False
+            if not ok:
+                out.append({"surveyId": sid, "index": index, "item": None, "rule": rule, "message": msg})
+
+        items = survey.get("items")
+        if not isinstance(items, list) or not items:
+            out.append({"surveyId": sid, "index": index, "item": None,
+                        "rule": "items", "message": "items must be a non-empty list"})
+            return out
+        for n, item in enumerate(items):
+            if not isinstance(item, dict):
+                out.append({"surveyId": sid, "index": index, "item": n,
+                            "rule": "item", "message": "item must be an object"})
+                continue
+            if not _text(item.get("prompt")):
+                out.append({"surveyId": sid, "index": index, "item": n,
+                            "rule": "prompt", "message": "prompt must be a non-empty string"})
+            options = item.get("options")
+            if not isinstance(options, list) or not options:
+                out.append({"surveyId": sid, "index": index, "item": n,
+                            "rule": "options", "message": "options must be a non-empty list"})
+            elif not all(map(_text, options)):
+                out.append({"surveyId": sid, "index": index, "item": n,
+                            "rule": "options", "message": "every option must be a non-empty string"})
+            elif len(set(options)) != len(options):
+                out.append({"surveyId": sid, "index": index, "item": n,
+                            "rule": "options", "message": "options must not repeat"})
+        return out
+
+    return check_survey
+
+
+check_survey = _compile(RULES)
+
+
+def _check_chunk(task):
+    start, surveys = task
+    out = []
+    for i, survey in enumerate(surveys, start):
+        if violations := check_survey(survey, i):
+            out.extend(violations)
+    return out
+
+
+def _check_range(task):
+    # Regenerates its own surveys: shipping them from the parent costs about
+    # as much as checking them, so a pool fed with surveys is slower than none
+    seed, start, stop, templates = task
+    surveys = [make_survey(seed, i, templates) for i in range(start, stop)]
+    return [s.get("id") for s in surveys], _check_chunk((start, surveys))
+
+
+def _track_ids(ids, start, seen, dupes):
+    """Record a duplicate violation for every id already seen at a lower index."""
+    for i, sid in enumerate(ids, start):
+        if sid is None:
+            continue
+        try:
+            first = seen.setdefault(sid, i)
+        except TypeError:  # unhashable id; the id rule reports it
+            continue
+        if first != i:
+            dupes.append({"surveyId": sid, "index": i, "item": None, "rule": "duplicate",
+                          "message": f"duplicate id (first seen at index {first})"})
+
+
+def _chunks(surveys, seen, dupes):
+    """Yield (start index, list) chunks; duplicate ids are caught here, in order."""
+    surveys = iter(surveys)
+    start = 0
+    while chunk := list(islice(surveys, CHUNK)):
+        _track_ids((s.get("id") if isinstance(s, dict) else None for s in chunk), start, seen, dupes)
+        yield start, chunk
+        start += len(chunk)
+
+
+def _ordered(found, dupes):
+    found.extend(dupes)
+    found.sort(key=lambda v: (v["index"], -1 if v["item"] is None else v["item"]))
+    return found
+
+
+def validate(surveys):
+    """Return every violation in `surveys`, ordered by survey index, in one pass."""
+    seen, dupes = {}, []
+    return _ordered([v for chunk in _chunks(surveys, seen, dupes) for v in _check_chunk(chunk)], dupes)
+
+
+def validate_synthetic(seed, count, templates, workers=None):
+    """validate() the catalog synth.make_survey(seed, i, templates) yields for i < count.
+
+    Workers (None for the CPU count) are handed index ranges and generate
+    the surveys they check; only ids and violations come back, so generation
+    is spread over the pool along with the checks.
+    """
+    tasks = [(seed, start, min(start + CHUNK, count), templates) for start in range(0, count, CHUNK)]
+    seen, dupes, found = {}, [], []
+
+    def collect(parts):
+        # map() keeps task order, so ids are tracked in index order
+        for (_, start, *_), (ids, part) in zip(tasks, parts):
+            _track_ids(ids, start, seen, dupes)
+            found.extend(part)
+
+    if workers == 1:
+        collect(map(_check_range, tasks))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            collect(pool.map(_check_range, tasks))
+    return _ordered(found, dupes)
+
+
+def format_violations(violations, limit=20):
+    lines = []
+    for v in violations[:limit]:
+        where = f"survey {v['surveyId']!r} (#{v['index']})"
+        if v["item"] is not None:
+            where += f" item {v['item']}"
+        lines.append(f"  {where}: {v['message']}")
+    if len(violations) > limit:
+        lines.append(f"  ... and {len(violations) - limit} more")
+    return "\n".join(lines)
+
+
+def bench(n, workers=None):
+    """Time generating + validating n synthetic surveys, in-process and pooled."""
+    from seed import surveys as templates
+
+    rows = []
+    for w in (1, workers):
+        t0 = perf_counter()
+        if w == 1:
+            violations = validate(make_survey(0, i, templates) for i in range(n))
+        else:
+            violations = validate_synthetic(0, n, templates, workers=w)
+        dt = perf_counter() - t0
+        rows.append({"workers": w or "cpu", "surveys": n, "seconds": dt,
+                     "per_second": n / dt, "violations": len(violations)})
+    return rows
+
+
+if __name__ == "__main__":
+    import argparse
+
+    p = argparse.ArgumentParser(description="Benchmark catalog validation throughput")
+    p.add_argument("--bench", type=int, default=100_000, metavar="N", help="number of surveys")
+    p.add_argument("--workers", type=int, default=None)
+    args = p.parse_args()
+    for row in bench(args.bench, args.workers):
+        print(f"workers={row['workers']:<4} {row['surveys']:>9,} surveys  {row['seconds']:7.3f}s  "
+              f"{row['per_second']:>12,.0f}/s  ({row['violations']} violations)")
@@ -0,0 +1,78 @@
+# seedkit/views.py
+# Pre-materialized survey list views, split into fixed-size pages.
+#
+#   data/views/index.json                      every view/sort with totals and first cursor
+#   data/views/<view>/<sort>/<page>.json       {"items": [...], "cursor": ..., "next": ...}
+#
+# Cursors are "<view>.<sort>.<page>"; readPage() in api/mock/_utils.js maps
+# them back to a file, so clients only ever pass the token they were given.
+import shutil
+from pathlib import Path
+
+from seedkit.emit import encode
+from seedkit.shards import swap_dir
+
+PAGE_SIZE = 20
+
+# The filters the React pages apply on every load
+VIEWS = {
+    "active": lambda s: s.get("status", "active") == "active",
+    "free": lambda s: s.get("status", "active") == "active" and not s.get("premium"),
+    "premium": lambda s: s.get("status", "active") == "active" and bool(s.get("premium")),
+}
+
+# Highest payout / newest first; id breaks ties so page contents are stable
+SORTS = {
+    "payout": lambda s: (-(s.get("payout") or 0), str(s.get("id"))),
+    "newest": lambda s: (-(s.get("createdAt") or 0), str(s.get("id"))),
+}
+
+
+def cursor(view, sort, page):
+    return f"{view}.{sort}.{page}"
+
+
+def write_views(out_dir, surveys, page_size=PAGE_SIZE, indent=2):
+    """Write every view x sort as pages under out_dir/views; returns the index."""
+    if page_size < 1:
+        raise ValueError(f"page_size must be at least 1, got {page_size}")
+    out_dir = Path(out_dir)
+    tmp = out_dir / ".views.tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+
+    # Sorting needs the whole view anyway; the active set is shared by all three
+    active = [s for s in surveys if VIEWS["active"](s)]
+    index = {"pageSize": page_size, "views": []}
+    for view, keep in VIEWS.items():
+        members = active if view == "active" else [s for s in active if keep(s)]
+        for sort, key in SORTS.items():
+            ordered = sorted(members, key=key)
+            pages = max(1, -(-len(ordered) // page_size))
+            folder = tmp / view / sort
+            folder.mkdir(parents=True)
+            for page in range(1, pages + 1):
+                body = {
+                    "view": view,
+                    "sort": sort,
+                    "page": page,
+                    "pages": pages,
+                    "pageSize": page_size,
+                    "total": len(ordered),
+                    "cursor": cursor(view, sort, page),
+                    "prev": cursor(view, sort, page - 1) if page > 1 else None,
+                    "next": cursor(view, sort, page + 1) if page < pages else None,
+                    "items": ordered[(page - 1) * page_size:page * page_size],
+                }
+                (folder / f"{page}.json").write_text(encode(body, indent), encoding="utf-8")
+            index["views"].append({"view": view, "sort": sort, "total": len(ordered),
+                                   "pages": pages, "first": cursor(view, sort, 1)})
+
+    (tmp / "index.json").write_text(encode(index, indent), encoding="utf-8")
+    swap_dir(tmp, out_dir / "views")
+    return index
+
+
+def remove_views(out_dir):
+    # readPage() serves whatever pages exist, so a run without --views must not leave old ones
+    shutil.rmtree(Path(out_dir) / "views", ignore_errors=True)
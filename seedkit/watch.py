@@ -0,0 +1,402 @@
+# seedkit/watch.py
+# Watch mode: poll the survey source and, when it changes, re-emit only what
+# depends on the surveys that changed.
+#
+# Every survey's encoded text is cached, so a rebuild encodes just the changed
+# records. db.json, surveys.json and manifest.json are rewritten by joining
+# cached bytes, index spans come from cached lengths, per-record files are
+# written for changed surveys only, and view pages only where their contents
+# moved.
+#
+#   python seed.py --watch --index --shards --views
+#   python -m seedkit.watch --bench 100000
+import hashlib
+import os
+import runpy
+import sys
+import time
+from array import array
+from bisect import bisect_left, insort
+from itertools import accumulate
+from pathlib import Path
+from time import perf_counter
+
+from seedkit.emit import encode
+from seedkit.offsets import index_path, sorted_order, write_index
+from seedkit.targets import write_all
+from seedkit.views import PAGE_SIZE, SORTS, VIEWS, cursor
+
+
+def _write(path, chunks):
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.writelines(chunks)
+    os.replace(tmp, path)
+
+
+class _Entry:
+    __slots__ = ("survey", "text", "col")
+
+    def __init__(self, survey, text, col=None):
+        self.survey = survey
+        self.text = text  # the record as it sits inside db.json (depth 2), utf-8
+        self.col = col    # ... and inside surveys.json (depth 1), with --shards
+
+
+class Catalog:
+    """In-memory mirror of what seed.py last wrote for `surveys`.
+
+    Assumes the files under out_dir were written from the same surveys (and
+    users) by a regular run; update() then keeps them in step.
+    """
+
+    def __init__(self, out_dir, surveys, users=(), indent=2, index=False, shards=False,
+                 views=False, page_size=PAGE_SIZE, sidecars=False, mirrors=()):
+        self.out_dir = Path(out_dir)
+        self.db_path = self.out_dir / "db.json"
+        self.mirrors = list(mirrors)  # more copies of db.json, rewritten with it
+        self.indent = indent
+        self.index, self.shards, self.views = index, shards, views
+        if page_size < 1:
+            raise ValueError(f"page_size must be at least 1, got {page_size}")
+        self.page_size = page_size
+        self.sidecars = sidecars
+        step = "" if indent is None else " " * indent
+        self._nl = ("\n" + step).encode() if indent is not None else b""
+        self._nl2 = ("\n" + step * 2).encode() if indent is not None else b""
+
+        # Everything in db.json before the surveys array; users don't change while watching
+        colon = b": " if indent is not None else b":"
+        self._head = b"{" + self._nl + b'"users"' + colon + b"["
+        self._users = 0
+        for user in users:
+            if self._users:
+                self._head += b","
+            self._head += self._entry(user).text
+            self._users += 1
+        self._head += (self._nl + b"]" if self._users and self._nl else b"]") + b"," + self._nl \
+            + b'"surveys"' + colon
+
+        self.order = []
+        self.entries = {}
+        for survey in surveys:
+            self.entries[survey["id"]] = self._entry(survey)
+            self.order.append(survey["id"])
+        self._index_order = None
+        self._keys = {}
+        if views:
+            for view, keep in VIEWS.items():
+                for sort, key in SORTS.items():
+                    self._keys[view, sort] = sorted(key(e.survey) for e in self.entries.values()
+                                                    if keep(e.survey))
+        if shards:
+            self._manifest = {rid: self._manifest_entry(rid, self._record_bytes(e))
+                              for rid, e in self.entries.items()}
+            self._users_summary = None
+
+    def _entry(self, survey):
+        text = encode(survey, self.indent).encode("utf-8")
+        if not self._nl:
+            return _Entry(survey, text, text)
+        return _Entry(survey, self._nl2 + text.replace(b"\n", self._nl2),
+                      self._nl + text.replace(b"\n", self._nl) if self.shards else None)
+
+    def _record_bytes(self, entry):
+        # per-record file (depth 0) from the cached depth-2 text
+        if not self._nl2:
+            return entry.text
+        return entry.text.replace(self._nl2, b"\n")[1:]
+
+    def _manifest_entry(self, rid, data):
+        record = {"collection": "surveys", "id": rid, "path": f"surveys/{rid}.json",
+                  "bytes": len(data), "sha256": hashlib.sha256(data).hexdigest()}
+        text = encode(record, self.indent).encode("utf-8")
+        return self._nl2 + text.replace(b"\n", self._nl2) if self._nl2 else text
+
+    def _splice(self, body, last_key, pieces):
+        """encode(body) with the (empty) list under `last_key` filled with pre-encoded pieces."""
+        text = encode({**body, last_key: []}, self.indent).encode("utf-8")
+        tail = b"\n}" if self.indent is not None else b"}"
+        close = (self._nl + b"]") if pieces and self._nl else b"]"
+        return [text[:-len(tail) - 2], b"[", b",".join(pieces), close, tail]
+
+    def diff(self, surveys, now):
+        """Compare a fresh load against the cache; returns (changed, added, removed, order).
+
+        Timestamps are carried over like restamp(): unchanged surveys keep
+        both, changed ones keep createdAt and get updatedAt=now.
+        """
+        changed, added, order, seen = [], [], [], set()
+        for survey in surveys:
+            rid = survey["id"]
+            if rid in seen:
+                raise ValueError(f"duplicate survey id {rid!r}")
+            seen.add(rid)
+            order.append(rid)
+            old = self.entries.get(rid)
+            if old is None:
+                added.append({**survey, "createdAt": now, "updatedAt": now})
+                continue
+            survey = {**survey, "createdAt": old.survey.get("createdAt"),
+                      "updatedAt": old.survey.get("updatedAt")}
+            if survey != old.survey:
+                survey["updatedAt"] = now
+                changed.append(survey)
+        removed = [rid for rid in self.entries if rid not in seen]
+        return changed, added, removed, order
+
+    def apply(self, changed, added, removed, order):
+        """Re-emit db.json and every enabled artifact for one diff(); returns per-output timings."""
+        timings = {}
+        old = {rid: self.entries[rid].survey for rid in removed}
+        old.update((s["id"], self.entries[s["id"]].survey) for s in changed)
+        for rid in removed:
+            del self.entries[rid]
+        for survey in changed + added:
+            self.entries[survey["id"]] = self._entry(survey)
+        self.order = order
+
+        t0 = perf_counter()
+        pieces = [self.entries[rid].text for rid in order]
+        close = (self._nl + b"]") if pieces and self._nl else b"]"
+        tail = b"\n}" if self.indent is not None else b"}"
+        write_all([self.db_path, *self.mirrors], [self._head, b"[", b",".join(pieces), close, tail])
+        timings["db"] = perf_counter() - t0
+
+        if self.sidecars:
+            from seedkit.artifacts import write_sidecars
+            t0 = perf_counter()
+            write_sidecars(self.db_path)
+            timings["sidecars"] = perf_counter() - t0
+        if self.index:
+            t0 = perf_counter()
+            self._write_index(pieces)
+            timings["index"] = perf_counter() - t0
+        if self.shards:
+            t0 = perf_counter()
+            self._write_shards(pieces, changed + added, removed)
+            timings["shards"] = perf_counter() - t0
+        if self.views:
+            t0 = perf_counter()
+            timings["pages"] = self._write_views(old, changed + added)
+            timings["views"] = perf_counter() - t0
+        return timings
+
+    def update(self, surveys, now):
+        """diff() + apply(); returns (changes, timings), or (changes, None) if nothing changed."""
+        changed, added, removed, order = self.diff(surveys, now)
+        changes = {"changed": len(changed), "added": len(added), "removed": len(removed)}
+        if not (changed or added or removed) and order == self.order:
+            return changes, None
+        return changes, self.apply(changed, added, removed, order)
+
+    def _write_index(self, pieces):
+        # users sit before the surveys and never change, so only surveys.idx is rewritten
+        if self._index_order is None or self._index_ids != self.order:
+            self._index_ids = list(self.order)
+            self._index_keys = [str(rid).encode("utf-8") for rid in self.order]
+            self._index_order = sorted_order("surveys", self._index_keys)
+        spans = array("Q")
+        strip = len(self._nl2)
+        for offset, text in zip(accumulate((len(t) + 1 for t in pieces), initial=len(self._head) + 1), pieces):
+            spans.append(offset + strip)
+            spans.append(len(text) - strip)
+        write_index(index_path(self.db_path, "surveys"), self._index_keys, spans, self._index_order)
+
+    def _write_shards(self, pieces, touched, removed):
+        folder = self.out_dir / "surveys"
+        for rid in removed:
+            (folder / f"{rid}.json").unlink(missing_ok=True)
+            del self._manifest[rid]
+        for survey in touched:
+            rid = survey["id"]
+            data = self._record_bytes(self.entries[rid])
+            _write(folder / f"{rid}.json", [data])
+            self._manifest[rid] = self._manifest_entry(rid, data)
+
+        # surveys.json is the same array one level shallower
+        col = [b"[", b",".join([self.entries[rid].col for rid in self.order]),
+               b"\n]" if pieces and self._nl else b"]"]
+        _write(self.out_dir / "surveys.json", col)
+        digest = hashlib.sha256()
+        for part in col:
+            digest.update(part)
+
+        if self._users_summary is None:
+            users = (self.out_dir / "users.json").read_bytes()
+            self._users_summary = {"name": "users", "file": "users.json", "count": self._users,
+                                   "bytes": len(users), "sha256": hashlib.sha256(users).hexdigest(),
+                                   "perRecord": False}
+        summary = [self._users_summary,
+                   {"name": "surveys", "file": "surveys.json", "count": len(pieces),
+                    "bytes": sum(map(len, col)), "sha256": digest.hexdigest(), "perRecord": True}]
+        records = [self._manifest[rid] for rid in self.order]
+        _write(self.out_dir / "manifest.json",
+               self._splice({"collections": summary}, "records", records))
+
+    def _write_views(self, old, touched):
+        """Rewrite the pages whose items moved or changed; returns how many were written."""
+        written = 0
+        totals_changed = False
+        for (view, sort), keys in self._keys.items():
+            keep, key = VIEWS[view], SORTS[sort]
+            before = len(keys)
+            # positions before anything moves, then after; every page in between shifts
+            gone = [key(s) for s in old.values() if keep(s)]
+            spans = [bisect_left(keys, k) for k in gone]
+            for k in gone:
+                del keys[bisect_left(keys, k)]
+            for survey in touched:
+                if keep(survey):
+                    insort(keys, key(survey))
+            spans += [bisect_left(keys, key(s)) for s in touched if keep(s)]
+            if not spans:
+                continue
+
+            ps = self.page_size
+            pages = max(1, -(-len(keys) // ps))
+            if len(keys) != before:
+                # total and page count sit on every page
+                totals_changed = True
+                first, last = 1, pages
+                old_pages = max(1, -(-before // ps))
+                for page in range(pages + 1, old_pages + 1):
+                    (self.out_dir / "views" / view / sort / f"{page}.json").unlink(missing_ok=True)
+            else:
+                first, last = min(spans) // ps + 1, max(spans) // ps + 1
+
+            folder = self.out_dir / "views" / view / sort
+            for page in range(first, last + 1):
+                body = {
+                    "view": view,
+                    "sort": sort,
+                    "page": page,
+                    "pages": pages,
+                    "pageSize": ps,
+                    "total": len(keys),
+                    "cursor": cursor(view, sort, page),
+                    "prev": cursor(view, sort, page - 1) if page > 1 else None,
+                    "next": cursor(view, sort, page + 1) if page < pages else None,
+                }
+                items = [self.entries[k[-1]].text for k in keys[(page - 1) * ps:page * ps]]
+                _write(folder / f"{page}.json", self._splice(body, "items", items))
+                written += 1
+
+        if totals_changed:
+            index = {"pageSize": self.page_size, "views": []}
+            for (view, sort), keys in self._keys.items():
+                index["views"].append({"view": view, "sort": sort, "total": len(keys),
+                                       "pages": max(1, -(-len(keys) // self.page_size)),
+                                       "first": cursor(view, sort, 1)})
+            _write(self.out_dir / "views" / "index.json", [encode(index, self.indent).encode("utf-8")])
+        return written
+
+
+def load_source(path):
+    """Run the seed script at `path` (without its main) and return (surveys, NOW)."""
+    env = runpy.run_path(str(path))
+    return env["surveys"], env.get("NOW", int(time.time() * 1000))
+
+
+def _stamp(path):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def watch(path, catalog, poll=0.25, debounce=0.3, validate=None, log=print):
+    """Poll `path`; after it has been quiet for `debounce` seconds, reload and update `catalog`.
+
+    `validate`, if given, is called with the changed and added surveys and
+    returns an error message (or None); the update is skipped when it fails.
+    Runs until interrupted.
+    """
+    last = _stamp(path)
+    log(f"  watching {path} (Ctrl+C to stop)")
+    while True:
+        time.sleep(poll)
+        stamp = _stamp(path)
+        if stamp == last:
+            continue
+        # editors write in bursts: wait until the file stops changing
+        while True:
+            time.sleep(debounce)
+            again = _stamp(path)
+            if again == stamp:
+                break
+            stamp = again
+        last = stamp
+
+        t0 = perf_counter()
+        try:
+            surveys, now = load_source(path)
+            changed, added, removed, order = catalog.diff(surveys, now)
+        except Exception as e:
+            log(f"✗ {path}: {type(e).__name__}: {e}")
+            continue
+        loaded = perf_counter()
+        if not (changed or added or removed) and order == catalog.order:
+            log(f"  no survey changes ({(loaded - t0) * 1e3:.0f} ms)")
+            continue
+        error = validate(changed + added) if validate else None
+        if error:
+            log(f"✗ not rebuilt:\n{error}")
+            continue
+        timings = catalog.apply(changed, added, removed, order)
+        done = perf_counter()
+        parts = ", ".join(f"{k} {v * 1e3:.1f} ms" for k, v in timings.items() if k != "pages")
+        log(f"✓ {len(changed)} changed, {len(added)} added, {len(removed)} removed: "
+            f"rebuilt in {(done - loaded) * 1e3:.1f} ms ({parts}), load {(loaded - t0) * 1e3:.0f} ms")
+
+
+def bench(n, seed=0, indent=2):
+    """Edit one survey of an n-survey catalog; compare a watch rebuild to a full write."""
+    import tempfile
+
+    from seed import surveys as templates
+    from seedkit.emit import write_db
+    from seedkit.offsets import IndexBuilder
+    from seedkit.shards import write_shards
+    from seedkit.synth import make_survey
+    from seedkit.views import write_views
+
+    surveys = [make_survey(seed, i, templates) for i in range(n)]
+    with tempfile.TemporaryDirectory() as tmp:
+        t0 = perf_counter()
+        index = IndexBuilder()
+        write_db(Path(tmp) / "db.json", [("users", []), ("surveys", surveys)], indent, on_record=index.add)
+        index.write(Path(tmp) / "db.json", ("users", "surveys"))
+        write_shards(tmp, [("users", []), ("surveys", surveys)], indent)
+        write_views(tmp, surveys, indent=indent)
+        full = perf_counter() - t0
+
+        t0 = perf_counter()
+        catalog = Catalog(tmp, surveys, [], indent, index=True, shards=True, views=True)
+        warm = perf_counter() - t0
+
+        edited = list(surveys)
+        i = n // 2
+        edited[i] = {**edited[i], "name": edited[i]["name"] + " (edited)", "payout": edited[i]["payout"] + 5}
+        t0 = perf_counter()
+        changes, timings = catalog.update(edited, edited[i]["updatedAt"])
+        rebuild = perf_counter() - t0
+    return {"surveys": n, "full_s": full, "warm_s": warm, "rebuild_s": rebuild,
+            "changes": changes, "timings": timings}
+
+
+if __name__ == "__main__":
+    import argparse
+
+    p = argparse.ArgumentParser(description="Benchmark watch-mode rebuilds")
+    p.add_argument("--bench", type=int, metavar="N", default=100_000, help="catalog size")
+    args = p.parse_args()
+    result = bench(args.bench)
+    print(f"{result['surveys']:,} surveys: full write {result['full_s']:.2f}s, "
+          f"cache warm-up {result['warm_s']:.2f}s, one-survey rebuild {result['rebuild_s'] * 1e3:.0f} ms")
+    for name, seconds in result["timings"].items():
+        if name != "pages":
+            print(f"  {name:<8} {seconds * 1e3:8.1f} ms")
+    print(f"  {result['timings']['pages']} view pages rewritten")
+    sys.exit(0)
@@ -0,0 +1,59 @@
+import json
+
+import pytest
+
+from seedkit.completions import iter_client
+
+SURVEY = {
+    "id": "s1",
+    "name": "Mobile Usage Habits",
+    "items": [
+        {"prompt": "How often?", "options": ["Daily", "Weekly", "Never"]},
+        {"prompt": "Which OS?", "options": ["Android", "iOS"]},
+    ],
+}
+
+# localStorage["surveys.completions.v1"] exactly as TakeSurvey.jsx leaves it:
+# markCompleted(u.id, survey.id, {answers, completedAt: Date.now()})
+EXPORT = {
+    "u1": {"s1": {"answers": {"answers": {"i_0": "Daily", "i_1": "iOS"}, "completedAt": 1758093796902},
+                  "completedAt": "2025-09-17T07:23:17.000Z"}},
+    "u2": {"s1": {"answers": {"answers": {"i_0": "Never", "i_1": "Android"}, "completedAt": 1758094000000},
+                  "completedAt": "2025-09-17T07:26:40.100Z"}},
+}
+
+
+@pytest.fixture
+def export(tmp_path):
+    path = tmp_path / "completions.json"
+    path.write_text(json.dumps(EXPORT), encoding="utf-8")
+    return path
+
+
+def test_iter_client_unwraps_take_survey_answers(export):
+    records = sorted(iter_client(export), key=lambda r: r["userId"])
+    assert records[0] == {"userId": "u1", "surveyId": "s1", "answers": {"i_0": "Daily", "i_1": "iOS"},
+                          "completedAt": "2025-09-17T07:23:16.902Z"}
+    assert records[1]["answers"] == {"i_0": "Never", "i_1": "Android"}
+
+
+def test_iter_client_keeps_flat_records(tmp_path):
+    path = tmp_path / "completions.json"
+    path.write_text(json.dumps({"u1": {"s1": {"answers": {"i_0": "Daily"}, "completedAt": "2025-09-17T07:23:17.000Z"}},
+                                "u2": {"s1": {"answers": {"finishedAt": 1758094000000},
+                                              "completedAt": "2025-09-17T07:26:40.100Z"}}}), encoding="utf-8")
+    records = sorted(iter_client(path), key=lambda r: r["userId"])
+    assert records[0]["answers"] == {"i_0": "Daily"}
+    assert records[0]["completedAt"] == "2025-09-17T07:23:17.000Z"
+    assert records[1]["answers"] == {}  # SurveyFlow.jsx stores no answers
+    assert records[1]["completedAt"] == "2025-09-17T07:26:40.000Z"
+
+
+def test_tally_counts_client_export_answers(export):
+    pytest.importorskip("numpy")
+    from seedkit.analytics import Codebook, tally
+
+    report = tally([export], Codebook([SURVEY])).report()
+    assert (report["completions"], report["answers"], report["unmatchedAnswer"]) == (2, 4, 0)
+    counts = [[o["count"] for o in item["options"]] for item in report["surveys"][0]["items"]]
+    assert counts == [[1, 0, 1], [1, 1]]
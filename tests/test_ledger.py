@@ -0,0 +1,57 @@
+import json
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from seedkit.ledger import run  # noqa: E402
+
+DB = {
+    "users": [{"id": "u1", "balance": 70}, {"id": "u2", "balance": 40}],
+    "surveys": [{"id": "s1", "payout": 70}, {"id": "s2", "payout": 40}],
+}
+
+
+def _write(path, data):
+    path.write_text(json.dumps(data), encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def inputs(tmp_path):
+    # the second file's entry is older than the first file's
+    a = _write(tmp_path / "a.json", {"u1": {"s1": {"answers": {}, "completedAt": "2025-09-20T10:00:00.000Z"}}})
+    b = _write(tmp_path / "b.json", {"u2": {"s2": {"answers": {}, "completedAt": "2025-09-18T10:00:00.000Z"}}})
+    return _write(tmp_path / "db.json", DB), [a, b]
+
+
+def test_out_of_order_inputs_are_all_credited(inputs):
+    db, paths = inputs
+    ledger = run(paths, db)
+    assert ledger.stats["completions"] == 2
+    assert ledger.expected().tolist() == [70.0, 40.0]
+    assert ledger.report()["mismatched"] == 0
+    assert ledger.watermark == "2025-09-20T10:00:00.000Z"
+
+
+def test_checkpoint_skips_what_it_covers(inputs, tmp_path):
+    db, paths = inputs
+    checkpoint = tmp_path / "ledger.npz"
+    run(paths, db, checkpoint=checkpoint)
+    again = run(paths, db, checkpoint=checkpoint)
+    assert again.expected().tolist() == [70.0, 40.0]
+
+
+def test_rewritten_input_is_reported_not_printed(inputs, tmp_path, capsys):
+    db, _ = inputs
+    jsonl = tmp_path / "completions.jsonl"
+    jsonl.write_text('{"userId": "u1", "surveyId": "s1", "completedAt": "2025-09-20T10:00:00.000Z"}\n',
+                     encoding="utf-8")
+    checkpoint = tmp_path / "ledger.npz"
+    assert not run([jsonl], db, checkpoint=checkpoint).report()["recomputed"]
+    jsonl.write_text('{"userId": "u2", "surveyId": "s2", "completedAt": "2025-09-21T10:00:00.000Z"}\n',
+                     encoding="utf-8")
+    again = run([jsonl], db, checkpoint=checkpoint)
+    assert again.report()["recomputed"]
+    assert again.expected().tolist() == [0.0, 40.0]
+    assert capsys.readouterr().out == ""
@@ -0,0 +1,32 @@
+import json
+
+from seedkit.model import ItemTable, Survey, User
+
+
+def test_known_fields_after_an_unknown_key():
+    user = User({"legacy": 1, "id": "x", "plan": "premium", "name": "A", "email": "a@b"})
+    assert (user.get("id"), user.get("name"), user.get("email"), user.get("plan")) == ("x", "A", "a@b", "premium")
+    assert user["legacy"] == 1
+    assert user.extra == {"legacy": 1}
+
+
+def test_survey_keys_out_of_order():
+    data = {"name": "Mobile Usage Habits", "id": "s1", "status": "active",
+            "items": [{"prompt": "Which OS?", "options": ["Android", "iOS"]}], "payout": 70, "note": "x"}
+    survey = Survey(data, ItemTable())
+    assert survey.get("id") == "s1"
+    assert survey["payout"] == 70
+    assert survey["name"] == "Mobile Usage Habits"
+    assert survey["items"][0]["options"] == ("Android", "iOS")
+    assert survey.extra == {"note": "x"}
+
+
+def test_render_keeps_the_original_key_order():
+    for data in ({"legacy": 1, "id": "x", "name": "A", "plan": "free"},
+                 {"plan": "free", "id": "x", "subscription": {"code": "TIH9AQ1T8F", "amount": 400}},
+                 {"id": "x", "name": "A", "plan": "free"}):
+        user = User(data)
+        assert list(k for k, _ in user.fields()) == list(data)
+        assert user.render(2) == json.dumps(data, indent=2)
+        assert user.render(None) == json.dumps(data, separators=(",", ":"))
+        assert user.to_dict() == data
@@ -0,0 +1,44 @@
+import errno
+import threading
+
+from seedkit import targets
+
+
+def _write_all(paths, chunks):
+    """write_all() on a thread, so a hang fails the test instead of stalling it."""
+    result = {}
+
+    def call():
+        try:
+            result["value"] = targets.write_all(paths, chunks, size=4)
+        except BaseException as e:  # noqa: BLE001 - handed back to the test
+            result["error"] = e
+
+    thread = threading.Thread(target=call, daemon=True)
+    thread.start()
+    thread.join(10)
+    assert not thread.is_alive(), "write_all hung"
+    return result
+
+
+def test_writes_every_target(tmp_path):
+    paths = [tmp_path / "a.json", tmp_path / "b" / "db.json"]
+    paths[1].parent.mkdir()
+    result = _write_all(paths, [b"{", b'"users": []', b"}"])
+    assert result == {"value": 13}
+    assert [p.read_bytes() for p in paths] == [b'{"users": []}'] * 2
+
+
+def test_fsync_error_raises_and_keeps_old_files(tmp_path, monkeypatch):
+    paths = [tmp_path / "a.json", tmp_path / "b.json"]
+    for p in paths:
+        p.write_bytes(b"old")
+
+    def fsync(fd):
+        raise OSError(errno.ENOSPC, "No space left on device")
+
+    monkeypatch.setattr(targets.os, "fsync", fsync)
+    result = _write_all(paths, [b"new ", b"bytes"])
+    assert isinstance(result.get("error"), OSError)
+    assert [p.read_bytes() for p in paths] == [b"old", b"old"]
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["a.json", "b.json"]
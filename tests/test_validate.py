@@ -0,0 +1,17 @@
+from seed import surveys as templates
+from seedkit.synth import make_survey
+from seedkit.validate import validate, validate_synthetic
+
+SURVEY = {"id": "s1", "name": "Mobile Usage Habits", "payout": 70, "currency": "ksh", "status": "active",
+          "premium": False, "items": [{"prompt": "Which OS?", "options": ["Android", "iOS"]}]}
+
+
+def test_validate_reports_in_index_order():
+    found = validate([SURVEY, {**SURVEY, "payout": -1}, SURVEY])
+    assert [(v["index"], v["rule"]) for v in found] == [(1, "payout"), (1, "duplicate"), (2, "duplicate")]
+
+
+def test_validate_synthetic_matches_validate():
+    expected = validate(make_survey(7, i, templates) for i in range(300))
+    assert validate_synthetic(7, 300, templates, workers=1) == expected
+    assert validate_synthetic(7, 300, templates, workers=2) == expected
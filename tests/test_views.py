@@ -0,0 +1,10 @@
+import pytest
+
+from seedkit.views import write_views
+
+
+@pytest.mark.parametrize("page_size", [0, -3])
+def test_write_views_rejects_non_positive_page_size(tmp_path, page_size):
+    with pytest.raises(ValueError):
+        write_views(tmp_path, [], page_size)
+    assert not (tmp_path / "views").exists()